@@ -1,10 +1,17 @@
-from flask import Flask, render_template, request, redirect, url_for, session, flash, jsonify
+from flask import Flask, Response, render_template, request, redirect, url_for, session, flash, jsonify
 import boto3
 import os
+from botocore.config import Config
 from functools import wraps
 from werkzeug.utils import secure_filename
 import json
+import uuid
 from datetime import datetime
+from bulk_upload import BULK_UPLOAD_WORKERS, BulkUploader
+from events import EventBus
+from ranking_cache import CANDIDATES_STREAM_ARN, RankingCache, StreamInvalidator
+from ranking_query import RankingQuery
+from sqs_enqueue import ENQUEUE_MODE, SQS_QUEUE_URL, SQSEnqueuer
 
 app = Flask(__name__)
 app.secret_key = os.environ.get('SECRET_KEY', 'dev-secret-key-change-in-production')
@@ -17,16 +24,101 @@ COGNITO_USER_POOL_ID = os.environ.get('COGNITO_USER_POOL_ID')
 COGNITO_CLIENT_ID = os.environ.get('COGNITO_CLIENT_ID')
 
 # AWS Clients
-s3_client = boto3.client('s3', region_name=AWS_REGION)
+# SigV4 so presigned POSTs work in every region; the pool fits bulk transfers
+s3_client = boto3.client('s3', region_name=AWS_REGION, config=Config(
+    signature_version='s3v4',
+    max_pool_connections=max(10, BULK_UPLOAD_WORKERS)
+))
 cognito_client = boto3.client('cognito-idp', region_name=AWS_REGION)
 dynamodb = boto3.resource('dynamodb', region_name=AWS_REGION)
 
+# Processing trigger: S3 notifications, or messages sent from here (ENQUEUE_MODE=explicit)
+enqueuer = None
+if ENQUEUE_MODE == 'explicit':
+    enqueuer = SQSEnqueuer(boto3.client('sqs', region_name=AWS_REGION), SQS_QUEUE_URL)
+
+# Candidate rankings, read page by page from the JobPositionRankingIndex GSI
+DYNAMODB_TABLE = os.environ.get('DYNAMODB_TABLE', 'smart-ats-candidates')
+DASHBOARD_PAGE_SIZE = int(os.environ.get('DASHBOARD_PAGE_SIZE', '50'))
+ranking_query = RankingQuery(dynamodb.meta.client, DYNAMODB_TABLE)
+
+# Columns shown in the candidates table (all the API returns)
+CANDIDATE_COLUMNS = ['candidate_name', 'job_position', 'ranking_score', 'skills_matched', 'status', 'upload_date', 's3_key']
+MAX_PAGE_SIZE = 100
+
+# Ranking pages are cached per process; the table's stream evicts changed
+# positions and feeds the live status events of /api/events
+ranking_cache = RankingCache()
+event_bus = EventBus()
+if CANDIDATES_STREAM_ARN:
+    StreamInvalidator(
+        boto3.client('dynamodbstreams', region_name=AWS_REGION),
+        CANDIDATES_STREAM_ARN,
+        ranking_cache,
+        bus=event_bus,
+        positions=ranking_query.positions
+    ).start()
+
 # Allowed file extensions
 ALLOWED_EXTENSIONS = {'pdf', 'doc', 'docx'}
 
+# Direct browser-to-S3 uploads (presigned POST)
+CONTENT_TYPES = {
+    'pdf': 'application/pdf',
+    'doc': 'application/msword',
+    'docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
+}
+MAX_UPLOAD_BYTES = int(os.environ.get('MAX_UPLOAD_BYTES', str(10 * 1024 * 1024)))
+PRESIGNED_UPLOAD_EXPIRES = int(os.environ.get('PRESIGNED_UPLOAD_EXPIRES', '300'))
+
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
+def new_cv_key(filename):
+    """S3 key for an uploaded CV; the random suffix keeps same-second uploads apart."""
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    return f"cvs/{timestamp}_{uuid.uuid4().hex[:8]}_{secure_filename(filename)}"
+
+def candidate_filters(args):
+    """Read the candidate list filters from the query string. Raises ValueError."""
+    filters = {'position': args.get('position') or None}
+    min_score = args.get('min_score')
+    filters['min_score'] = float(min_score) if min_score else None
+    for name in ('date_from', 'date_to'):
+        value = args.get(name) or None
+        if value:
+            datetime.strptime(value, '%Y-%m-%d')
+        filters[name] = value
+    return filters
+
+def load_candidates(limit, cursor, filters):
+    """One page of candidates with the table columns, served from the ranking cache."""
+    key = (filters['position'], cursor, limit, filters['min_score'], filters['date_from'], filters['date_to'])
+    return ranking_cache.get_or_load(key, lambda: ranking_query.top_candidates(
+        limit, cursor=cursor, attributes=CANDIDATE_COLUMNS, **filters
+    ))
+
+def enqueue_cvs(uploads, job_position):
+    """
+    Queue uploaded CVs for processing when ENQUEUE_MODE is 'explicit'.
+    
+    Args:
+        uploads: List of (s3_key, version_id) tuples
+        job_position: Position the CVs are ranked against
+    
+    Returns:
+        Dict of s3_key -> error for the CVs that could not be queued
+    """
+    if enqueuer is None or not uploads:
+        return {}
+    
+    messages = [
+        SQSEnqueuer.message(S3_BUCKET, s3_key, version_id, job_position, session.get('username', 'unknown'))
+        for s3_key, version_id in uploads
+    ]
+    failures = enqueuer.send(messages)
+    return {uploads[index][0]: error for index, error in failures.items()}
+
 def login_required(f):
     @wraps(f)
     def decorated_function(*args, **kwargs):
@@ -81,16 +173,48 @@ def logout():
 @app.route('/dashboard')
 @login_required
 def dashboard():
+    cursor = request.args.get('cursor')
+    rank_offset = request.args.get('rank', 0, type=int)
+    filters = {}
     try:
-        # Get candidates from DynamoDB
-        table = dynamodb.Table(os.environ.get('DYNAMODB_TABLE', 'smart-ats-candidates'))
-        response = table.scan()
-        candidates = sorted(response.get('Items', []), key=lambda x: x.get('ranking_score', 0), reverse=True)
+        # First page of top candidates; dashboard.js fetches the rest from /api/candidates
+        filters = candidate_filters(request.args)
+        candidates, next_cursor = load_candidates(DASHBOARD_PAGE_SIZE, cursor, filters)
         
-        return render_template('dashboard.html', candidates=candidates, username=session.get('username'))
+        return render_template('dashboard.html', candidates=candidates, username=session.get('username'),
+                               filters=filters, positions=ranking_query.positions.all(),
+                               next_cursor=next_cursor, rank_offset=rank_offset)
     except Exception as e:
         flash(f'Error loading dashboard: {str(e)}', 'error')
-        return render_template('dashboard.html', candidates=[], username=session.get('username'))
+        return render_template('dashboard.html', candidates=[], username=session.get('username'),
+                               filters=filters, positions=ranking_query.positions.all(),
+                               next_cursor=None, rank_offset=0)
+
+@app.route('/api/candidates')
+@login_required
+def api_candidates():
+    """
+    One page of candidates by descending score, as JSON.
+    
+    Query parameters: position, min_score, date_from, date_to (YYYY-MM-DD),
+    limit and the opaque cursor returned as next_cursor by the previous page.
+    """
+    try:
+        filters = candidate_filters(request.args)
+        limit = min(max(request.args.get('limit', DASHBOARD_PAGE_SIZE, type=int), 1), MAX_PAGE_SIZE)
+        candidates, next_cursor = load_candidates(limit, request.args.get('cursor'), filters)
+    except ValueError as e:
+        return jsonify({'error': f'Invalid parameter: {str(e)}'}), 400
+    except Exception as e:
+        return jsonify({'error': f'Could not load candidates: {str(e)}'}), 500
+    
+    return jsonify({
+        'candidates': [
+            dict(candidate, ranking_score=float(candidate['ranking_score']))
+            for candidate in candidates
+        ],
+        'next_cursor': next_cursor
+    })
 
 @app.route('/upload', methods=['POST'])
 @login_required
@@ -108,9 +232,7 @@ def upload_cv():
         return jsonify({'error': 'Invalid file type. Only PDF, DOC, DOCX allowed'}), 400
     
     try:
-        filename = secure_filename(file.filename)
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        s3_key = f"cvs/{timestamp}_{filename}"
+        s3_key = new_cv_key(file.filename)
         
         # Upload to S3
         s3_client.upload_fileobj(
@@ -125,23 +247,170 @@ def upload_cv():
             }
         )
         
-        # Send message to SQS (via API Gateway)
-        message = {
-            's3_bucket': S3_BUCKET,
-            's3_key': s3_key,
-            'job_position': job_position,
-            'uploaded_by': session.get('username')
-        }
+        # Send message to SQS (otherwise the S3 event notification does)
+        if enqueuer:
+            version_id = s3_client.head_object(Bucket=S3_BUCKET, Key=s3_key).get('VersionId')
+            errors = enqueue_cvs([(s3_key, version_id)], job_position)
+            if errors:
+                return jsonify({'error': f'CV uploaded but not queued: {errors[s3_key]}', 's3_key': s3_key}), 502
         
-        # TODO: Implement API Gateway call to trigger SQS
-        # For now, Lambda will be triggered by S3 event
-        
-        flash('CV uploaded successfully! Processing will begin shortly.', 'success')
+        ranking_query.positions.add(job_position)
+        event_bus.publish('status', {'s3_key': s3_key, 'status': 'uploaded', 'job_position': job_position})
         return jsonify({'success': True, 'message': 'CV uploaded successfully', 's3_key': s3_key})
         
     except Exception as e:
         return jsonify({'error': f'Upload failed: {str(e)}'}), 500
 
+@app.route('/upload/bulk', methods=['POST'])
+@login_required
+def upload_bulk():
+    """
+    Upload many CVs at once: several files and/or ZIP archives in 'cv_files'.
+    
+    Returns a manifest with the outcome of every file (uploaded, skipped
+    or failed) and the totals.
+    """
+    files = [f for f in request.files.getlist('cv_files') if f.filename]
+    if not files:
+        return jsonify({'error': 'No file provided'}), 400
+    
+    job_position = request.form.get('job_position', 'General')
+    uploader = BulkUploader(s3_client, S3_BUCKET, ALLOWED_EXTENSIONS, MAX_UPLOAD_BYTES, new_cv_key,
+                            record_versions=enqueuer is not None)
+    manifest = uploader.upload(files, {
+        'job_position': job_position,
+        'uploaded_by': session.get('username', 'unknown')
+    })
+    
+    # Queue the uploaded CVs, SendMessageBatch takes 10 at a time
+    uploaded = [r for r in manifest if r['status'] == 'uploaded']
+    errors = enqueue_cvs([(r['s3_key'], r['version_id']) for r in uploaded], job_position)
+    for result in uploaded:
+        if result['s3_key'] in errors:
+            result.update(status='failed', error=f"Not queued: {errors[result['s3_key']]}")
+    
+    ranking_query.positions.add(job_position)
+    for result in manifest:
+        if result['status'] == 'uploaded':
+            event_bus.publish('status', {
+                's3_key': result['s3_key'], 'status': 'uploaded', 'job_position': job_position
+            })
+    
+    summary = {status: sum(1 for r in manifest if r['status'] == status)
+               for status in ('uploaded', 'skipped', 'failed')}
+    return jsonify({'success': summary['failed'] == 0, 'summary': summary, 'files': manifest})
+
+@app.route('/api/uploads', methods=['POST'])
+@login_required
+def create_upload():
+    """
+    Issue a presigned POST so the browser uploads a CV straight to S3.
+    
+    The policy pins the key, the job_position/uploaded_by metadata and the
+    Content-Type, and bounds the size with content-length-range, so the
+    browser can't change them. The browser then calls /api/uploads/complete.
+    """
+    data = request.get_json(silent=True) or request.form
+    filename = data.get('filename', '')
+    job_position = data.get('job_position') or 'General'
+    
+    if not allowed_file(filename):
+        return jsonify({'error': 'Invalid file type. Only PDF, DOC, DOCX allowed'}), 400
+    try:
+        size = int(data.get('size', 0))
+    except (TypeError, ValueError):
+        return jsonify({'error': 'Invalid file size'}), 400
+    if size > MAX_UPLOAD_BYTES:
+        return jsonify({'error': f'File too large (max {MAX_UPLOAD_BYTES // (1024 * 1024)} MB)'}), 400
+    
+    s3_key = new_cv_key(filename)
+    content_type = CONTENT_TYPES[filename.rsplit('.', 1)[1].lower()]
+    fields = {
+        'Content-Type': content_type,
+        'x-amz-meta-job_position': job_position,
+        'x-amz-meta-uploaded_by': session.get('username', 'unknown')
+    }
+    
+    try:
+        presigned = s3_client.generate_presigned_post(
+            S3_BUCKET,
+            s3_key,
+            Fields=fields,
+            Conditions=[{name: value} for name, value in fields.items()] + [
+                ['content-length-range', 1, MAX_UPLOAD_BYTES]
+            ],
+            ExpiresIn=PRESIGNED_UPLOAD_EXPIRES
+        )
+    except Exception as e:
+        return jsonify({'error': f'Could not prepare upload: {str(e)}'}), 500
+    
+    return jsonify({
+        'url': presigned['url'],
+        'fields': presigned['fields'],
+        's3_key': s3_key,
+        'expires_in': PRESIGNED_UPLOAD_EXPIRES
+    })
+
+@app.route('/api/uploads/complete', methods=['POST'])
+@login_required
+def complete_upload():
+    """Confirm a direct upload once the browser's POST to S3 succeeded."""
+    data = request.get_json(silent=True) or request.form
+    s3_key = data.get('s3_key', '')
+    if not s3_key.startswith('cvs/'):
+        return jsonify({'error': 'Invalid upload key'}), 400
+    
+    try:
+        head = s3_client.head_object(Bucket=S3_BUCKET, Key=s3_key)
+    except Exception:
+        return jsonify({'error': 'Upload not found'}), 404
+    
+    metadata = head.get('Metadata', {})
+    if metadata.get('uploaded_by') != session.get('username', 'unknown'):
+        return jsonify({'error': 'Upload not found'}), 404
+    # The POST policy bounds the size; this guards objects stored any other way
+    if not 0 < head.get('ContentLength', 0) <= MAX_UPLOAD_BYTES:
+        return jsonify({'error': f'Invalid file size (max {MAX_UPLOAD_BYTES // (1024 * 1024)} MB)'}), 400
+    
+    job_position = metadata.get('job_position', 'General')
+    errors = enqueue_cvs([(s3_key, head.get('VersionId'))], job_position)
+    if errors:
+        return jsonify({'error': f'CV uploaded but not queued: {errors[s3_key]}'}), 502
+    
+    ranking_query.positions.add(job_position)
+    event_bus.publish('status', {'s3_key': s3_key, 'status': 'uploaded', 'job_position': job_position})
+    return jsonify({
+        'success': True,
+        'message': 'CV uploaded successfully',
+        's3_key': s3_key,
+        'version_id': head.get('VersionId'),
+        'size': head.get('ContentLength')
+    })
+
+@app.route('/api/events')
+@login_required
+def api_events():
+    """
+    Server-Sent Events stream of CV status changes and newly ranked candidates.
+    
+    Events: 'status' (s3_key, status: uploaded/processing/processed/failed)
+    and 'candidate' (the ranked row, once processed). Each stream holds a
+    server thread, so their number is capped; past the cap the request gets
+    a 503 and the dashboard polls /api/candidates instead.
+    """
+    subscriber = event_bus.subscribe()
+    if subscriber is None:
+        return jsonify({'error': 'Too many open event streams'}), 503, {'Retry-After': '60'}
+    
+    response = Response(
+        event_bus.stream(subscriber),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+    # Free the slot even if the stream is closed before it starts
+    response.call_on_close(lambda: event_bus.unsubscribe(subscriber))
+    return response
+
 @app.route('/health')
 def health():
     return jsonify({'status': 'healthy', 'service': 'smart-ats-frontend'}), 200
@@ -0,0 +1,188 @@
+import contextlib
+import os
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from boto3.s3.transfer import TransferConfig
+
+# Parallel S3 transfers for one bulk request
+BULK_UPLOAD_WORKERS = int(os.environ.get('BULK_UPLOAD_WORKERS', '8'))
+# Limits per bulk request (files and total uncompressed bytes)
+BULK_MAX_FILES = int(os.environ.get('BULK_MAX_FILES', '500'))
+BULK_MAX_BYTES = int(os.environ.get('BULK_MAX_BYTES', str(500 * 1024 * 1024)))
+# Archive entries compressed more than this are treated as zip bombs
+MAX_COMPRESSION_RATIO = 100
+
+# CVs are small: one PUT each (no multipart), no extra threads per file,
+# since the parallelism comes from uploading many files at once
+TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=16 * 1024 * 1024,
+    max_concurrency=1,
+    use_threads=False
+)
+
+
+class BulkUploader:
+    """
+    Upload many CVs, given as files and/or ZIP archives, to S3 in parallel.
+
+    Archive entries are streamed from the ZIP straight into S3 (never
+    extracted to disk) by a bounded thread pool. Entry count, declared
+    sizes and compression ratios are checked before anything is read, so
+    a zip bomb is rejected up front. Every file ends up in the manifest as
+    'uploaded', 'skipped' or 'failed'.
+    """
+
+    def __init__(self, s3_client, bucket, allowed_extensions, max_file_bytes, make_key,
+                 workers=BULK_UPLOAD_WORKERS, max_files=BULK_MAX_FILES, max_bytes=BULK_MAX_BYTES,
+                 record_versions=False):
+        """
+        Args:
+            s3_client: boto3 S3 client (its connection pool should fit ``workers``)
+            bucket: Target bucket
+            allowed_extensions: Accepted CV extensions, without the dot
+            max_file_bytes: Largest accepted CV
+            make_key: Callable(filename) -> S3 key
+            workers: Concurrent transfers
+            max_files: Most CVs accepted in one request
+            max_bytes: Most (uncompressed) bytes accepted in one request
+            record_versions: Look up the VersionId of every uploaded object
+                (needed to enqueue explicit processing messages)
+        """
+        self.s3_client = s3_client
+        self.bucket = bucket
+        self.allowed_extensions = allowed_extensions
+        self.max_file_bytes = max_file_bytes
+        self.make_key = make_key
+        self.workers = workers
+        self.max_files = max_files
+        self.max_bytes = max_bytes
+        self.record_versions = record_versions
+
+    def upload(self, files, metadata):
+        """
+        Upload every CV found in ``files``.
+
+        Args:
+            files: Werkzeug FileStorage objects (CVs or .zip archives)
+            metadata: S3 user metadata set on every object
+
+        Returns:
+            Manifest: list of dicts with filename, status, s3_key, version_id and error
+        """
+        manifest = []
+        jobs = []
+        archives = []
+        total_bytes = 0
+
+        try:
+            # 1. Collect the CVs to upload, validating sizes before any transfer
+            for storage in files:
+                if self._extension(storage.filename) == 'zip':
+                    try:
+                        archive = zipfile.ZipFile(storage.stream)
+                    except zipfile.BadZipFile:
+                        manifest.append(self._result(storage.filename, 'failed', error='Not a valid ZIP archive'))
+                        continue
+                    archives.append(archive)
+                    if len(archive.infolist()) > self.max_files:
+                        manifest.append(self._result(
+                            storage.filename, 'skipped', error=f'Too many files (max {self.max_files} per upload)'
+                        ))
+                        continue
+                    sources = [
+                        (f"{storage.filename}/{info.filename}", info.file_size,
+                         self._zip_opener(archive, info), self._zip_error(info))
+                        for info in archive.infolist() if not info.is_dir()
+                    ]
+                else:
+                    size = self._stream_size(storage.stream)
+                    sources = [(storage.filename, size, self._file_opener(storage), None)]
+
+                for filename, size, opener, error in sources:
+                    error = error or self._file_error(filename, size)
+                    if not error and len(jobs) >= self.max_files:
+                        error = f'Too many files (max {self.max_files} per upload)'
+                    if not error and total_bytes + size > self.max_bytes:
+                        error = f'Upload too large (max {self.max_bytes // (1024 * 1024)} MB per request)'
+                    if error:
+                        manifest.append(self._result(filename, 'skipped', error=error))
+                        continue
+                    total_bytes += size
+                    result = self._result(filename, 'pending')
+                    manifest.append(result)
+                    jobs.append((result, opener))
+
+            # 2. Stream everything to S3 concurrently
+            extra_args = {'Metadata': metadata}
+            with ThreadPoolExecutor(max_workers=max(1, min(self.workers, len(jobs)))) as executor:
+                list(executor.map(lambda job: self._transfer(job[0], job[1], extra_args), jobs))
+        finally:
+            for archive in archives:
+                archive.close()
+
+        return manifest
+
+    def _transfer(self, result, opener, extra_args):
+        """Upload one CV, recording the outcome on its manifest entry."""
+        s3_key = self.make_key(os.path.basename(result['filename']))
+        try:
+            with opener() as stream:
+                self.s3_client.upload_fileobj(
+                    stream, self.bucket, s3_key, ExtraArgs=extra_args, Config=TRANSFER_CONFIG
+                )
+            # upload_fileobj doesn't return the new object's version
+            version_id = None
+            if self.record_versions:
+                version_id = self.s3_client.head_object(Bucket=self.bucket, Key=s3_key).get('VersionId')
+            result.update(status='uploaded', s3_key=s3_key, version_id=version_id)
+        except Exception as e:
+            result.update(status='failed', error=str(e))
+
+    def _file_error(self, filename, size):
+        """Reason to skip a CV, or None."""
+        name = os.path.basename(filename)
+        if not name or name.startswith('.') or '__MACOSX/' in filename:
+            return 'Not a CV'
+        if self._extension(name) not in self.allowed_extensions:
+            return 'Invalid file type. Only PDF, DOC, DOCX allowed'
+        if size == 0:
+            return 'Empty file'
+        if size > self.max_file_bytes:
+            return f'File too large (max {self.max_file_bytes // (1024 * 1024)} MB)'
+        return None
+
+    def _zip_error(self, info):
+        """Reason to reject an archive entry before reading it, or None."""
+        if info.flag_bits & 0x1:
+            return 'Encrypted entries are not supported'
+        if info.compress_size and info.file_size / info.compress_size > MAX_COMPRESSION_RATIO:
+            return 'Suspicious compression ratio'
+        return None
+
+    @staticmethod
+    def _zip_opener(archive, info):
+        # ZipExtFile never yields more than the declared file_size
+        return lambda: archive.open(info)
+
+    @staticmethod
+    def _file_opener(storage):
+        def open_file():
+            storage.stream.seek(0)
+            # The request's stream is left open for Werkzeug to clean up
+            return contextlib.nullcontext(storage.stream)
+        return open_file
+
+    @staticmethod
+    def _stream_size(stream):
+        stream.seek(0, os.SEEK_END)
+        size = stream.tell()
+        stream.seek(0)
+        return size
+
+    @staticmethod
+    def _extension(filename):
+        return filename.rsplit('.', 1)[1].lower() if '.' in (filename or '') else ''
+
+    @staticmethod
+    def _result(filename, status, s3_key=None, error=None):
+        return {'filename': filename, 'status': status, 's3_key': s3_key, 'version_id': None, 'error': error}
@@ -0,0 +1,87 @@
+import json
+import os
+import queue
+import threading
+
+# Seconds between SSE keep-alive comments (keeps proxies from closing idle streams)
+KEEPALIVE_SECONDS = 15
+# Event streams open at once per process. Each one holds a server thread
+# for as long as the dashboard stays open, so this stays well below the
+# gunicorn thread count; further dashboards poll /api/candidates instead
+MAX_SUBSCRIBERS = int(os.environ.get('EVENT_STREAM_MAX_SUBSCRIBERS', '8'))
+
+
+class EventBus:
+    """
+    In-process publish/subscribe hub feeding the dashboard's event streams.
+
+    Every subscriber gets its own bounded queue; a subscriber that stops
+    reading loses its oldest events instead of blocking publishers. At most
+    ``max_subscribers`` are registered at once.
+    """
+
+    def __init__(self, max_queued=100, max_subscribers=MAX_SUBSCRIBERS):
+        """
+        Args:
+            max_queued: Events buffered per subscriber
+            max_subscribers: Subscribers registered at once
+        """
+        self.max_queued = max_queued
+        self.max_subscribers = max_subscribers
+        self._subscribers = set()
+        self._lock = threading.Lock()
+
+    def subscribe(self):
+        """Register a subscriber and return its queue, or None when every slot is taken."""
+        subscriber = queue.Queue(maxsize=self.max_queued)
+        with self._lock:
+            if len(self._subscribers) >= self.max_subscribers:
+                return None
+            self._subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        with self._lock:
+            self._subscribers.discard(subscriber)
+
+    def publish(self, event_type, data):
+        """
+        Send an event to every subscriber.
+
+        Args:
+            event_type: SSE event name ('status' or 'candidate')
+            data: JSON-serializable payload
+        """
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscriber in subscribers:
+            while True:
+                try:
+                    subscriber.put_nowait((event_type, data))
+                    break
+                except queue.Full:
+                    # Drop the oldest event for slow readers
+                    try:
+                        subscriber.get_nowait()
+                    except queue.Empty:
+                        pass
+
+    def stream(self, subscriber):
+        """
+        Yield Server-Sent Events for a subscriber until the client disconnects.
+
+        Args:
+            subscriber: Queue returned by subscribe(); unsubscribed on exit
+        """
+        try:
+            # Ask the browser to wait a few seconds before reconnecting
+            yield 'retry: 3000\n\n'
+            while True:
+                try:
+                    event_type, data = subscriber.get(timeout=KEEPALIVE_SECONDS)
+                except queue.Empty:
+                    yield ': keep-alive\n\n'
+                    continue
+                yield f"event: {event_type}\ndata: {json.dumps(data, default=str)}\n\n"
+        finally:
+            self.unsubscribe(subscriber)
@@ -0,0 +1,283 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from boto3.dynamodb.types import TypeDeserializer
+from botocore.exceptions import ClientError
+
+# Read-through cache of ranking pages (per gunicorn worker process)
+RANKING_CACHE_SIZE = int(os.environ.get('RANKING_CACHE_SIZE', '256'))
+RANKING_CACHE_TTL = float(os.environ.get('RANKING_CACHE_TTL', '60'))
+# Stream of the candidates table; when set, writes invalidate cached pages
+CANDIDATES_STREAM_ARN = os.environ.get('CANDIDATES_STREAM_ARN')
+
+
+class RankingCache:
+    """
+    Size-bounded LRU cache of ranking pages with a TTL.
+
+    Keys are tuples whose first element is the job position the page was
+    read for (None for the "all positions" view), so a change to one
+    position only evicts that position's pages and the merged ones. The TTL
+    bounds staleness when no invalidation source is running.
+
+    Each position has a generation counter bumped by ``invalidate``; a page
+    whose position was invalidated while it was being loaded is returned
+    but not stored, since it may predate the change.
+    """
+
+    def __init__(self, max_entries=RANKING_CACHE_SIZE, ttl_seconds=RANKING_CACHE_TTL, clock=time.monotonic):
+        """
+        Args:
+            max_entries: Pages kept before the least recently used is evicted
+            ttl_seconds: Seconds a page is served before it is reloaded
+            clock: Monotonic clock (overridable in tests)
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self._entries = OrderedDict()
+        # Position -> invalidation count; _all_generation counts full clears
+        self._generations = {}
+        self._all_generation = 0
+        self._lock = threading.Lock()
+
+    def get_or_load(self, key, loader):
+        """
+        Return the cached value for ``key``, calling ``loader()`` on a miss.
+
+        Args:
+            key: Tuple starting with the job position (or None)
+            loader: Callable producing the value
+        """
+        now = self.clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > now:
+                self._entries.move_to_end(key)
+                return entry[1]
+            generation = self._generation(key[0])
+
+        # Loaded outside the lock so a slow query doesn't block other pages
+        value = loader()
+        with self._lock:
+            if self._generation(key[0]) != generation:
+                # Invalidated mid-load: the value may predate the change
+                return value
+            self._entries[key] = (now + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def invalidate(self, position=None):
+        """
+        Drop the pages of one position and of the merged view.
+
+        Args:
+            position: Job position that changed, or None to clear everything
+        """
+        with self._lock:
+            if position is None:
+                self._all_generation += 1
+                self._entries.clear()
+                return
+            self._generations[position] = self._generations.get(position, 0) + 1
+            for key in [k for k in self._entries if k[0] in (position, None)]:
+                del self._entries[key]
+
+    def _generation(self, position):
+        """
+        Invalidation state of the pages read for ``position`` (call with the lock held).
+
+        The merged view (None) changes with every position.
+        """
+        if position is None:
+            return self._all_generation, sum(self._generations.values())
+        return self._all_generation, self._generations.get(position, 0)
+
+
+class StreamInvalidator:
+    """
+    Invalidate a RankingCache from the candidates table's DynamoDB Stream.
+
+    A daemon thread tails every open shard from LATEST and evicts the
+    position of each changed candidate (taken from the new or old image).
+    With an EventBus, each change is also published as a 'status' event
+    (and a 'candidate' event carrying the ranked row once processed). With
+    a PositionDirectory, new positions join the "all positions" view as
+    soon as a candidate is written for them.
+    Shards closed by DynamoDB are replaced by their children, read from
+    TRIM_HORIZON so no change is missed across the rollover. A shard whose
+    iterator fails (e.g. expired after a long pause) is reopened after the
+    last record applied from it, and failed polls, including the first
+    discovery, are retried with a backoff, so the thread never stops.
+
+    DynamoDB Streams serves at most two concurrent readers per shard
+    before throttling, so run it in no more than two processes (the
+    Dockerfile runs a single gunicorn worker) and rely on the TTL elsewhere.
+    """
+
+    # Attributes of a changed candidate sent to the dashboard
+    EVENT_FIELDS = ('candidate_id', 'candidate_name', 'job_position', 'ranking_score',
+                    'skills_matched', 'status', 'upload_date', 's3_key', 'error')
+
+    def __init__(self, streams_client, stream_arn, cache, bus=None, positions=None, poll_interval=1.0):
+        """
+        Args:
+            streams_client: boto3 'dynamodbstreams' client
+            stream_arn: LatestStreamArn of the candidates table
+            cache: RankingCache to invalidate
+            bus: Optional EventBus receiving candidate status changes
+            positions: Optional PositionDirectory told about changed positions
+            poll_interval: Seconds between polling rounds
+        """
+        self.client = streams_client
+        self.stream_arn = stream_arn
+        self.cache = cache
+        self.bus = bus
+        self.positions = positions
+        self.poll_interval = poll_interval
+        self._deserializer = TypeDeserializer()
+        self._iterators = {}
+        self._seen_shards = set()
+        # Shard -> iterator type it was first opened with / last sequence number applied
+        self._start_types = {}
+        self._last_sequence = {}
+        self._discovered = False
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Start polling in a daemon thread."""
+        self._thread = threading.Thread(target=self._run, name='ranking-stream', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                if not self._discovered:
+                    self._discover_shards(initial=True)
+                    self._discovered = True
+                self.poll_once()
+            except Exception as e:
+                # Throttling or a transient error: the TTL covers the gap
+                print(f"Ranking stream poll failed: {str(e)}")
+                self._stop.wait(self.poll_interval * 5)
+                continue
+            self._stop.wait(self.poll_interval)
+
+    def poll_once(self):
+        """Read new records from every tracked shard and apply them."""
+        if not self._iterators:
+            self._discover_shards()
+
+        rediscover = False
+        for shard_id, iterator in list(self._iterators.items()):
+            try:
+                response = self.client.get_records(ShardIterator=iterator, Limit=1000)
+            except Exception as e:
+                # Expired or invalid iterator: reopen the shard where we stopped
+                print(f"Ranking stream shard {shard_id} needs a new iterator: {str(e)}")
+                del self._iterators[shard_id]
+                self._seen_shards.discard(shard_id)
+                rediscover = True
+                continue
+
+            for record in response.get('Records', []):
+                self.apply(record)
+                sequence_number = record.get('dynamodb', {}).get('SequenceNumber')
+                if sequence_number:
+                    self._last_sequence[shard_id] = sequence_number
+
+            next_iterator = response.get('NextShardIterator')
+            if next_iterator:
+                self._iterators[shard_id] = next_iterator
+            else:
+                # Shard closed: pick up its children
+                del self._iterators[shard_id]
+                self._start_types.pop(shard_id, None)
+                self._last_sequence.pop(shard_id, None)
+                rediscover = True
+
+        if rediscover:
+            self._discover_shards()
+
+    def apply(self, record):
+        """Invalidate the position touched by one stream record and publish it."""
+        images = record.get('dynamodb', {})
+        changed = {
+            image['job_position'].get('S')
+            for image in (images.get('NewImage'), images.get('OldImage'))
+            if image and 'job_position' in image
+        }
+        if not changed:
+            self.cache.invalidate()
+        for position in changed:
+            self.cache.invalidate(position)
+            if self.positions:
+                self.positions.add(position)
+
+        if self.bus and images.get('NewImage'):
+            self.publish(images['NewImage'])
+
+    def publish(self, new_image):
+        """Publish the new state of a candidate on the event bus."""
+        candidate = {
+            name: self._deserializer.deserialize(value)
+            for name, value in new_image.items() if name in self.EVENT_FIELDS
+        }
+        if 'ranking_score' in candidate:
+            candidate['ranking_score'] = float(candidate['ranking_score'])
+
+        self.bus.publish('status', {
+            's3_key': candidate.get('s3_key'),
+            'status': candidate.get('status'),
+            'error': candidate.get('error')
+        })
+        if candidate.get('status') == 'processed':
+            self.bus.publish('candidate', candidate)
+
+    def _discover_shards(self, initial=False):
+        """Start reading shards not seen before."""
+        kwargs = {'StreamArn': self.stream_arn}
+        while True:
+            description = self.client.describe_stream(**kwargs)['StreamDescription']
+            for shard in description.get('Shards', []):
+                shard_id = shard['ShardId']
+                if shard_id in self._seen_shards:
+                    continue
+                # Closed shards hold only history we don't need, unless we were reading them
+                closed = 'EndingSequenceNumber' in shard.get('SequenceNumberRange', {})
+                if closed and shard_id not in self._start_types:
+                    self._seen_shards.add(shard_id)
+                    continue
+                self._iterators[shard_id] = self._open_iterator(shard_id, 'LATEST' if initial else 'TRIM_HORIZON')
+                self._seen_shards.add(shard_id)
+
+            last_shard = description.get('LastEvaluatedShardId')
+            if not last_shard:
+                return
+            kwargs['ExclusiveStartShardId'] = last_shard
+
+    def _open_iterator(self, shard_id, iterator_type):
+        """Iterator on a shard, resuming after the last record applied from it."""
+        kwargs = {'StreamArn': self.stream_arn, 'ShardId': shard_id}
+        sequence_number = self._last_sequence.get(shard_id)
+        if sequence_number:
+            try:
+                return self.client.get_shard_iterator(
+                    ShardIteratorType='AFTER_SEQUENCE_NUMBER', SequenceNumber=sequence_number, **kwargs
+                )['ShardIterator']
+            except ClientError as e:
+                if e.response.get('Error', {}).get('Code') != 'TrimmedDataAccessException':
+                    raise
+                # Records after ours were trimmed: read what the shard still holds
+                del self._last_sequence[shard_id]
+                self._start_types[shard_id] = 'TRIM_HORIZON'
+
+        iterator_type = self._start_types.setdefault(shard_id, iterator_type)
+        return self.client.get_shard_iterator(ShardIteratorType=iterator_type, **kwargs)['ShardIterator']
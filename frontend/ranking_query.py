@@ -0,0 +1,306 @@
+import base64
+import heapq
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal, InvalidOperation
+
+RANKING_INDEX = 'JobPositionRankingIndex'
+
+# Positions always merged in the "all positions" view (comma-separated);
+# positions found in the candidates table are added to them
+DEFAULT_POSITIONS = ['Software Engineer', 'Cloud Engineer', 'Data Scientist', 'DevOps Engineer', 'General']
+JOB_POSITIONS = [
+    position.strip()
+    for position in os.environ.get('JOB_POSITIONS', ','.join(DEFAULT_POSITIONS)).split(',')
+    if position.strip()
+]
+# Seconds between scans of the ranking index for positions
+POSITIONS_REFRESH_SECONDS = float(os.environ.get('POSITIONS_REFRESH_SECONDS', '600'))
+# Concurrent per-position queries for one page of the "all positions" view
+MAX_QUERY_WORKERS = 16
+# Attributes of the index key a cursor resumes each position from
+CURSOR_KEY_ATTRIBUTES = ('candidate_id', 'job_position', 'ranking_score')
+
+
+def encode_cursor(state):
+    """Encode pagination state as an opaque URL-safe token."""
+    payload = json.dumps(state, default=str, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip('=')
+
+
+def decode_cursor(token):
+    """
+    Decode a token produced by encode_cursor.
+
+    Cursors come back from the client, so the whole state is checked before
+    any of it reaches a Query: a mapping of position to None or to the index
+    key of that position, with a numeric ranking_score.
+
+    Raises:
+        ValueError: If the token is malformed
+    """
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        state = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except Exception:
+        raise ValueError('Invalid cursor')
+    if not isinstance(state, dict) or not state:
+        raise ValueError('Invalid cursor')
+
+    for position, key in state.items():
+        if key is None:
+            continue
+        if not isinstance(key, dict) or set(key) != set(CURSOR_KEY_ATTRIBUTES):
+            raise ValueError('Invalid cursor')
+        if not all(isinstance(key[name], str) for name in CURSOR_KEY_ATTRIBUTES):
+            raise ValueError('Invalid cursor')
+        if key['job_position'] != position:
+            raise ValueError('Invalid cursor')
+        try:
+            score = Decimal(key['ranking_score'])
+        except InvalidOperation:
+            raise ValueError('Invalid cursor')
+        if not score.is_finite():
+            raise ValueError('Invalid cursor')
+    return state
+
+
+class PositionDirectory:
+    """
+    Job positions merged in the "all positions" view.
+
+    Uploads accept any position, so the list is built from the data: the
+    configured positions, every position found by a Scan of the ranking
+    index (projecting only job_position), and positions reported through
+    ``add()`` as they are seen (uploads handled by this process, the
+    candidates stream). The Scan reads the whole index, so it runs at most
+    once every ``refresh_seconds``, in a daemon thread: requests never wait
+    for it and are served the known positions meanwhile. If it fails, the
+    known positions are kept.
+    """
+
+    def __init__(self, client, table_name, configured=None, index_name=RANKING_INDEX,
+                 refresh_seconds=POSITIONS_REFRESH_SECONDS, clock=time.monotonic):
+        """
+        Args:
+            client: DynamoDB client (``dynamodb.meta.client`` of the boto3 resource)
+            table_name: Candidates table
+            configured: Positions always listed first (default: JOB_POSITIONS)
+            index_name: GSI keyed on job_position / ranking_score
+            refresh_seconds: Seconds between scans of the index
+            clock: Monotonic clock (overridable in tests)
+        """
+        self.client = client
+        self.table_name = table_name
+        self.index_name = index_name
+        self.refresh_seconds = refresh_seconds
+        self.clock = clock
+        # Insertion-ordered set: configured positions first, then as discovered
+        self._positions = dict.fromkeys(JOB_POSITIONS if configured is None else configured)
+        self._expires_at = None
+        self._refresher = None
+        self._lock = threading.Lock()
+
+    def add(self, position):
+        """Record a position seen outside the index scan."""
+        if position:
+            with self._lock:
+                self._positions.setdefault(position, None)
+
+    def all(self):
+        """Return every known position, starting a background rescan when due."""
+        with self._lock:
+            due = self._expires_at is None or self.clock() >= self._expires_at
+            if due and self._refresher is None:
+                self._refresher = threading.Thread(target=self.refresh, name='position-scan', daemon=True)
+                self._refresher.start()
+            return list(self._positions)
+
+    def refresh(self):
+        """Scan the index and add the positions found; errors keep the known ones."""
+        try:
+            found = sorted(self._scan())
+        except Exception as e:
+            print(f"Error listing job positions, keeping known ones: {str(e)}")
+            found = []
+        with self._lock:
+            for position in found:
+                self._positions.setdefault(position, None)
+            # Errors also wait a full interval, so a failing Scan isn't retried per page
+            self._expires_at = self.clock() + self.refresh_seconds
+            self._refresher = None
+
+    def _scan(self):
+        """Distinct job positions on the (sparse) ranking index."""
+        positions = set()
+        kwargs = {'TableName': self.table_name, 'IndexName': self.index_name, 'ProjectionExpression': 'job_position'}
+        while True:
+            response = self.client.scan(**kwargs)
+            positions.update(item['job_position'] for item in response.get('Items', []))
+            if 'LastEvaluatedKey' not in response:
+                return positions
+            kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+
+class RankingQuery:
+    """
+    Top-K candidate queries on the JobPositionRankingIndex GSI.
+
+    Each position is read with a descending Query (ScanIndexForward=False)
+    limited to the page size, so a page costs K items per position no matter
+    how large the table is. The "all positions" view queries every known
+    position concurrently and merges the sorted results with a heap. Cursors record,
+    per position, the key of the last candidate shown, so the next page
+    resumes each position exactly where it stopped.
+    """
+
+    # Upper bound on Query requests per position for one page
+    MAX_QUERY_PAGES = 5
+
+    def __init__(self, client, table_name, positions=None, index_name=RANKING_INDEX):
+        """
+        Args:
+            client: DynamoDB client (``dynamodb.meta.client`` of the boto3 resource)
+            table_name: Candidates table
+            positions: PositionDirectory of the "all positions" view (by default
+                the configured positions plus those found on the index)
+            index_name: GSI keyed on job_position / ranking_score
+        """
+        self.client = client
+        self.table_name = table_name
+        if positions is None:
+            positions = PositionDirectory(client, table_name, index_name=index_name)
+        self.positions = positions
+        self.index_name = index_name
+
+    def top_candidates(self, limit, position=None, cursor=None, min_score=None,
+                       date_from=None, date_to=None, attributes=None):
+        """
+        Return one page of candidates by descending ranking score.
+
+        Args:
+            limit: Page size (K)
+            position: Job position, or None for every known position
+            cursor: Token returned with the previous page
+            min_score: Optional lowest ranking score (applied on the index key)
+            date_from: Optional earliest upload date, 'YYYY-MM-DD'
+            date_to: Optional latest upload date, 'YYYY-MM-DD'
+            attributes: Optional attributes to return (index keys are always included)
+
+        Returns:
+            Tuple of (candidates, next_cursor); next_cursor is None on the last page
+        """
+        if cursor:
+            state = decode_cursor(cursor)
+        else:
+            # Position -> last key shown (None = start from the top)
+            state = {p: None for p in ([position] if position else self.positions.all())}
+
+        query_kwargs = self._query_kwargs(min_score, date_from, date_to, attributes)
+        positions = list(state)
+        with ThreadPoolExecutor(max_workers=max(1, min(len(positions), MAX_QUERY_WORKERS))) as executor:
+            pages = dict(zip(positions, executor.map(
+                lambda p: self._query_position(p, limit, state[p], query_kwargs), positions
+            )))
+
+        # Merge the per-position pages, best score first
+        streams = [
+            [(item['ranking_score'], p, item) for item in pages[p][0]]
+            for p in positions
+        ]
+        merged = heapq.merge(*streams, key=lambda entry: entry[0], reverse=True)
+        candidates = []
+        consumed = {p: 0 for p in positions}
+        for _, p, item in merged:
+            if len(candidates) == limit:
+                break
+            candidates.append(item)
+            consumed[p] += 1
+
+        # Advance each position past what was shown; drop exhausted ones
+        next_state = {}
+        for p in positions:
+            items, resume_key = pages[p]
+            if consumed[p] < len(items):
+                next_state[p] = self._key(items[consumed[p] - 1]) if consumed[p] else state[p]
+            elif resume_key:
+                # Everything read was shown (or filtered out): continue after it
+                next_state[p] = self._key(resume_key)
+
+        return candidates, (encode_cursor(next_state) if next_state else None)
+
+    def _query_kwargs(self, min_score, date_from, date_to, attributes):
+        """Build the Query parameters shared by every position."""
+        names = {}
+        values = {}
+        key_condition = 'job_position = :position'
+        if min_score is not None:
+            key_condition += ' AND ranking_score >= :min_score'
+            values[':min_score'] = Decimal(str(min_score))
+
+        filters = []
+        if date_from:
+            filters.append('upload_date >= :date_from')
+            values[':date_from'] = date_from
+        if date_to:
+            # upload_date is 'YYYY-MM-DD HH:MM:SS', so include the whole day
+            filters.append('upload_date <= :date_to')
+            values[':date_to'] = f"{date_to} 23:59:59"
+
+        kwargs = {'KeyConditionExpression': key_condition, 'ExpressionAttributeValues': values}
+        if filters:
+            kwargs['FilterExpression'] = ' AND '.join(filters)
+        if attributes:
+            projected = list(dict.fromkeys(['candidate_id', 'job_position', 'ranking_score'] + list(attributes)))
+            # Aliases avoid clashes with reserved words such as 'status'
+            for index, attribute in enumerate(projected):
+                names[f"#a{index}"] = attribute
+            kwargs['ProjectionExpression'] = ', '.join(names)
+        if names:
+            kwargs['ExpressionAttributeNames'] = names
+        return kwargs
+
+    def _query_position(self, position, limit, start_key, query_kwargs):
+        """
+        Read up to ``limit`` candidates of one position after ``start_key``.
+
+        With a FilterExpression a Query page can come back short, so pages
+        are read until ``limit`` matches are found, the position is
+        exhausted or MAX_QUERY_PAGES requests were made.
+
+        Returns:
+            Tuple of (items, resume_key); resume_key is the LastEvaluatedKey to
+            continue from once every item is consumed, None when exhausted
+        """
+        kwargs = dict(
+            query_kwargs,
+            TableName=self.table_name,
+            IndexName=self.index_name,
+            ExpressionAttributeValues=dict(query_kwargs['ExpressionAttributeValues'], **{':position': position}),
+            ScanIndexForward=False,
+            Limit=limit
+        )
+        if start_key:
+            kwargs['ExclusiveStartKey'] = dict(start_key, ranking_score=Decimal(start_key['ranking_score']))
+
+        items = []
+        for _ in range(self.MAX_QUERY_PAGES):
+            response = self.client.query(**kwargs)
+            items.extend(response.get('Items', []))
+            resume_key = response.get('LastEvaluatedKey')
+            if not resume_key or len(items) >= limit:
+                break
+            kwargs['ExclusiveStartKey'] = resume_key
+            kwargs['Limit'] = limit - len(items)
+        return items, resume_key
+
+    def _key(self, item):
+        """Index key of an item, usable as ExclusiveStartKey."""
+        return {
+            'candidate_id': item['candidate_id'],
+            'job_position': item['job_position'],
+            'ranking_score': str(item['ranking_score'])
+        }
@@ -0,0 +1,127 @@
+import json
+import os
+import random
+import time
+from botocore.exceptions import ClientError
+
+# 'notification' (default): the bucket's S3 event notification feeds the queue
+# 'explicit': the frontend sends one message per uploaded CV itself; the
+# notification must be removed, or every CV is queued and processed twice
+ENQUEUE_MODE = os.environ.get('ENQUEUE_MODE', 'notification')
+SQS_QUEUE_URL = os.environ.get('SQS_QUEUE_URL')
+
+
+class SQSEnqueuer:
+    """
+    Send CV processing messages to the queue with SendMessageBatch.
+
+    Messages are grouped in batches of up to 10 entries (the SQS limit).
+    Entries reported as failed by SQS are retried with exponential backoff,
+    except sender faults (e.g. an invalid message), which would fail again.
+    A call that fails as a whole is retried only when throttled or on a
+    server error; other errors (access denied, missing queue) fail at once.
+    The messages carry job_position and uploaded_by, so the CV processor
+    doesn't need the object metadata to rank the CV.
+    """
+
+    # SendMessageBatch accepts at most 10 entries per call
+    MAX_BATCH_SIZE = 10
+
+    RETRYABLE_ERRORS = {
+        'ThrottlingException',
+        'RequestThrottled',
+        'AWS.SimpleQueueService.RequestThrottled',
+        'KmsThrottled',
+        'ServiceUnavailable',
+        'InternalError',
+        'InternalFailure',
+    }
+
+    def __init__(self, client, queue_url, max_attempts=5, base_delay=0.05, max_delay=2.0, sleep=time.sleep):
+        """
+        Args:
+            client: boto3 SQS client
+            queue_url: URL of the CV processing queue
+            max_attempts: Attempts per batch before giving up
+            base_delay: Base of the exponential backoff, in seconds
+            max_delay: Upper bound for a single backoff sleep, in seconds
+            sleep: Sleep function (overridable in tests)
+        """
+        self.client = client
+        self.queue_url = queue_url
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.sleep = sleep
+
+    @staticmethod
+    def message(bucket, key, version_id, job_position, uploaded_by):
+        """Body of the message for one uploaded CV (the 'direct' format of the CV processor)."""
+        return {
+            's3_bucket': bucket,
+            's3_key': key,
+            's3_version_id': version_id,
+            'job_position': job_position,
+            'uploaded_by': uploaded_by
+        }
+
+    def send(self, messages):
+        """
+        Enqueue every message in batches of MAX_BATCH_SIZE.
+
+        Args:
+            messages: List of message bodies (dicts, sent as JSON)
+
+        Returns:
+            Dict of message index -> error message for the ones not enqueued
+        """
+        failures = {}
+        for start in range(0, len(messages), self.MAX_BATCH_SIZE):
+            batch = {str(index): messages[index]
+                     for index in range(start, min(start + self.MAX_BATCH_SIZE, len(messages)))}
+            for entry_id, error in self._send_batch(batch).items():
+                failures[int(entry_id)] = error
+        return failures
+
+    def _send_batch(self, batch):
+        """Send one batch, retrying failed entries. Returns entry ID -> error."""
+        remaining = {entry_id: None for entry_id in batch}
+        errors = {}
+
+        for attempt in range(self.max_attempts):
+            if attempt:
+                self.sleep(self._backoff(attempt))
+
+            try:
+                response = self.client.send_message_batch(
+                    QueueUrl=self.queue_url,
+                    Entries=[
+                        {'Id': entry_id, 'MessageBody': json.dumps(batch[entry_id])}
+                        for entry_id in remaining
+                    ]
+                )
+            except ClientError as e:
+                code = e.response.get('Error', {}).get('Code')
+                remaining = {entry_id: f"SendMessageBatch failed: {code}" for entry_id in remaining}
+                status = e.response.get('ResponseMetadata', {}).get('HTTPStatusCode', 0)
+                if code not in self.RETRYABLE_ERRORS and status < 500:
+                    break
+                continue
+
+            retry = {}
+            for failed in response.get('Failed', []):
+                error = f"SendMessageBatch failed: {failed.get('Code')}"
+                if failed.get('SenderFault'):
+                    errors[failed['Id']] = error
+                else:
+                    retry[failed['Id']] = error
+            remaining = retry
+            if not remaining:
+                return errors
+
+        errors.update(remaining)
+        return errors
+
+    def _backoff(self, attempt):
+        """Exponential backoff with full jitter."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
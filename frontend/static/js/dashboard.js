@@ -9,35 +9,99 @@ document.getElementById('uploadForm').addEventListener('submit', async (e) => {
     submitButton.textContent = 'Uploading...';
 
     try {
-        const response = await fetch('/upload', {
+        const file = formData.get('cv_file');
+        const result = await uploadDirect(file, formData.get('job_position'));
+
+        // Show success message
+        showAlert('success', result.message);
+
+        // Follow processing through /api/events instead of reloading
+        trackUpload(result.s3_key, file.name);
+
+        // Reset form
+        e.target.reset();
+    } catch (error) {
+        showAlert('error', error.message || 'Network error. Please try again.');
+    } finally {
+        submitButton.disabled = false;
+        submitButton.textContent = 'Upload CV';
+    }
+});
+
+document.getElementById('bulkUploadForm').addEventListener('submit', async (e) => {
+    e.preventDefault();
+
+    const submitButton = e.target.querySelector('button[type="submit"]');
+    submitButton.disabled = true;
+    submitButton.textContent = 'Uploading...';
+
+    try {
+        const response = await fetch('/upload/bulk', {
             method: 'POST',
-            body: formData
+            body: new FormData(e.target)
         });
-
         const result = await response.json();
 
-        if (response.ok) {
-            // Show success message
-            showAlert('success', result.message);
+        if (!response.ok) {
+            throw new Error(result.error || 'Upload failed');
+        }
 
-            // Reset form
-            e.target.reset();
+        // One status entry per file of the manifest
+        result.files.forEach((file) => {
+            if (file.status === 'uploaded') {
+                trackUpload(file.s3_key, file.filename);
+            } else {
+                showUploadEntry(file.filename, file.status, file.error);
+            }
+        });
 
-            // Reload page after 2 seconds to show new candidate
-            setTimeout(() => {
-                window.location.reload();
-            }, 2000);
-        } else {
-            showAlert('error', result.error || 'Upload failed');
-        }
+        const { uploaded, skipped, failed } = result.summary;
+        showAlert(failed ? 'error' : 'success',
+            `${uploaded} CVs uploaded, ${skipped} skipped, ${failed} failed`);
+        e.target.reset();
     } catch (error) {
-        showAlert('error', 'Network error. Please try again.');
+        showAlert('error', error.message || 'Network error. Please try again.');
     } finally {
         submitButton.disabled = false;
-        submitButton.textContent = 'Upload CV';
+        submitButton.textContent = 'Upload All';
     }
 });
 
+// Upload a CV straight to S3 with a presigned POST, then confirm it.
+async function uploadDirect(file, jobPosition) {
+    const presign = await postJSON('/api/uploads', {
+        filename: file.name,
+        size: file.size,
+        job_position: jobPosition
+    });
+
+    // Policy fields first: S3 ignores everything after the file
+    const s3Form = new FormData();
+    Object.entries(presign.fields).forEach(([name, value]) => s3Form.append(name, value));
+    s3Form.append('file', file);
+
+    const s3Response = await fetch(presign.url, { method: 'POST', body: s3Form });
+    if (!s3Response.ok) {
+        throw new Error('Upload rejected by storage (check file size and type)');
+    }
+
+    return postJSON('/api/uploads/complete', { s3_key: presign.s3_key });
+}
+
+async function postJSON(url, body) {
+    const response = await fetch(url, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify(body)
+    });
+    const result = await response.json();
+
+    if (!response.ok) {
+        throw new Error(result.error || 'Upload failed');
+    }
+    return result;
+}
+
 function showAlert(type, message) {
     const alertDiv = document.createElement('div');
     alertDiv.className = `alert alert-${type}`;
@@ -51,3 +115,258 @@ function showAlert(type, message) {
         alertDiv.remove();
     }, 5000);
 }
+
+const candidatesTable = document.getElementById('candidatesTable');
+const tbody = candidatesTable ? candidatesTable.querySelector('tbody') : null;
+
+// Filters of the current view, forwarded to /api/candidates
+const filters = new URLSearchParams(window.location.search);
+const rankOffset = parseInt(filters.get('rank') || '0', 10);
+['cursor', 'rank'].forEach((name) => filters.delete(name));
+
+let nextCursor = candidatesTable ? candidatesTable.dataset.nextCursor : '';
+
+// Infinite scroll: the first page is rendered by the server, the rest is
+// fetched from /api/candidates with the cursor returned by each page.
+if (candidatesTable && nextCursor) {
+    let loading = false;
+
+    // Scrolling replaces the "Next page" link
+    const pagination = document.getElementById('pagination');
+    if (pagination) {
+        pagination.remove();
+    }
+
+    const sentinel = document.createElement('div');
+    sentinel.className = 'scroll-sentinel';
+    candidatesTable.parentElement.after(sentinel);
+
+    const observer = new IntersectionObserver(async (entries) => {
+        if (!entries[0].isIntersecting || loading || !nextCursor) {
+            return;
+        }
+        loading = true;
+
+        try {
+            const params = new URLSearchParams(filters);
+            params.set('cursor', nextCursor);
+            const response = await fetch(`/api/candidates?${params}`);
+            const result = await response.json();
+
+            if (!response.ok) {
+                throw new Error(result.error || 'Could not load candidates');
+            }
+
+            result.candidates.forEach((candidate) => {
+                if (!findCandidateRow(candidate.candidate_id)) {
+                    tbody.appendChild(renderCandidateRow(candidate));
+                }
+            });
+            renumberRanks();
+            nextCursor = result.next_cursor;
+        } catch (error) {
+            showAlert('error', error.message);
+            nextCursor = null;
+        } finally {
+            loading = false;
+            if (!nextCursor) {
+                observer.disconnect();
+                sentinel.remove();
+            }
+        }
+    }, { rootMargin: '400px' });
+
+    observer.observe(sentinel);
+}
+
+function renderCandidateRow(candidate) {
+    const row = document.createElement('tr');
+    row.className = 'candidate-row';
+    row.dataset.candidateId = candidate.candidate_id;
+    row.dataset.score = candidate.ranking_score;
+
+    const status = candidate.status || 'pending';
+    const cells = [
+        ['', 'rank'],
+        [candidate.candidate_name, null, true],
+        [candidate.job_position],
+        [`${candidate.ranking_score.toFixed(1)}%`, 'score'],
+        [candidate.skills_matched || 'N/A'],
+        [null],
+        [candidate.upload_date]
+    ];
+
+    cells.forEach(([text, className, strong]) => {
+        const cell = document.createElement('td');
+        if (className) {
+            cell.className = className;
+        }
+        if (strong) {
+            const bold = document.createElement('strong');
+            bold.textContent = text;
+            cell.appendChild(bold);
+        } else if (text !== null) {
+            cell.textContent = text;
+        }
+        row.appendChild(cell);
+    });
+
+    // Status badge, same markup as the server-rendered rows
+    row.cells[5].appendChild(renderBadge(status));
+
+    return row;
+}
+
+function renderBadge(status) {
+    const badge = document.createElement('span');
+    badge.className = `badge badge-${status}`;
+    badge.textContent = status.charAt(0).toUpperCase() + status.slice(1);
+    return badge;
+}
+
+function findCandidateRow(candidateId) {
+    return Array.from(tbody.rows).find((row) => row.dataset.candidateId === candidateId);
+}
+
+function renumberRanks() {
+    Array.from(tbody.rows).forEach((row, index) => {
+        row.cells[0].textContent = rankOffset + index + 1;
+    });
+}
+
+// Live updates: CV status changes and newly ranked candidates are pushed
+// over Server-Sent Events and patched into the page in place.
+const trackedUploads = new Map();
+
+function trackUpload(s3Key, filename) {
+    trackedUploads.set(s3Key, showUploadEntry(filename, 'uploaded'));
+}
+
+function showUploadEntry(filename, status, error) {
+    let list = document.getElementById('uploadStatus');
+    if (!list) {
+        list = document.createElement('ul');
+        list.id = 'uploadStatus';
+        list.className = 'upload-status';
+        document.getElementById('uploadForm').after(list);
+    }
+
+    const entry = document.createElement('li');
+    const name = document.createElement('span');
+    name.textContent = filename;
+    const badge = renderBadge(status);
+    if (error) {
+        badge.title = error;
+    }
+    entry.append(name, badge);
+    list.prepend(entry);
+    return entry;
+}
+
+function updateUploadStatus(event) {
+    const entry = trackedUploads.get(event.s3_key);
+    if (!entry) {
+        return;
+    }
+
+    const badge = renderBadge(event.status);
+    if (event.error) {
+        badge.title = event.error;
+    }
+    entry.replaceChild(badge, entry.querySelector('.badge'));
+}
+
+function matchesFilters(candidate) {
+    const position = filters.get('position');
+    const minScore = filters.get('min_score');
+    const day = (candidate.upload_date || '').slice(0, 10);
+
+    return (!position || candidate.job_position === position)
+        && (!minScore || candidate.ranking_score >= parseFloat(minScore))
+        && (!filters.get('date_from') || day >= filters.get('date_from'))
+        && (!filters.get('date_to') || day <= filters.get('date_to'));
+}
+
+function patchCandidate(candidate) {
+    if (!matchesFilters(candidate)) {
+        return;
+    }
+    if (!candidatesTable) {
+        // First candidate of an empty view: render the table server-side
+        window.location.reload();
+        return;
+    }
+
+    const existing = findCandidateRow(candidate.candidate_id);
+    if (existing) {
+        existing.remove();
+    }
+
+    const before = Array.from(tbody.rows).find(
+        (row) => parseFloat(row.dataset.score) < candidate.ranking_score
+    );
+    if (before) {
+        tbody.insertBefore(renderCandidateRow(candidate), before);
+    } else if (!nextCursor) {
+        // Below every loaded row: only append once all pages are loaded,
+        // otherwise infinite scroll brings it in at the right place
+        tbody.appendChild(renderCandidateRow(candidate));
+    }
+    renumberRanks();
+}
+
+// The server caps open event streams: when ours is refused (or the browser
+// has no EventSource), poll the first page of candidates instead and retry
+// the stream now and then.
+const POLL_INTERVAL_MS = 15000;
+const STREAM_RETRY_MS = 60000;
+let pollTimer = null;
+
+async function pollCandidates() {
+    try {
+        const params = new URLSearchParams(filters);
+        const response = await fetch(`/api/candidates?${params}`);
+        if (!response.ok) {
+            return;
+        }
+        const result = await response.json();
+        result.candidates.forEach((candidate) => {
+            updateUploadStatus({ s3_key: candidate.s3_key, status: 'processed' });
+            patchCandidate(candidate);
+        });
+    } catch (error) {
+        // Try again on the next tick
+    }
+}
+
+function startPolling() {
+    if (!pollTimer) {
+        pollTimer = setInterval(pollCandidates, POLL_INTERVAL_MS);
+    }
+}
+
+function stopPolling() {
+    clearInterval(pollTimer);
+    pollTimer = null;
+}
+
+function openEventStream() {
+    const events = new EventSource('/api/events');
+
+    events.addEventListener('open', stopPolling);
+    events.addEventListener('status', (e) => updateUploadStatus(JSON.parse(e.data)));
+    events.addEventListener('candidate', (e) => patchCandidate(JSON.parse(e.data)));
+    events.addEventListener('error', () => {
+        // CLOSED means the stream was refused; otherwise the browser reconnects
+        if (events.readyState === EventSource.CLOSED) {
+            startPolling();
+            setTimeout(openEventStream, STREAM_RETRY_MS);
+        }
+    });
+}
+
+if (window.EventSource) {
+    openEventStream();
+} else {
+    startPolling();
+}
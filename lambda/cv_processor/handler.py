@@ -1,90 +1,470 @@
+import hashlib
 import json
-import boto3
 import os
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from decimal import Decimal
+from urllib.parse import unquote_plus
+from utils.batch_writer import BatchWriter
 from utils.cv_parser import CVParser
-from utils.ranking_engine import RankingEngine
+from utils.parse_cache import ParseCache
+from utils.ranking_engine import DEFAULT_JOB_REQUIREMENTS, RankingEngine
+from utils.requirements_store import store_from_environment
 
-# AWS Clients
-s3_client = boto3.client('s3')
-dynamodb = boto3.resource('dynamodb')
+# AWS Clients, created on first use and reused across warm invocations
+s3_client = None
+dynamodb = None
+_clients_lock = threading.Lock()
 
 # Environment variables
 DYNAMODB_TABLE = os.environ.get('DYNAMODB_TABLE', 'smart-ats-candidates')
+PARSE_CACHE_TABLE = os.environ.get('PARSE_CACHE_TABLE')
+MAX_CONCURRENCY = int(os.environ.get('MAX_CONCURRENCY', '10'))
+# Write 'processing'/'failed' rows so the dashboard can follow each CV
+STATUS_UPDATES = os.environ.get('STATUS_UPDATES', 'false').lower() == 'true'
+# Largest CV processed; bigger objects fail without being downloaded
+MAX_CV_BYTES = int(os.environ.get('MAX_CV_BYTES', str(10 * 1024 * 1024)))
+# Downloads larger than this are spooled to /tmp instead of memory
+SPOOL_MAX_BYTES = int(os.environ.get('SPOOL_MAX_BYTES', str(1024 * 1024)))
+DOWNLOAD_CHUNK_BYTES = 64 * 1024
+
+# Built once per container and reused across warm invocations; format
+# backends (PyPDF2, the DOC and DOCX readers) are only imported for CVs that need them
+cv_parser = CVParser()
+ranking_engine = None
+
+def get_s3_client():
+    """S3 client shared by the whole container."""
+    global s3_client
+    if s3_client is None:
+        # Downloads run on several threads: create the client only once
+        with _clients_lock:
+            if s3_client is None:
+                import boto3
+                s3_client = boto3.client('s3')
+    return s3_client
+
+def get_dynamodb():
+    """DynamoDB resource shared by the whole container."""
+    global dynamodb
+    if dynamodb is None:
+        with _clients_lock:
+            if dynamodb is None:
+                import boto3
+                dynamodb = boto3.resource('dynamodb')
+    return dynamodb
+
+def get_ranking_engine():
+    """
+    Ranking engine shared by the whole container.
+
+    Job requirements come from the configured store (cached with a TTL) or,
+    without one, from the built-in profiles.
+    """
+    global ranking_engine
+    if ranking_engine is None:
+        ranking_engine = RankingEngine(
+            store=store_from_environment(get_s3_client(), get_dynamodb().meta.client, DEFAULT_JOB_REQUIREMENTS)
+        )
+    return ranking_engine
 
 def lambda_handler(event, context):
     """
     Lambda handler triggered by SQS messages.
     Processes CV files from S3, extracts information, and stores rankings in DynamoDB.
+
+    The whole SQS batch is handled in one invocation and failed records are
+    reported through ``batchItemFailures`` (requires ReportBatchItemFailures on
+    the event source mapping), so only those messages are redelivered and,
+    after maxReceiveCount attempts, moved to the DLQ.
+
+    Records go through a staged pipeline: concurrent S3 downloads (bounded by
+    MAX_CONCURRENCY), parsing and ranking, then a single grouped DynamoDB
+    write, so batch wall time follows the slowest CV rather than their sum.
     """
     print(f"Received event: {json.dumps(event)}")
-    
-    # Process each SQS message
-    for record in event['Records']:
+
+    records = event.get('Records', [])
+    failures = {}
+
+    # 1. Resolve the S3 object referenced by each message
+    tasks = []
+    for record in records:
         try:
-            # Parse SQS message
-            message_body = json.loads(record['body'])
-            
-            # Handle S3 event notification (if message comes from S3)
-            if 'Records' in message_body:
-                s3_event = message_body['Records'][0]
-                bucket = s3_event['s3']['bucket']['name']
-                key = s3_event['s3']['object']['key']
-            else:
-                # Direct message format
-                bucket = message_body.get('s3_bucket')
-                key = message_body.get('s3_key')
-                
-            print(f"Processing CV from S3: s3://{bucket}/{key}")
-            
-            # Download CV from S3
-            response = s3_client.get_object(Bucket=bucket, Key=key)
-            cv_content = response['Body'].read()
-            
-            # Get metadata
-            metadata = response.get('Metadata', {})
-            job_position = metadata.get('job_position', 'General')
-            uploaded_by = metadata.get('uploaded_by', 'unknown')
-            
-            # Parse CV
-            parser = CVParser()
-            cv_data = parser.parse(cv_content, key)
-            
-            # Calculate ranking
-            ranker = RankingEngine()
-            ranking_score, skills_matched = ranker.calculate_score(cv_data, job_position)
-            
-            # Store in DynamoDB
-            table = dynamodb.Table(DYNAMODB_TABLE)
-            item = {
-                'candidate_id': f"{cv_data['name']}_{datetime.now().timestamp()}",
-                'candidate_name': cv_data['name'],
-                'email': cv_data.get('email', 'N/A'),
-                'phone': cv_data.get('phone', 'N/A'),
-                'job_position': job_position,
-                'ranking_score': Decimal(str(ranking_score)),  # Convert float to Decimal
-                'skills_matched': skills_matched,
-                'experience_years': Decimal(str(cv_data.get('experience_years', 0))),  # Convert to Decimal
-                'education': cv_data.get('education', 'N/A'),
-                'skills': cv_data.get('skills', []),
-                's3_bucket': bucket,
-                's3_key': key,
-                'status': 'processed',
-                'upload_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                'uploaded_by': uploaded_by
-            }
-            
-            table.put_item(Item=item)
-            
-            print(f"Successfully processed candidate: {cv_data['name']} with score: {ranking_score}")
-            
+            location = parse_message(record)
         except Exception as e:
-            print(f"Error processing record: {str(e)}")
-            # Don't raise exception to avoid retrying failed messages infinitely
+            failures[record['messageId']] = f"Invalid message: {str(e)}"
+            continue
+        if location is None:
+            print(f"Skipping message without CV: {record.get('messageId')}")
             continue
-    
+        tasks.append(dict(location, message_id=record['messageId']))
+
+    # 2. Drop replays of explicit messages before downloading anything
+    tasks = skip_processed(tasks)
+
+    # 3. Download CVs concurrently (I/O bound)
+    tasks = run_stage(download_cv, tasks, failures, max_workers=MAX_CONCURRENCY)
+
+    downloaded = tasks
+
+    # 4. Drop redelivered messages whose candidate is already stored
+    tasks = skip_processed(tasks)
+    mark_status(tasks, 'processing')
+
+    # 5. Reuse cached parses for CVs already seen (same bytes)
+    load_cached_parses(tasks)
+
+    # 6. Parse the remaining CVs (CPU bound, stays on the main thread)
+    tasks = run_stage(parse_cv, tasks, failures, max_workers=1)
+    store_parses(tasks)
+
+    # 7. Rank against the requested position
+    tasks = run_stage(build_item, tasks, failures, max_workers=1)
+
+    # 8. Grouped write of every ranked candidate
+    write_items(tasks, failures)
+    mark_status([task for task in downloaded if task['message_id'] in failures], 'failed', failures)
+
+    # Release the buffers of CVs that never reached the parser
+    for task in downloaded:
+        if 'content' in task:
+            task.pop('content').close()
+
+    for message_id, error in failures.items():
+        print(f"Error processing record {message_id}: {error}")
+    print(f"Batch completed: {len(records) - len(failures)} processed, {len(failures)} failed")
+
     return {
-        'statusCode': 200,
-        'body': json.dumps({'message': 'Processing completed'})
+        'batchItemFailures': [
+            {'itemIdentifier': record['messageId']}
+            for record in records if record['messageId'] in failures
+        ]
+    }
+
+def run_stage(stage, tasks, failures, max_workers):
+    """
+    Apply a pipeline stage to every task, recording the ones that raise.
+
+    Args:
+        stage: Callable that updates a task dict in place
+        tasks: Task dicts that reached this stage
+        failures: Dict of message_id -> error, updated in place
+        max_workers: Upper bound on concurrently running tasks
+
+    Returns:
+        List of tasks that completed the stage, in input order
+    """
+    if not tasks:
+        return []
+
+    def run(task):
+        try:
+            stage(task)
+            return None
+        except Exception as e:
+            return str(e)
+
+    if max_workers > 1 and len(tasks) > 1:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(tasks))) as executor:
+            errors = list(executor.map(run, tasks))
+    else:
+        errors = [run(task) for task in tasks]
+
+    completed = []
+    for task, error in zip(tasks, errors):
+        if error is None:
+            completed.append(task)
+        else:
+            failures[task['message_id']] = error
+    return completed
+
+def parse_message(record):
+    """
+    Extract the S3 location referenced by an SQS record.
+
+    Args:
+        record: SQS record from the Lambda event
+
+    Returns:
+        Dict with bucket, key and version_id (None when unknown), plus
+        job_position/uploaded_by when the message carries them (explicit
+        enqueue from the frontend), or None for messages that carry no CV
+        (e.g. the s3:TestEvent sent when the bucket notification is created)
+    """
+    message_body = json.loads(record['body'])
+
+    # Handle S3 event notification (if message comes from S3)
+    if 'Records' in message_body:
+        s3_event = message_body['Records'][0]
+        bucket = s3_event['s3']['bucket']['name']
+        # Object keys in S3 notifications are URL-encoded
+        key = unquote_plus(s3_event['s3']['object']['key'])
+        version_id = s3_event['s3']['object'].get('versionId')
+    elif message_body.get('Event') == 's3:TestEvent':
+        return None
+    else:
+        # Direct message format
+        bucket = message_body.get('s3_bucket')
+        key = message_body.get('s3_key')
+        version_id = message_body.get('s3_version_id')
+
+    if not bucket or not key:
+        raise ValueError("Message does not reference an S3 object")
+
+    location = {'bucket': bucket, 'key': key, 'version_id': version_id}
+    for field in ('job_position', 'uploaded_by'):
+        if message_body.get(field):
+            location[field] = message_body[field]
+
+    # Version and position known up front: the replay check can run before download
+    if version_id and 'job_position' in location:
+        location['candidate_id'] = make_candidate_id(bucket, key, version_id, location['job_position'])
+    return location
+
+def make_candidate_id(bucket, key, version_id, job_position):
+    """
+    Build a deterministic candidate ID for one object version and position.
+
+    SQS redeliveries of the same upload map to the same ID, so they overwrite
+    (or skip) the existing row instead of creating a duplicate.
+    """
+    source = f"s3://{bucket}/{key}?versionId={version_id or ''}#{job_position}"
+    return hashlib.sha256(source.encode('utf-8')).hexdigest()[:32]
+
+def download_cv(task):
+    """Download the CV referenced by a task together with its S3 metadata."""
+    print(f"Processing CV from S3: s3://{task['bucket']}/{task['key']}")
+
+    params = {'Bucket': task['bucket'], 'Key': task['key']}
+    if task.get('version_id'):
+        params['VersionId'] = task['version_id']
+
+    response = get_s3_client().get_object(**params)
+    body = response['Body']
+    size = response.get('ContentLength')
+    if size is not None and size > MAX_CV_BYTES:
+        body.close()
+        raise ValueError(f"CV too large: {size} bytes (max {MAX_CV_BYTES})")
+
+    task['content'], task['content_hash'] = read_body(body)
+    task['version_id'] = task.get('version_id') or response.get('VersionId')
+
+    # Values carried by the message win over the object metadata
+    metadata = response.get('Metadata', {})
+    task.setdefault('job_position', metadata.get('job_position', 'General'))
+    task.setdefault('uploaded_by', metadata.get('uploaded_by', 'unknown'))
+    task.setdefault('candidate_id', make_candidate_id(
+        task['bucket'], task['key'], task['version_id'], task['job_position']
+    ))
+
+def read_body(body):
+    """
+    Stream an S3 body into a spooled temporary file, hashing it on the way.
+
+    Small CVs stay in memory, larger ones go to /tmp, and the parser reads
+    the file directly, so the CV is held once instead of as bytes plus a
+    BytesIO copy. MAX_CV_BYTES is enforced on the bytes actually read too.
+
+    Returns:
+        Tuple of (file positioned at the start, hex SHA-256 of the content)
+    """
+    digest = hashlib.sha256()
+    buffer = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES)
+    total = 0
+    try:
+        while True:
+            chunk = body.read(DOWNLOAD_CHUNK_BYTES)
+            if not chunk:
+                break
+            total += len(chunk)
+            if total > MAX_CV_BYTES:
+                raise ValueError(f"CV too large: more than {MAX_CV_BYTES} bytes")
+            digest.update(chunk)
+            buffer.write(chunk)
+    except Exception:
+        buffer.close()
+        raise
+    finally:
+        body.close()
+
+    buffer.seek(0)
+    return buffer, digest.hexdigest()
+
+def skip_processed(tasks):
+    """
+    Short-circuit replays before parsing.
+
+    Looks up the deterministic candidate IDs of the batch with one
+    BatchGetItem and drops the tasks whose candidate is already stored as
+    processed ('processing' and 'failed' status rows are retried). Tasks
+    without an ID yet pass through, and each task is checked only once.
+
+    Returns:
+        Tasks that still need processing
+    """
+    pending = [task for task in tasks if 'candidate_id' in task and not task.get('replay_checked')]
+    if not pending:
+        return tasks
+
+    for task in pending:
+        task['replay_checked'] = True
+    keys = [{'candidate_id': cid} for cid in dict.fromkeys(task['candidate_id'] for task in pending)]
+    existing = set()
+    try:
+        for attempt in range(3):
+            response = get_dynamodb().meta.client.batch_get_item(RequestItems={
+                DYNAMODB_TABLE: {
+                    'Keys': keys,
+                    'ProjectionExpression': 'candidate_id, #status',
+                    'ExpressionAttributeNames': {'#status': 'status'}
+                }
+            })
+            for item in response.get('Responses', {}).get(DYNAMODB_TABLE, []):
+                if item.get('status', 'processed') == 'processed':
+                    existing.add(item['candidate_id'])
+            keys = response.get('UnprocessedKeys', {}).get(DYNAMODB_TABLE, {}).get('Keys', [])
+            if not keys:
+                break
+    except Exception as e:
+        # Writes are idempotent anyway, so just process everything
+        print(f"Replay check failed: {str(e)}")
+        return tasks
+
+    remaining = []
+    for task in tasks:
+        if task.get('candidate_id') in existing:
+            print(f"Skipping already processed CV: s3://{task['bucket']}/{task['key']}")
+        else:
+            remaining.append(task)
+    return remaining
+
+def mark_status(tasks, status, failures=None):
+    """
+    Record an intermediate status row for each task (when STATUS_UPDATES is on).
+
+    Status rows carry no ranking_score, so they stay out of the ranking index
+    until the processed item replaces them. Errors are only logged.
+
+    Args:
+        tasks: Downloaded tasks (candidate_id and job_position known)
+        status: 'processing' or 'failed'
+        failures: Optional dict of message_id -> error, stored on failed rows
+    """
+    if not STATUS_UPDATES or not tasks:
+        return
+
+    writer = BatchWriter(get_dynamodb().meta.client, DYNAMODB_TABLE)
+    for task in tasks:
+        item = {
+            'candidate_id': task['candidate_id'],
+            'job_position': task['job_position'],
+            's3_bucket': task['bucket'],
+            's3_key': task['key'],
+            's3_version_id': task['version_id'] or 'null',
+            'status': status,
+            'upload_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'uploaded_by': task['uploaded_by']
+        }
+        if failures and task['message_id'] in failures:
+            item['error'] = failures[task['message_id']]
+        writer.put(item, owner=task['message_id'])
+
+    try:
+        errors = writer.flush()
+        if errors:
+            print(f"Status '{status}' not stored for {len(errors)} CVs")
+    except Exception as e:
+        print(f"Status update failed: {str(e)}")
+
+def load_cached_parses(tasks):
+    """Attach cached cv_data to tasks whose content hash is already known."""
+    if not PARSE_CACHE_TABLE or not tasks:
+        return
+
+    try:
+        cache = ParseCache(get_dynamodb().meta.client, PARSE_CACHE_TABLE)
+        cached = cache.get_many([task['content_hash'] for task in tasks])
+    except Exception as e:
+        # The cache is an optimization: fall back to parsing everything
+        print(f"Parse cache lookup failed: {str(e)}")
+        return
+
+    for task in tasks:
+        if task['content_hash'] in cached:
+            task['cv_data'] = cached[task['content_hash']]
+            task['cache_hit'] = True
+    print(f"Parse cache: {sum(1 for t in tasks if t.get('cache_hit'))}/{len(tasks)} hits")
+
+def parse_cv(task):
+    """Parse a downloaded CV unless a cached parse was found."""
+    with task.pop('content') as content:
+        if 'cv_data' in task:
+            return
+
+        task['cv_data'] = cv_parser.parse(content, task['key'])
+
+def store_parses(tasks):
+    """Save freshly parsed CVs in the parse cache."""
+    if not PARSE_CACHE_TABLE:
+        return
+
+    entries = {task['content_hash']: task['cv_data'] for task in tasks if not task.get('cache_hit')}
+    if not entries:
+        return
+
+    try:
+        cache = ParseCache(get_dynamodb().meta.client, PARSE_CACHE_TABLE)
+        errors = cache.put_many(entries)
+        if errors:
+            print(f"Parse cache: {len(errors)} entries not stored")
+    except Exception as e:
+        print(f"Parse cache store failed: {str(e)}")
+
+def build_item(task):
+    """Rank a parsed CV, storing the DynamoDB item on the task."""
+    job_position = task['job_position']
+    cv_data = task['cv_data']
+
+    # Calculate ranking
+    ranking_score, skills_matched = get_ranking_engine().calculate_score(cv_data, job_position)
+
+    task['item'] = {
+        'candidate_id': task['candidate_id'],
+        'candidate_name': cv_data['name'],
+        'email': cv_data.get('email', 'N/A'),
+        'phone': cv_data.get('phone', 'N/A'),
+        'job_position': job_position,
+        'ranking_score': Decimal(str(ranking_score)),  # Convert float to Decimal
+        'skills_matched': skills_matched,
+        'experience_years': Decimal(str(cv_data.get('experience_years', 0))),  # Convert to Decimal
+        'education': cv_data.get('education', 'N/A'),
+        'skills': cv_data.get('skills', []),
+        's3_bucket': task['bucket'],
+        's3_key': task['key'],
+        's3_version_id': task['version_id'] or 'null',
+        'status': 'processed',
+        'upload_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'uploaded_by': task['uploaded_by']
     }
+
+    print(f"Ranked candidate: {cv_data['name']} with score: {ranking_score}")
+
+def write_items(tasks, failures):
+    """
+    Store every ranked candidate of the batch with BatchWriteItem.
+
+    Items left unprocessed after the writer's retries are mapped back to the
+    SQS message IDs that produced them and recorded as failures.
+    """
+    if not tasks:
+        return
+
+    writer = BatchWriter(get_dynamodb().meta.client, DYNAMODB_TABLE)
+    for task in tasks:
+        writer.put(task['item'], owner=task['message_id'])
+
+    for message_id, error in writer.flush().items():
+        failures[message_id] = f"DynamoDB write failed: {error}"
@@ -0,0 +1 @@
+# Micro-benchmarks, run manually: python -m tests.benchmarks.<module>
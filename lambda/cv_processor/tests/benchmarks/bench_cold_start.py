@@ -0,0 +1,81 @@
+"""
+Benchmark: cold start of the CV processor (import time and init duration)
+
+Every scenario runs in a fresh interpreter, like a new Lambda container:
+the time to import the handler, then the first-use cost of the parser
+backends and AWS clients that are now loaded lazily. The "eager" row
+imports and creates everything up front, as the handler used to.
+
+Run from lambda/cv_processor:
+    python -m tests.benchmarks.bench_cold_start
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+SCENARIOS = {
+    'eager (old module load)': """
+import boto3, docx, PyPDF2
+import handler
+boto3.client('s3'); boto3.resource('dynamodb')
+""",
+    'import handler': """
+import handler
+""",
+    'first .txt parse': """
+import handler
+mark()
+handler.cv_parser.parse(b'John Doe\\nSkills: Python, AWS', 'cv.txt')
+""",
+    'first .pdf parse': """
+import handler
+mark()
+handler.cv_parser.parse(b'%PDF-1.4 not really', 'cv.pdf')
+""",
+    'first .docx parse': """
+import handler
+mark()
+handler.cv_parser.parse(b'PK not really', 'cv.docx')
+""",
+    'AWS clients': """
+import handler
+mark()
+handler.get_s3_client(); handler.get_dynamodb()
+""",
+}
+
+# Reports the total time and the time after mark() (the part being measured)
+RUNNER = """
+import json, time
+start = time.perf_counter()
+marks = [start]
+def mark():
+    marks.append(time.perf_counter())
+{body}
+end = time.perf_counter()
+print(json.dumps({{'total': end - start, 'after_mark': end - marks[-1]}}))
+"""
+
+
+def run_once(body):
+    env = dict(os.environ, AWS_DEFAULT_REGION=os.environ.get('AWS_DEFAULT_REGION', 'us-east-1'))
+    output = subprocess.run(
+        [sys.executable, '-c', RUNNER.format(body=body)],
+        capture_output=True, text=True, check=True, env=env
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def run(repeat=5):
+    print(f"{'scenario':<26} {'total ms':>9} {'measured ms':>12}")
+    for name, body in SCENARIOS.items():
+        results = [run_once(body) for _ in range(repeat)]
+        total = statistics.median(r['total'] for r in results)
+        measured = statistics.median(r['after_mark'] for r in results)
+        print(f"{name:<26} {total * 1000:>9.1f} {measured * 1000:>12.1f}")
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,71 @@
+"""
+Benchmark: .doc text extraction throughput and memory
+
+Compares the OLE2/Word reader with the old UTF-8 fallback (which returned
+the binary stream as text) on synthetic Word 97 documents, for text
+extraction alone and for the whole CVParser.parse.
+
+Run from lambda/cv_processor:
+    python -m tests.benchmarks.bench_doc_extractor
+"""
+import random
+import string
+import timeit
+import tracemalloc
+from utils.cv_parser import CVParser
+from utils.doc_extractor import extract_text
+from tests.fixtures import make_doc
+
+
+def utf8_fallback(content):
+    """Original CVParser handling of .doc files."""
+    return str(content, 'utf-8', errors='ignore')
+
+
+def make_pieces(size, rng):
+    """Word 97 text of roughly ``size`` characters, mostly 8-bit with some UTF-16 runs."""
+    pieces = [("John Doe\nEmail: john.doe@email.com\nSkills: Python, AWS, Docker\n", True)]
+    total = 0
+    while total < size:
+        words = ' '.join(
+            ''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(2, 9)))
+            for _ in range(200)
+        )
+        compressed = rng.random() < 0.8
+        pieces.append((words + ('\n' if compressed else ' – Zürich\n'), compressed))
+        total += len(words)
+    return pieces
+
+
+def peak_memory(function, *args):
+    tracemalloc.start()
+    try:
+        function(*args)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run(repeat=5):
+    rng = random.Random(42)
+    parser = CVParser()
+    print(f"{'text KB':>8} {'file KB':>8} {'reader ms':>10} {'MB/s':>7} {'peak KB':>8} "
+          f"{'parse ms':>9} {'fallback parse ms':>18}")
+
+    for text_size in (10_000, 100_000, 1_000_000):
+        content = make_doc(make_pieces(text_size, rng))
+
+        reader_time = min(timeit.repeat(lambda: extract_text(content), number=1, repeat=repeat))
+        peak = peak_memory(extract_text, content)
+        parse_time = min(timeit.repeat(lambda: parser.parse(content, 'cv.doc'), number=1, repeat=repeat))
+        fallback_time = min(timeit.repeat(
+            lambda: parser.extract(utf8_fallback(content)), number=1, repeat=repeat
+        ))
+
+        print(f"{text_size // 1000:>8} {len(content) // 1024:>8} {reader_time * 1000:>10.2f} "
+              f"{len(content) / reader_time / 1e6:>7.1f} {peak // 1024:>8} "
+              f"{parse_time * 1000:>9.2f} {fallback_time * 1000:>18.2f}")
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,75 @@
+"""
+Benchmark: streaming DOCX extraction vs python-docx
+
+Compares utils.docx_extractor (zipfile + iterparse over the document,
+header and footer parts) with the original python-docx path (full object
+model, body paragraphs only) on synthetic CVs: time, tracemalloc peak and
+how many of the skills laid out in tables each one finds.
+
+python-docx is no longer a runtime dependency; install it to run this:
+    pip install python-docx
+    python -m tests.benchmarks.bench_docx_extractor   (from lambda/cv_processor)
+"""
+import io
+import random
+import string
+import timeit
+import tracemalloc
+from utils.cv_parser import CVParser
+from utils.docx_extractor import extract_text
+from tests.fixtures import docx_paragraph, docx_table, docx_text_box, make_docx
+
+
+def python_docx_text(content):
+    """Original CVParser._parse_docx implementation."""
+    import docx
+    doc = docx.Document(io.BytesIO(content))
+    return '\n'.join([paragraph.text for paragraph in doc.paragraphs])
+
+
+def make_cv(paragraph_count, rng):
+    """A CV with prose paragraphs, a skills table and a contact text box."""
+    paragraphs = [
+        ' '.join(''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(2, 9)))
+                 for _ in range(30))
+        for _ in range(paragraph_count)
+    ]
+    body = ''.join(docx_paragraph(text) for text in paragraphs)
+    body += docx_table([["Languages", "Python, Java, Go"], ["Cloud", "AWS, Docker, Kubernetes"]])
+    body += docx_text_box("Email: jane.roe@example.com")
+    return make_docx(body, header="Jane Roe")
+
+
+def peak_memory(function, *args):
+    tracemalloc.start()
+    try:
+        function(*args)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run(repeat=5):
+    rng = random.Random(42)
+    parser = CVParser()
+    print(f"{'paragraphs':>10} {'file KB':>8} {'docx ms':>8} {'stream ms':>10} {'speedup':>8} "
+          f"{'docx peak KB':>13} {'stream peak KB':>15} {'skills docx/stream':>19}")
+
+    for paragraph_count in (20, 200, 1000):
+        content = make_cv(paragraph_count, rng)
+
+        docx_time = min(timeit.repeat(lambda: python_docx_text(content), number=1, repeat=repeat))
+        stream_time = min(timeit.repeat(lambda: extract_text(content), number=1, repeat=repeat))
+        docx_peak = peak_memory(python_docx_text, content)
+        stream_peak = peak_memory(extract_text, content)
+        docx_skills = len(parser.extract(python_docx_text(content))['skills'])
+        stream_skills = len(parser.extract(extract_text(content))['skills'])
+
+        print(f"{paragraph_count:>10} {len(content) // 1024:>8} {docx_time * 1000:>8.2f} "
+              f"{stream_time * 1000:>10.2f} {docx_time / stream_time:>7.1f}x "
+              f"{docx_peak // 1024:>13} {stream_peak // 1024:>15} "
+              f"{docx_skills:>12}/{stream_skills}")
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,59 @@
+"""
+Benchmark: SkillMatcher vs the original per-keyword substring loop
+
+Run from lambda/cv_processor:
+    python -m tests.benchmarks.bench_skill_matcher
+"""
+import random
+import string
+import timeit
+from utils.skill_matcher import SkillMatcher
+
+
+def substring_loop(keywords, text_lower):
+    """Original CVParser._extract_skills implementation."""
+    return [skill for skill in keywords if skill.lower() in text_lower]
+
+
+def make_keywords(count, rng):
+    """Generate a synthetic skill taxonomy of the given size."""
+    keywords = ['python', 'machine learning', 'node.js', 'ci/cd']
+    while len(keywords) < count:
+        length = rng.randint(3, 10)
+        keywords.append(''.join(rng.choice(string.ascii_lowercase) for _ in range(length)))
+    return keywords[:count]
+
+
+def make_text(size, keywords, rng):
+    """Generate CV-like text of roughly ``size`` characters."""
+    words = []
+    total = 0
+    while total < size:
+        if rng.random() < 0.02:
+            word = rng.choice(keywords)
+        else:
+            word = ''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(2, 9)))
+        words.append(word)
+        total += len(word) + 1
+    return ' '.join(words)
+
+
+def run(repeat=5):
+    rng = random.Random(42)
+    print(f"{'keywords':>9} {'text KB':>8} {'loop ms':>9} {'matcher ms':>11} {'speedup':>8}")
+
+    for keyword_count in (25, 500, 5000):
+        keywords = make_keywords(keyword_count, rng)
+        matcher = SkillMatcher(keywords)
+        for text_size in (10_000, 100_000):
+            text = make_text(text_size, keywords, rng)
+
+            loop_time = min(timeit.repeat(lambda: substring_loop(keywords, text), number=1, repeat=repeat))
+            matcher_time = min(timeit.repeat(lambda: matcher.find(text), number=1, repeat=repeat))
+
+            print(f"{keyword_count:>9} {text_size // 1000:>8} {loop_time * 1000:>9.2f} "
+                  f"{matcher_time * 1000:>11.2f} {loop_time / matcher_time:>7.1f}x")
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,303 @@
+"""
+Builders for in-memory CV documents used by the parser tests
+"""
+import io
+import zipfile
+
+
+def _pdf_escape(line):
+    return line.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+def make_pdf(pages):
+    """
+    Build a minimal PDF with one page per entry of ``pages``.
+
+    Args:
+        pages: List of page texts; lines are split on newlines
+
+    Returns:
+        PDF file content as bytes
+    """
+    page_count = len(pages)
+    font_id = 3
+    objects = {
+        1: b"<< /Type /Catalog /Pages 2 0 R >>",
+        font_id: b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    }
+
+    kids = []
+    for index, text in enumerate(pages):
+        page_id = 4 + index * 2
+        content_id = page_id + 1
+        kids.append(f"{page_id} 0 R")
+
+        operations = ["BT", "/F1 11 Tf", "14 TL", "72 760 Td"]
+        for line in text.split('\n'):
+            operations.append(f"({_pdf_escape(line)}) Tj T*")
+        operations.append("ET")
+        stream = '\n'.join(operations).encode('latin-1')
+
+        objects[page_id] = (
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 {font_id} 0 R >> >> /Contents {content_id} 0 R >>"
+        ).encode('latin-1')
+        objects[content_id] = (
+            f"<< /Length {len(stream)} >>\nstream\n".encode('latin-1') + stream + b"\nendstream"
+        )
+
+    objects[2] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {page_count} >>".encode('latin-1')
+
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = {}
+    for object_id in sorted(objects):
+        offsets[object_id] = len(output)
+        output += f"{object_id} 0 obj\n".encode('latin-1') + objects[object_id] + b"\nendobj\n"
+
+    xref_offset = len(output)
+    size = max(objects) + 1
+    output += f"xref\n0 {size}\n0000000000 65535 f \n".encode('latin-1')
+    for object_id in range(1, size):
+        output += f"{offsets[object_id]:010d} 00000 n \n".encode('latin-1')
+    output += f"trailer\n<< /Size {size} /Root 1 0 R >>\nstartxref\n{xref_offset}\n%%EOF\n".encode('latin-1')
+    return bytes(output)
+
+
+def make_compound_file(streams):
+    """
+    Build an OLE2 compound file (version 3, 512-byte sectors).
+
+    Streams below 4096 bytes go to the mini stream, like Word does.
+
+    Args:
+        streams: Dict of stream name -> bytes, stored under the root storage
+
+    Returns:
+        Compound file content as bytes
+    """
+    sector_size, mini_size, cutoff = 512, 64, 4096
+    end, fat_mark, free = 0xFFFFFFFE, 0xFFFFFFFD, 0xFFFFFFFF
+
+    def sectors_for(data, size):
+        return -(-len(data) // size)
+
+    # Small streams packed into the mini stream
+    mini_stream = bytearray()
+    mini_fat = []
+    starts = {}
+    for name, data in streams.items():
+        if len(data) >= cutoff:
+            continue
+        count = sectors_for(data, mini_size)
+        first = len(mini_stream) // mini_size
+        starts[name] = first if count else end
+        mini_fat += [first + i + 1 for i in range(count - 1)] + ([end] if count else [])
+        mini_stream += data + b'\0' * (count * mini_size - len(data))
+
+    mini_fat_data = b''.join(v.to_bytes(4, 'little') for v in mini_fat)
+    regular = [(name, data) for name, data in streams.items() if len(data) >= cutoff]
+    regular += [('<mini stream>', bytes(mini_stream)), ('<mini fat>', mini_fat_data)]
+
+    # Directory: root, then one entry per stream chained as right siblings
+    names = list(streams)
+    directory_count = -(-(len(names) + 1) // 4)
+
+    # Lay out the regular chains, then the directory, then the FAT
+    sectors = []
+    fat = []
+    for name, data in regular:
+        count = sectors_for(data, sector_size)
+        starts[name] = len(sectors) if count else end
+        for i in range(count):
+            sectors.append(data[i * sector_size:(i + 1) * sector_size].ljust(sector_size, b'\0'))
+            fat.append(len(sectors) if i < count - 1 else end)
+    directory_start = len(sectors)
+    fat += [directory_start + i + 1 for i in range(directory_count - 1)] + [end]
+
+    fat_count = 1
+    while (len(sectors) + directory_count + fat_count) > fat_count * (sector_size // 4):
+        fat_count += 1
+    fat_start = len(sectors) + directory_count
+    fat += [fat_mark] * fat_count
+    fat += [free] * (fat_count * (sector_size // 4) - len(fat))
+
+    def entry(name, entry_type, child, right, start, size):
+        encoded = name.encode('utf-16-le')
+        return (encoded.ljust(64, b'\0') + (len(encoded) + 2).to_bytes(2, 'little')
+                + bytes([entry_type, 1]) + free.to_bytes(4, 'little') + right.to_bytes(4, 'little')
+                + child.to_bytes(4, 'little') + b'\0' * 36
+                + start.to_bytes(4, 'little') + size.to_bytes(8, 'little'))
+
+    entries = [entry('Root Entry', 5, 1 if names else free, free,
+                     starts['<mini stream>'], len(mini_stream))]
+    for index, name in enumerate(names):
+        right = index + 2 if index + 1 < len(names) else free
+        entries.append(entry(name, 2, free, right, starts[name], len(streams[name])))
+    directory = b''.join(entries).ljust(directory_count * sector_size, b'\0')
+    sectors += [directory[i * sector_size:(i + 1) * sector_size] for i in range(directory_count)]
+    fat_data = b''.join(v.to_bytes(4, 'little') for v in fat)
+    sectors += [fat_data[i * sector_size:(i + 1) * sector_size] for i in range(fat_count)]
+
+    header = bytearray(512)
+    header[0:8] = b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1'
+    header[0x18:0x1E] = (0x3E).to_bytes(2, 'little') + (3).to_bytes(2, 'little') + b'\xfe\xff'
+    header[0x1E:0x22] = (9).to_bytes(2, 'little') + (6).to_bytes(2, 'little')
+    mini_fat_sectors = sectors_for(mini_fat_data, sector_size)
+    fields = [fat_count, directory_start, 0, cutoff, starts['<mini fat>'] if mini_fat_sectors else end,
+              mini_fat_sectors, end, 0]
+    header[0x2C:0x4C] = b''.join(v.to_bytes(4, 'little') for v in fields)
+    difat = [fat_start + i for i in range(fat_count)] + [free] * (109 - fat_count)
+    header[0x4C:0x200] = b''.join(v.to_bytes(4, 'little') for v in difat)
+
+    return bytes(header) + b''.join(sectors)
+
+
+def make_doc(pieces, table_stream='1Table', encrypted=False):
+    """
+    Build a minimal Word 97 .doc: a FIB, the text and a piece table.
+
+    Args:
+        pieces: List of (text, compressed) runs; compressed runs are stored
+            as cp1252, the others as UTF-16. Newlines become paragraph marks.
+        table_stream: '1Table' or '0Table'
+        encrypted: Set the FIB's fEncrypted flag
+
+    Returns:
+        .doc file content as bytes
+    """
+    flags = (0x0200 if table_stream == '1Table' else 0) | (0x0100 if encrypted else 0)
+    fib = bytearray(0x9A + 93 * 8 + 2)
+    fib[0:4] = (0xA5EC).to_bytes(2, 'little') + (0xC1).to_bytes(2, 'little')
+    fib[0x0A:0x0C] = flags.to_bytes(2, 'little')
+    fib[32:34] = (14).to_bytes(2, 'little')
+    fib[62:64] = (22).to_bytes(2, 'little')
+    fib[0x98:0x9A] = (93).to_bytes(2, 'little')
+
+    # Text after the FIB, one run per piece
+    word = bytearray(fib.ljust(0x800, b'\0'))
+    positions = [0]
+    descriptors = b''
+    for text, compressed in pieces:
+        text = text.replace('\n', '\r')
+        offset = len(word)
+        if compressed:
+            word += text.encode('cp1252')
+            fc = (offset * 2) | 0x40000000
+        else:
+            word += text.encode('utf-16-le')
+            fc = offset
+        positions.append(positions[-1] + len(text))
+        descriptors += b'\0\0' + fc.to_bytes(4, 'little') + b'\0\0'
+    ccp_text = positions[-1]
+    word[64 + 3 * 4:64 + 4 * 4] = ccp_text.to_bytes(4, 'little')
+
+    plc = b''.join(p.to_bytes(4, 'little') for p in positions) + descriptors
+    # A formatting block (Prc) before the piece table, as Word writes
+    clx = b'\x01' + (2).to_bytes(2, 'little') + b'\0\0' + b'\x02' + len(plc).to_bytes(4, 'little') + plc
+    table = b'\0' * 16 + clx
+    word[0x9A + 33 * 8:0x9A + 34 * 8] = (16).to_bytes(4, 'little') + len(clx).to_bytes(4, 'little')
+
+    # Word pads the WordDocument stream past the mini stream cutoff
+    return make_compound_file({
+        'WordDocument': bytes(word.ljust(4096, b'\0')),
+        table_stream: table,
+    })
+
+
+DOCX_NAMESPACES = (
+    'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main" '
+    'xmlns:mc="http://schemas.openxmlformats.org/markup-compatibility/2006" '
+    'xmlns:wps="http://schemas.microsoft.com/office/word/2010/wordprocessingShape" '
+    'xmlns:v="urn:schemas-microsoft-com:vml" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships"'
+)
+
+
+def _docx_escape(text):
+    return text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+
+
+def docx_paragraph(text):
+    """A w:p with one run; tabs in ``text`` become w:tab elements."""
+    runs = '<w:tab/>'.join(f'<w:t xml:space="preserve">{_docx_escape(part)}</w:t>' for part in text.split('\t'))
+    return f'<w:p><w:pPr><w:tabs><w:tab w:val="left" w:pos="720"/></w:tabs></w:pPr><w:r>{runs}</w:r></w:p>'
+
+
+def docx_table(rows):
+    """A w:tbl with one paragraph per cell."""
+    cells = ''.join(
+        '<w:tr>' + ''.join(f'<w:tc>{docx_paragraph(cell)}</w:tc>' for cell in row) + '</w:tr>'
+        for row in rows
+    )
+    return f'<w:tbl>{cells}</w:tbl>'
+
+
+def docx_text_box(text, before='', after=''):
+    """
+    A paragraph anchoring a text box, with the DrawingML choice and VML
+    fallback copies, and optional text of the anchor paragraph around it.
+    """
+    content = f'<w:txbxContent>{docx_paragraph(text)}</w:txbxContent>'
+    anchor_run = lambda part: f'<w:r><w:t xml:space="preserve">{_docx_escape(part)}</w:t></w:r>' if part else ''
+    return (
+        f'<w:p>{anchor_run(before)}<w:r><mc:AlternateContent>'
+        f'<mc:Choice Requires="wps"><w:drawing><wps:txbx>{content}</wps:txbx></w:drawing></mc:Choice>'
+        f'<mc:Fallback><w:pict><v:textbox>{content}</v:textbox></w:pict></mc:Fallback>'
+        f'</mc:AlternateContent></w:r>{anchor_run(after)}</w:p>'
+    )
+
+
+def make_docx(body, header=None):
+    """
+    Build a DOCX package readable by python-docx.
+
+    Args:
+        body: WordprocessingML body content (see docx_paragraph/docx_table/docx_text_box)
+        header: Optional text of a default header
+
+    Returns:
+        DOCX file content as bytes
+    """
+    content_types = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/word/document.xml" ContentType="application/'
+        'vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+        '<Override PartName="/word/header1.xml" ContentType="application/'
+        'vnd.openxmlformats-officedocument.wordprocessingml.header+xml"/>'
+        '</Types>'
+    )
+    package_rels = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/'
+        'relationships/officeDocument" Target="word/document.xml"/>'
+        '</Relationships>'
+    )
+    document_rels = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        + ('<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/'
+           'relationships/header" Target="header1.xml"/>' if header is not None else '')
+        + '</Relationships>'
+    )
+    section = '<w:sectPr><w:headerReference w:type="default" r:id="rId1"/></w:sectPr>' if header is not None else ''
+    document = (
+        f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        f'<w:document {DOCX_NAMESPACES}><w:body>{body}{section}</w:body></w:document>'
+    )
+
+    output = io.BytesIO()
+    with zipfile.ZipFile(output, 'w', zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr('[Content_Types].xml', content_types)
+        archive.writestr('_rels/.rels', package_rels)
+        archive.writestr('word/_rels/document.xml.rels', document_rels)
+        archive.writestr('word/document.xml', document)
+        if header is not None:
+            archive.writestr('word/header1.xml', (
+                f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                f'<w:hdr {DOCX_NAMESPACES}>{docx_paragraph(header)}</w:hdr>'
+            ))
+    return output.getvalue()
@@ -0,0 +1,96 @@
+"""
+Unit tests for the DynamoDB BatchWriter
+"""
+import pytest
+from botocore.exceptions import ClientError
+from utils.batch_writer import BatchWriter
+
+
+class FakeClient:
+    """Fake DynamoDB client returning scripted UnprocessedItems."""
+
+    def __init__(self, unprocessed_rounds=0, error_code=None):
+        self.calls = []
+        self.unprocessed_rounds = unprocessed_rounds
+        self.error_code = error_code
+
+    def batch_write_item(self, RequestItems):
+        requests = RequestItems['candidates']
+        self.calls.append([r['PutRequest']['Item']['candidate_id'] for r in requests])
+        if self.error_code:
+            raise ClientError({'Error': {'Code': self.error_code}}, 'BatchWriteItem')
+        if self.unprocessed_rounds:
+            self.unprocessed_rounds -= 1
+            return {'UnprocessedItems': {'candidates': requests[-1:]}}
+        return {'UnprocessedItems': {}}
+
+
+class TestBatchWriter:
+    """Test suite for BatchWriter class."""
+
+    def make_writer(self, client, **kwargs):
+        self.sleeps = []
+        return BatchWriter(client, 'candidates', sleep=self.sleeps.append, **kwargs)
+
+    def test_flush_chunks_of_25(self):
+        """Test items are written in chunks of at most 25 requests."""
+        client = FakeClient()
+        writer = self.make_writer(client)
+        for i in range(60):
+            writer.put({'candidate_id': f'c{i}'}, owner=f'msg-{i}')
+
+        failures = writer.flush()
+
+        assert failures == {}
+        assert [len(call) for call in client.calls] == [25, 25, 10]
+
+    def test_unprocessed_items_are_retried(self):
+        """Test UnprocessedItems are resubmitted with backoff."""
+        client = FakeClient(unprocessed_rounds=2)
+        writer = self.make_writer(client)
+        writer.put({'candidate_id': 'a'}, owner='msg-a')
+        writer.put({'candidate_id': 'b'}, owner='msg-b')
+
+        failures = writer.flush()
+
+        assert failures == {}
+        assert client.calls == [['a', 'b'], ['b'], ['b']]
+        assert len(self.sleeps) == 2
+
+    def test_exhausted_retries_map_to_owner(self):
+        """Test items still unprocessed are reported against their owner."""
+        client = FakeClient(unprocessed_rounds=10)
+        writer = self.make_writer(client, max_attempts=3)
+        writer.put({'candidate_id': 'a'}, owner='msg-a')
+        writer.put({'candidate_id': 'b'}, owner='msg-b')
+
+        failures = writer.flush()
+
+        assert list(failures) == ['msg-b']
+
+    def test_non_retryable_error_fails_chunk(self):
+        """Test a validation error fails every owner without retrying."""
+        client = FakeClient(error_code='ValidationException')
+        writer = self.make_writer(client)
+        writer.put({'candidate_id': 'a'}, owner='msg-a')
+
+        failures = writer.flush()
+
+        assert list(failures) == ['msg-a']
+        assert len(client.calls) == 1
+
+    def test_duplicate_keys_are_collapsed(self):
+        """Test duplicate keys share one request and both owners."""
+        client = FakeClient(error_code='ValidationException')
+        writer = self.make_writer(client)
+        writer.put({'candidate_id': 'a', 'v': 1}, owner='msg-1')
+        writer.put({'candidate_id': 'a', 'v': 2}, owner='msg-2')
+
+        failures = writer.flush()
+
+        assert client.calls == [['a']]
+        assert set(failures) == {'msg-1', 'msg-2'}
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -1,8 +1,17 @@
 """
 Unit tests for CV Parser
 """
+import os
+import subprocess
+import sys
 import pytest
-from utils.cv_parser import CVParser
+from utils import cv_parser
+from utils.cv_parser import CVParser, ParseContext
+
+
+def upper_backend(content):
+    """Backend registered by the tests (loaded through the registry)."""
+    return content.decode('utf-8').upper()
 
 
 class TestCVParser:
@@ -52,7 +61,14 @@ class TestCVParser:
         assert "Python" in result
         assert "Aws" in result or "AWS" in result
     
-    @pytest.mark.skip(reason="Experience regex needs fix")
+    def test_extract_skills_word_boundaries(self):
+        """Test short skills are not found inside other words."""
+        text = "A good communicator who likes to maintain legacy systems"
+        result = self.parser._extract_skills(text)
+        
+        assert "Go" not in result
+        assert "Ai" not in result
+    
     def test_extract_experience_years(self):
         """Test experience years extraction."""
         text = """
@@ -65,7 +81,6 @@ class TestCVParser:
         # Should calculate 4 + 2 = 6 years
         assert result >= 5  # Allow some tolerance
     
-    @pytest.mark.skip(reason="Experience regex needs fix")
     def test_extract_experience_present(self):
         """Test experience extraction with 'present' as end date."""
         text = "Senior Engineer at Company (2020-present)"
@@ -74,6 +89,45 @@ class TestCVParser:
         # Should be at least 4 years (2026 - 2020)
         assert result >= 4
     
+    def test_year_range_is_not_a_phone(self):
+        """Test year ranges are not mistaken for phone numbers."""
+        result = self.parser.parse(b"Jane Roe\nEngineer (2018 - 2020)\nTel: +1-555-0123-456", 'cv.txt')
+        
+        assert result['phone'] == "+1-555-0123-456"
+        assert result['experience_years'] == 2
+    
+    def test_phone_without_international_prefix(self):
+        """Test local numbers starting with any digit are found."""
+        assert self.parser._extract_phone("Phone: 555-123-4567") == "555-123-4567"
+        assert self.parser._extract_phone("Cell 333 123 4567") == "333 123 4567"
+
+    def test_phone_digits_only_and_leading_zero(self):
+        """Test unseparated numbers and numbers starting with 0 are found whole."""
+        assert self.parser._extract_phone("Phone: 3331234567") == "3331234567"
+        assert self.parser._extract_phone("Tel. 0333 1234567") == "0333 1234567"
+        assert self.parser._extract_phone("Office 02 12345678") == "02 12345678"
+        assert self.parser._extract_phone("Mobile 07700 900123") == "07700 900123"
+        assert self.parser._extract_phone("Tel: 06-1234-5678") == "06-1234-5678"
+
+    def test_phone_does_not_swallow_year_range(self):
+        """Test a number just before a year range leaves the range intact."""
+        result = self.parser.parse(b"Jane Roe\nTeam of 5 (2018-2020)\nTel: 333 1234567", 'cv.txt')
+
+        assert result['phone'] == "333 1234567"
+        assert result['experience_years'] == 2
+    
+    def test_email_keeps_original_case(self):
+        """Test the email is reported as written in the CV."""
+        result = self.parser._extract_email("Contact: Jane.Roe@Example.com")
+        
+        assert result == "Jane.Roe@Example.com"
+    
+    def test_email_is_not_scanned_for_skills(self):
+        """Test words inside an email address are not counted as skills."""
+        result = self.parser._extract_skills("dev.python@example.com knows Java")
+        
+        assert result == ["Java"]
+    
     def test_extract_education(self):
         """Test education level extraction."""
         text = "Education: Master's Degree in Computer Science from MIT"
@@ -88,7 +142,31 @@ class TestCVParser:
         
         assert "PhD" in result
     
-    @pytest.mark.skip(reason="Experience regex needs fix")
+    def test_custom_extractor(self):
+        """Test extra extractors are run alongside the registered ones."""
+        def extract_linkedin(parser, context):
+            return 'linkedin.com/' in context.lower
+        
+        parser = CVParser(extractors={'has_linkedin': extract_linkedin})
+        result = parser.parse(b"Jane Roe\nlinkedin.com/in/janeroe", 'cv.txt')
+        
+        assert result['has_linkedin'] is True
+        assert result['name'] == "Jane Roe"
+        assert 'has_linkedin' not in self.parser.parse(b"Jane Roe", 'cv.txt')
+    
+    def test_custom_skills_keywords(self):
+        """Test a parser built with its own skill taxonomy."""
+        parser = CVParser(skills_keywords=['fortran', 'cobol'])
+        
+        assert parser._extract_skills("COBOL and Python") == ["Cobol"]
+    
+    def test_context_views_are_computed_once(self):
+        """Test the lowercased text is shared between extractors."""
+        context = ParseContext("Python and AWS")
+        
+        assert context.lower is context.lower
+        assert context.tokens == ['python', 'and', 'aws']
+    
     def test_parse_complete_cv(self):
         """Test parsing a complete CV from BytesIO."""
         cv_text = b"""
@@ -123,5 +201,38 @@ class TestCVParser:
         assert "Master" in result['education']
 
 
+class TestParserBackends:
+    """Test suite for the lazily loaded format backends."""
+
+    def test_registered_backend_loaded_on_first_use(self, monkeypatch):
+        """A registered backend is imported by name and used for its extension."""
+        monkeypatch.setitem(cv_parser.PARSER_BACKENDS, '.up', ('tests.test_cv_parser', 'upper_backend'))
+        monkeypatch.setattr(cv_parser, '_loaded_backends', {})
+
+        result = CVParser().parse(b'jane doe\npython developer', 'cv.up')
+
+        assert result['raw_text'] == 'JANE DOE\nPYTHON DEVELOPER'
+        assert cv_parser._loaded_backends['.up'] is upper_backend
+
+    def test_backend_error_returns_empty_text(self, monkeypatch):
+        """A backend that cannot be imported yields empty text, not an exception."""
+        monkeypatch.setitem(cv_parser.PARSER_BACKENDS, '.bad', ('utils.missing_backend', 'extract_text'))
+        monkeypatch.setattr(cv_parser, '_loaded_backends', {})
+
+        assert CVParser().parse(b'content', 'cv.bad')['raw_text'] == ''
+
+    def test_text_cv_does_not_import_format_libraries(self):
+        """Importing the handler and parsing a .txt CV loads neither PyPDF2, python-docx nor boto3."""
+        code = (
+            "import sys, handler\n"
+            "handler.cv_parser.parse(b'John Doe\\nSkills: Python', 'cv.txt')\n"
+            "print(sorted(m for m in ('PyPDF2', 'docx', 'boto3') if m in sys.modules))"
+        )
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        output = subprocess.run([sys.executable, '-c', code], cwd=root, capture_output=True, text=True, check=True)
+
+        assert output.stdout.strip() == '[]'
+
+
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
@@ -0,0 +1,95 @@
+"""
+Unit tests for the Word 97-2003 (.doc) extractor
+"""
+import io
+import struct
+import time
+import pytest
+from utils.cv_parser import CVParser
+from utils.doc_extractor import CompoundFile, extract_text
+from tests.fixtures import make_compound_file, make_doc
+
+
+SAMPLE_DOC_PIECES = [
+    ("John Doe\nSenior Developer (2018-2023)\nSkills: Python, AWS, Docker\n", True),
+    ("Email: \x13 HYPERLINK \"mailto:john.doe@email.com\" \x14john.doe@email.com\x15\n", True),
+    ("Città: Milano – Master's Degree\n", False),
+]
+
+
+class TestDocExtractor:
+    """Test suite for the OLE2 compound file and Word text readers."""
+
+    def test_extracts_compressed_and_unicode_pieces(self):
+        """Test 8-bit and UTF-16 pieces are decoded in order, field codes dropped."""
+        text = extract_text(make_doc(SAMPLE_DOC_PIECES))
+
+        assert text.startswith("John Doe\nSenior Developer (2018-2023)\n")
+        assert "Email: john.doe@email.com\n" in text
+        assert "HYPERLINK" not in text
+        assert "Città: Milano – Master's Degree" in text
+
+    def test_0table_and_file_object(self):
+        """Test the 0Table stream is used when the FIB says so, reading from a file object."""
+        content = make_doc([("Jane Roe\nPython", True)], table_stream='0Table')
+
+        assert extract_text(io.BytesIO(content)) == "Jane Roe\nPython"
+
+    def test_max_chars(self):
+        """Test extraction stops at the character limit."""
+        content = make_doc([("a" * 5000, True), ("b" * 5000, False)])
+
+        assert extract_text(content, max_chars=6000) == "a" * 5000 + "b" * 1000
+
+    def test_large_and_mini_streams(self):
+        """Test both regular streams and mini streams are read back intact."""
+        streams = {'Big': bytes(range(256)) * 40, 'Small': b'mini stream data' * 10}
+        compound_file = CompoundFile(io.BytesIO(make_compound_file(streams)))
+
+        for name, data in streams.items():
+            stream = compound_file.open_stream(name)
+            assert stream.mini == (len(data) < 4096)
+            assert stream.read(0, len(data)) == data
+            assert stream.read(100, 37) == data[100:137]
+
+    def test_encrypted_document_rejected(self):
+        """Test encrypted documents raise instead of returning ciphertext."""
+        with pytest.raises(ValueError):
+            extract_text(make_doc(SAMPLE_DOC_PIECES, encrypted=True))
+
+    def test_cyclic_fat_rejected_quickly(self):
+        """Test a FAT chain pointing back on itself raises instead of looping."""
+        content = bytearray(make_doc([("x" * 4000, True)]))
+        fat_sector = struct.unpack_from('<I', content, 0x4C)[0]
+        fat_offset = (fat_sector + 1) * 512
+        # WordDocument starts at sector 0: make sector 1 point back to 0
+        content[fat_offset + 4:fat_offset + 8] = (0).to_bytes(4, 'little')
+
+        start = time.monotonic()
+        with pytest.raises(ValueError):
+            extract_text(bytes(content))
+        assert time.monotonic() - start < 1
+
+    def test_non_ole_doc_decoded_as_text(self):
+        """Test a text or RTF file saved as .doc still yields its text."""
+        assert extract_text(b"John Doe\nPython developer") == "John Doe\nPython developer"
+
+    def test_parser_uses_doc_backend(self):
+        """Test CVParser extracts fields from a real .doc instead of binary noise."""
+        result = CVParser().parse(make_doc(SAMPLE_DOC_PIECES), 'cv.doc')
+
+        assert result['name'] == "John Doe"
+        assert result['email'] == "john.doe@email.com"
+        assert result['skills'] == ["Python", "Aws", "Docker"]
+        assert result['education'] == "Master's Degree"
+        assert '\x00' not in result['raw_text']
+
+    def test_parser_survives_corrupt_doc(self):
+        """Test a truncated .doc yields empty text rather than an exception."""
+        content = make_doc(SAMPLE_DOC_PIECES)[:1500]
+
+        assert CVParser().parse(content, 'cv.doc')['raw_text'] == ''
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
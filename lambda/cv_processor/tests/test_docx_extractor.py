@@ -0,0 +1,87 @@
+"""
+Unit tests for the streaming DOCX extractor
+"""
+import io
+import zipfile
+import pytest
+from utils.cv_parser import CVParser
+from utils.docx_extractor import extract_text
+from tests.fixtures import docx_paragraph, docx_table, docx_text_box, make_docx
+
+
+class TestDocxExtractor:
+    """Test suite for DOCX text extraction with iterparse."""
+
+    def setup_method(self):
+        """Setup test fixtures."""
+        self.docx = make_docx(
+            docx_paragraph("Senior Engineer (2019-2024)")
+            + docx_table([["Languages", "Python, Go"], ["Cloud", "AWS, Terraform"]])
+            + docx_text_box("Email: jane.roe@example.com"),
+            header="Jane Roe"
+        )
+
+    def test_reads_header_body_tables_and_text_boxes(self):
+        """Test every story is extracted, header first, one paragraph per line."""
+        lines = extract_text(self.docx).split('\n')
+
+        assert lines[0] == "Jane Roe"
+        assert "Senior Engineer (2019-2024)" in lines
+        assert "Python, Go" in lines
+        assert "AWS, Terraform" in lines
+        # The text box is read once, not again from its VML fallback
+        assert lines.count("Email: jane.roe@example.com") == 1
+
+    def test_anchor_paragraph_text_around_a_text_box(self):
+        """Test the paragraph anchoring a text box keeps its own text, after the box's."""
+        content = make_docx(
+            docx_text_box("Box Python", before="Anchor text here", after=" and after")
+            + docx_paragraph("Next paragraph")
+        )
+
+        text = extract_text(content)
+
+        assert text == "Box Python\nAnchor text here and after\nNext paragraph"
+
+    def test_tabs_in_runs_but_not_tab_stops(self):
+        """Test w:tab in a run is a tab while tab stop definitions are ignored."""
+        text = extract_text(make_docx(docx_paragraph("Python\tExpert")))
+
+        assert text == "Python\tExpert"
+
+    def test_file_object_and_max_chars(self):
+        """Test extraction from a file object stops at the character limit."""
+        content = make_docx(''.join(docx_paragraph(f"Paragraph {i}") for i in range(1000)))
+
+        text = extract_text(io.BytesIO(content), max_chars=100)
+
+        assert len(text) == 100
+        assert text.startswith("Paragraph 0\nParagraph 1\n")
+
+    def test_zip_bomb_rejected(self):
+        """Test a document.xml with an extreme compression ratio is refused."""
+        body = docx_paragraph("x" * 2_000_000)
+        with pytest.raises(ValueError):
+            extract_text(make_docx(body))
+
+    def test_not_a_docx(self):
+        """Test a zip without word/document.xml is rejected."""
+        output = io.BytesIO()
+        with zipfile.ZipFile(output, 'w') as archive:
+            archive.writestr('readme.txt', 'hello')
+
+        with pytest.raises(ValueError):
+            extract_text(output.getvalue())
+
+    def test_parser_finds_skills_in_tables(self):
+        """Test CVParser picks up skills laid out in a table and the header name."""
+        result = CVParser().parse(self.docx, 'cv.docx')
+
+        assert result['name'] == "Jane Roe"
+        assert result['email'] == "jane.roe@example.com"
+        assert result['skills'] == ["Python", "Aws", "Go", "Cloud", "Terraform"]
+        assert result['experience_years'] == 5
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
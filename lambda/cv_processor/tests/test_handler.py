@@ -0,0 +1,317 @@
+"""
+Unit tests for the SQS Lambda handler
+"""
+import io
+import json
+import os
+import threading
+import time
+from types import SimpleNamespace
+import pytest
+
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+
+import handler
+
+
+SAMPLE_CV = b"""John Doe
+Email: john.doe@email.com
+Phone: +39 333 1234567
+Skills: Python, AWS, Docker, Git, SQL
+Master's Degree in Computer Science
+"""
+
+
+class FakeS3Client:
+    """Minimal in-memory stand-in for the S3 client."""
+
+    def __init__(self, objects):
+        self.objects = objects
+
+    def get_object(self, Bucket, Key, **kwargs):
+        if (Bucket, Key) not in self.objects:
+            raise Exception(f"NoSuchKey: {Key}")
+        content, metadata = self.objects[(Bucket, Key)]
+        return {'Body': io.BytesIO(content), 'ContentLength': len(content), 'Metadata': metadata}
+
+
+class FakeDynamoDBClient:
+    """Stand-in for the resource-level DynamoDB client used for batch writes."""
+
+    def __init__(self):
+        self.tables = {}
+
+    @property
+    def items(self):
+        return self.tables.get(handler.DYNAMODB_TABLE, [])
+
+    def batch_write_item(self, RequestItems):
+        for table_name, requests in RequestItems.items():
+            self.tables.setdefault(table_name, []).extend(
+                request['PutRequest']['Item'] for request in requests
+            )
+        return {'UnprocessedItems': {}}
+
+    def batch_get_item(self, RequestItems):
+        responses = {}
+        for table_name, request in RequestItems.items():
+            key_name = next(iter(request['Keys'][0]))
+            wanted = [key[key_name] for key in request['Keys']]
+            responses[table_name] = [
+                item for item in self.tables.get(table_name, [])
+                if item.get(key_name) in wanted
+            ]
+        return {'Responses': responses, 'UnprocessedKeys': {}}
+
+
+class FakeDynamoDB:
+    def __init__(self):
+        self.meta = SimpleNamespace(client=FakeDynamoDBClient())
+
+
+def make_record(message_id, key, bucket='cv-bucket'):
+    """Build an SQS record wrapping an S3 event notification."""
+    body = {'Records': [{'s3': {'bucket': {'name': bucket}, 'object': {'key': key}}}]}
+    return {'messageId': message_id, 'body': json.dumps(body)}
+
+
+class TestLambdaHandler:
+    """Test suite for lambda_handler batch processing."""
+
+    def setup_method(self):
+        """Setup fake AWS clients."""
+        self.s3 = FakeS3Client({
+            ('cv-bucket', 'cvs/john.txt'): (SAMPLE_CV, {'job_position': 'Software Engineer'}),
+        })
+        self.dynamodb = FakeDynamoDB()
+        self._original = (handler.s3_client, handler.dynamodb)
+        handler.s3_client = self.s3
+        handler.dynamodb = self.dynamodb
+
+    def teardown_method(self):
+        handler.s3_client, handler.dynamodb = self._original
+
+    def test_all_records_succeed(self):
+        """Test a clean batch reports no failures."""
+        event = {'Records': [make_record('msg-1', 'cvs/john.txt')]}
+
+        result = handler.lambda_handler(event, None)
+
+        assert result == {'batchItemFailures': []}
+        assert len(self.dynamodb.meta.client.items) == 1
+        assert self.dynamodb.meta.client.items[0]['job_position'] == 'Software Engineer'
+
+    def test_partial_batch_failure(self):
+        """Test only the failed message IDs are reported for redelivery."""
+        event = {'Records': [
+            make_record('msg-1', 'cvs/john.txt'),
+            make_record('msg-2', 'cvs/missing.pdf'),
+            {'messageId': 'msg-3', 'body': 'not json'},
+        ]}
+
+        result = handler.lambda_handler(event, None)
+
+        failed = [f['itemIdentifier'] for f in result['batchItemFailures']]
+        assert failed == ['msg-2', 'msg-3']
+        assert len(self.dynamodb.meta.client.items) == 1
+
+    def test_s3_test_event_is_skipped(self):
+        """Test the s3:TestEvent notification is acknowledged without work."""
+        record = {'messageId': 'msg-1', 'body': json.dumps({'Event': 's3:TestEvent'})}
+
+        result = handler.lambda_handler({'Records': [record]}, None)
+
+        assert result == {'batchItemFailures': []}
+        assert self.dynamodb.meta.client.items == []
+
+    def test_parse_cache_skips_reparsing(self, monkeypatch):
+        """Test a re-uploaded CV is ranked from the cache without parsing."""
+        self.s3.objects[('cv-bucket', 'cvs/john_cloud.txt')] = (
+            SAMPLE_CV, {'job_position': 'Cloud Engineer'}
+        )
+        monkeypatch.setattr(handler, 'PARSE_CACHE_TABLE', 'parse-cache')
+        parsed = []
+        original_parse = handler.CVParser.parse
+        monkeypatch.setattr(handler.CVParser, 'parse',
+                            lambda parser, *args: parsed.append(args[1]) or original_parse(parser, *args))
+
+        handler.lambda_handler({'Records': [make_record('msg-1', 'cvs/john.txt')]}, None)
+        result = handler.lambda_handler({'Records': [make_record('msg-2', 'cvs/john_cloud.txt')]}, None)
+
+        assert result == {'batchItemFailures': []}
+        assert parsed == ['cvs/john.txt']
+        items = self.dynamodb.meta.client.items
+        assert [item['job_position'] for item in items] == ['Software Engineer', 'Cloud Engineer']
+        assert items[0]['candidate_name'] == items[1]['candidate_name']
+
+    def test_run_stage_bounds_concurrency(self):
+        """Test stage workers never exceed the configured limit."""
+        lock = threading.Lock()
+        state = {'running': 0, 'peak': 0}
+
+        def stage(task):
+            with lock:
+                state['running'] += 1
+                state['peak'] = max(state['peak'], state['running'])
+            time.sleep(0.01)
+            with lock:
+                state['running'] -= 1
+            if task['message_id'] == 'msg-3':
+                raise RuntimeError('boom')
+
+        tasks = [{'message_id': f'msg-{i}'} for i in range(8)]
+        failures = {}
+
+        completed = handler.run_stage(stage, tasks, failures, max_workers=3)
+
+        assert state['peak'] <= 3
+        assert [t['message_id'] for t in completed] == [f'msg-{i}' for i in range(8) if i != 3]
+        assert failures == {'msg-3': 'boom'}
+
+    def test_direct_message_format(self):
+        """Test messages carrying s3_bucket/s3_key directly."""
+        body = {'s3_bucket': 'cv-bucket', 's3_key': 'cvs/john.txt'}
+        record = {'messageId': 'msg-1', 'body': json.dumps(body)}
+
+        assert handler.parse_message(record) == {
+            'bucket': 'cv-bucket', 'key': 'cvs/john.txt', 'version_id': None
+        }
+
+    def test_explicit_message_overrides_metadata(self):
+        """Test job_position/uploaded_by from the message win over S3 metadata."""
+        body = {'s3_bucket': 'cv-bucket', 's3_key': 'cvs/john.txt',
+                'job_position': 'Data Scientist', 'uploaded_by': 'recruiter'}
+        event = {'Records': [{'messageId': 'msg-1', 'body': json.dumps(body)}]}
+
+        handler.lambda_handler(event, None)
+
+        item = self.dynamodb.meta.client.items[0]
+        assert item['job_position'] == 'Data Scientist'
+        assert item['uploaded_by'] == 'recruiter'
+
+    def test_explicit_replay_skips_download(self):
+        """Test a replayed explicit message is dropped before touching S3."""
+        body = {'s3_bucket': 'cv-bucket', 's3_key': 'cvs/john.txt', 's3_version_id': 'v1',
+                'job_position': 'Software Engineer', 'uploaded_by': 'recruiter'}
+        record = {'messageId': 'msg-1', 'body': json.dumps(body)}
+        candidate_id = handler.make_candidate_id('cv-bucket', 'cvs/john.txt', 'v1', 'Software Engineer')
+        self.dynamodb.meta.client.tables[handler.DYNAMODB_TABLE] = [
+            {'candidate_id': candidate_id, 'status': 'processed'}
+        ]
+        self.s3.objects.clear()
+
+        result = handler.lambda_handler({'Records': [record]}, None)
+
+        assert handler.parse_message(record)['candidate_id'] == candidate_id
+        assert result == {'batchItemFailures': []}
+
+    def test_notification_key_is_unquoted(self):
+        """Test URL-encoded keys from S3 notifications are decoded."""
+        record = make_record('msg-1', 'cvs/john+doe%281%29.txt')
+
+        assert handler.parse_message(record)['key'] == 'cvs/john doe(1).txt'
+
+    def test_redelivery_is_a_no_op(self):
+        """Test replaying a message keeps a single row with a stable ID."""
+        event = {'Records': [make_record('msg-1', 'cvs/john.txt')]}
+
+        handler.lambda_handler(event, None)
+        result = handler.lambda_handler(event, None)
+
+        assert result == {'batchItemFailures': []}
+        assert len(self.dynamodb.meta.client.items) == 1
+
+    def test_status_rows_track_each_cv(self, monkeypatch):
+        """Test processing/failed status rows are written when enabled."""
+        monkeypatch.setattr(handler, 'STATUS_UPDATES', True)
+        self.s3.objects[('cv-bucket', 'cvs/broken.pdf')] = (b'broken', {'job_position': 'General'})
+        parse = handler.CVParser.parse
+
+        def failing_parse(parser, content, filename):
+            if filename == 'cvs/broken.pdf':
+                raise ValueError('corrupt file')
+            return parse(parser, content, filename)
+        monkeypatch.setattr(handler.CVParser, 'parse', failing_parse)
+        event = {'Records': [
+            make_record('msg-1', 'cvs/john.txt'),
+            make_record('msg-2', 'cvs/broken.pdf'),
+        ]}
+
+        handler.lambda_handler(event, None)
+
+        statuses = {}
+        for item in self.dynamodb.meta.client.items:
+            statuses.setdefault(item['s3_key'], []).append(item['status'])
+        assert statuses == {
+            'cvs/john.txt': ['processing', 'processed'],
+            'cvs/broken.pdf': ['processing', 'failed']
+        }
+        failed = self.dynamodb.meta.client.items[-1]
+        assert 'ranking_score' not in failed
+        assert failed['error']
+
+    def test_failed_status_row_is_retried(self, monkeypatch):
+        """Test a redelivered message reprocesses a CV marked as failed."""
+        monkeypatch.setattr(handler, 'STATUS_UPDATES', True)
+        candidate_id = handler.make_candidate_id('cv-bucket', 'cvs/john.txt', None, 'Software Engineer')
+        self.dynamodb.meta.client.tables[handler.DYNAMODB_TABLE] = [
+            {'candidate_id': candidate_id, 'status': 'failed'}
+        ]
+
+        handler.lambda_handler({'Records': [make_record('msg-1', 'cvs/john.txt')]}, None)
+
+        assert self.dynamodb.meta.client.items[-1]['status'] == 'processed'
+
+    def test_candidate_id_is_deterministic(self):
+        """Test IDs depend on object version and position only."""
+        first = handler.make_candidate_id('b', 'cvs/a.pdf', 'v1', 'Cloud Engineer')
+
+        assert first == handler.make_candidate_id('b', 'cvs/a.pdf', 'v1', 'Cloud Engineer')
+        assert first != handler.make_candidate_id('b', 'cvs/a.pdf', 'v2', 'Cloud Engineer')
+        assert first != handler.make_candidate_id('b', 'cvs/a.pdf', 'v1', 'Data Scientist')
+
+    def test_oversized_cv_fails_before_download(self, monkeypatch):
+        """Test an object above MAX_CV_BYTES is rejected from its ContentLength."""
+        monkeypatch.setattr(handler, 'MAX_CV_BYTES', 64)
+        body = io.BytesIO(SAMPLE_CV)
+        self.s3.get_object = lambda **kwargs: {
+            'Body': body, 'ContentLength': 50 * 1024 * 1024, 'Metadata': {}
+        }
+
+        result = handler.lambda_handler({'Records': [make_record('msg-1', 'cvs/john.txt')]}, None)
+
+        assert result == {'batchItemFailures': [{'itemIdentifier': 'msg-1'}]}
+        assert body.closed
+        assert self.dynamodb.meta.client.items == []
+
+    def test_read_body_enforces_limit_and_hashes(self, monkeypatch):
+        """Test the streamed copy is hashed like the bytes and capped while reading."""
+        content, content_hash = handler.read_body(io.BytesIO(SAMPLE_CV))
+        with content:
+            assert content.read() == SAMPLE_CV
+        assert content_hash == handler.ParseCache.content_hash(SAMPLE_CV)
+
+        # A body longer than announced is still cut off
+        monkeypatch.setattr(handler, 'MAX_CV_BYTES', len(SAMPLE_CV) - 1)
+        with pytest.raises(ValueError):
+            handler.read_body(io.BytesIO(SAMPLE_CV))
+
+    def test_large_cv_is_spooled_to_disk(self, monkeypatch):
+        """Test CVs above SPOOL_MAX_BYTES are parsed from a temporary file."""
+        monkeypatch.setattr(handler, 'SPOOL_MAX_BYTES', 16)
+        seen = []
+        original_parse = handler.CVParser.parse
+        def parse(parser, content, filename):
+            seen.append(content._rolled)
+            return original_parse(parser, content, filename)
+        monkeypatch.setattr(handler.CVParser, 'parse', parse)
+
+        result = handler.lambda_handler({'Records': [make_record('msg-1', 'cvs/john.txt')]}, None)
+
+        assert result == {'batchItemFailures': []}
+        assert seen == [True]
+        assert self.dynamodb.meta.client.items[0]['email'] == 'john.doe@email.com'
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
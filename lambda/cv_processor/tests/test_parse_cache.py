@@ -0,0 +1,87 @@
+"""
+Unit tests for the content-addressed ParseCache
+"""
+import pytest
+from utils.cv_parser import PARSER_VERSION
+from utils.parse_cache import ParseCache
+
+
+class FakeClient:
+    """In-memory DynamoDB client supporting batch get/write."""
+
+    def __init__(self):
+        self.items = {}
+        self.get_calls = 0
+
+    def batch_write_item(self, RequestItems):
+        for requests in RequestItems.values():
+            for request in requests:
+                item = request['PutRequest']['Item']
+                self.items[item['content_hash']] = item
+        return {'UnprocessedItems': {}}
+
+    def batch_get_item(self, RequestItems):
+        self.get_calls += 1
+        table_name, request = next(iter(RequestItems.items()))
+        found = [self.items[k['content_hash']] for k in request['Keys'] if k['content_hash'] in self.items]
+        return {'Responses': {table_name: found}, 'UnprocessedKeys': {}}
+
+
+class TestParseCache:
+    """Test suite for ParseCache class."""
+
+    def setup_method(self):
+        """Setup test fixtures."""
+        self.client = FakeClient()
+        self.cache = ParseCache(self.client, 'parse-cache')
+        self.cv_data = {
+            'name': 'John Doe',
+            'email': 'john.doe@email.com',
+            'phone': None,
+            'skills': ['Python', 'Aws'],
+            'experience_years': 6,
+            'education': "Master's Degree",
+            'raw_text': 'John Doe ...'
+        }
+
+    def test_content_hash_is_stable(self):
+        """Test identical bytes produce the same key."""
+        assert ParseCache.content_hash(b'cv') == ParseCache.content_hash(b'cv')
+        assert ParseCache.content_hash(b'cv') != ParseCache.content_hash(b'cv2')
+
+    def test_round_trip_drops_raw_text(self):
+        """Test stored entries come back without raw_text and with native numbers."""
+        self.cache.put_many({'abc': self.cv_data})
+
+        found = self.cache.get_many(['abc', 'missing'])
+
+        assert list(found) == ['abc']
+        assert 'raw_text' not in found['abc']
+        assert found['abc']['experience_years'] == 6
+        assert isinstance(found['abc']['experience_years'], int)
+        assert found['abc']['skills'] == ['Python', 'Aws']
+
+    def test_entries_have_expiry(self):
+        """Test entries carry the TTL attribute."""
+        self.cache.put_many({'abc': self.cv_data})
+
+        assert self.client.items['abc']['expires_at'] > 0
+
+    def test_other_parser_version_is_a_miss(self):
+        """Test entries written by another parser version are not reused."""
+        ParseCache(self.client, 'parse-cache', parser_version=1).put_many({'old': self.cv_data})
+        self.client.items['legacy'] = {'content_hash': 'legacy', 'cv_data': {}, 'expires_at': 0}
+        self.cache.put_many({'abc': self.cv_data})
+
+        assert list(self.cache.get_many(['old', 'legacy', 'abc'])) == ['abc']
+        assert self.client.items['abc']['parser_version'] == PARSER_VERSION
+
+    def test_get_many_batches_keys(self):
+        """Test lookups are split into BatchGetItem calls of 100 keys."""
+        self.cache.get_many([f'h{i}' for i in range(250)])
+
+        assert self.client.get_calls == 3
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
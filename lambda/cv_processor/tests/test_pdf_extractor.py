@@ -0,0 +1,124 @@
+"""
+Unit tests for streaming PDF extraction
+"""
+import tempfile
+import pytest
+from utils.cv_parser import CVParser, SectionTracker
+from utils import pdf_extractor
+from utils.pdf_extractor import iter_pdf_pages, extract_text
+from tests.fixtures import make_pdf
+
+
+class TestPDFExtractor:
+    """Test suite for page-bounded PDF extraction."""
+
+    def setup_method(self):
+        """Setup test fixtures."""
+        self.pages = [f"Page {i}\nFiller text for page {i}" for i in range(10)]
+        self.pdf = make_pdf(self.pages)
+
+    def test_yields_pages_in_order(self):
+        """Test every page is yielded when no limit is hit."""
+        chunks = list(iter_pdf_pages(self.pdf, max_pages=50))
+
+        assert len(chunks) == 10
+        assert chunks[0].startswith("Page 0")
+        assert chunks[9].startswith("Page 9")
+
+    def test_max_pages(self):
+        """Test extraction stops at the page limit."""
+        chunks = list(iter_pdf_pages(self.pdf, max_pages=3))
+
+        assert len(chunks) == 3
+
+    def test_max_chars_truncates(self):
+        """Test the character budget truncates the last page."""
+        text = extract_text(self.pdf, max_chars=40)
+
+        assert len(text) <= 40 + 2  # plus page separators
+        assert text.startswith("Page 0")
+
+    def test_time_budget(self):
+        """Test an exhausted time budget stops before the next page."""
+        chunks = list(iter_pdf_pages(self.pdf, time_budget=0))
+
+        assert chunks == []
+
+    def test_early_exit_after_min_pages(self):
+        """Test stop_when ends extraction once min_pages have been read."""
+        chunks = list(iter_pdf_pages(self.pdf, min_pages=4, stop_when=lambda text: True))
+
+        assert len(chunks) == 4
+
+    def test_parallel_matches_serial(self):
+        """Test process-pool extraction reassembles pages in order."""
+        pdf = make_pdf([f"Page {i}" for i in range(30)])
+
+        serial = list(iter_pdf_pages(pdf, workers=0))
+        parallel = list(iter_pdf_pages(pdf, workers=3))
+
+        assert parallel == serial
+        assert len(parallel) == 30
+
+    def test_parallel_early_exit(self):
+        """Test early termination also applies in parallel mode."""
+        pdf = make_pdf([f"Page {i}" for i in range(30)])
+
+        chunks = list(iter_pdf_pages(pdf, workers=3, min_pages=5, stop_when=lambda text: True))
+
+        assert len(chunks) == 5
+        assert chunks[4].startswith("Page 4")
+
+    def test_short_documents_stay_serial(self, monkeypatch):
+        """Test documents below the page threshold never start a pool."""
+        def fail(*args, **kwargs):
+            raise AssertionError("pool should not be started")
+        monkeypatch.setattr(pdf_extractor, '_parallel_pages', fail)
+
+        assert len(list(iter_pdf_pages(self.pdf, workers=4))) == 10
+
+    def test_unsupported_pool_falls_back_to_serial(self, monkeypatch):
+        """Test platforms without process pools (e.g. Lambda) use serial extraction."""
+        def unsupported(*args, **kwargs):
+            raise OSError(38, "Function not implemented")
+        monkeypatch.setattr(pdf_extractor, '_parallel_pages', unsupported)
+        pdf = make_pdf([f"Page {i}" for i in range(30)])
+
+        assert len(list(iter_pdf_pages(pdf, workers=4))) == 30
+
+    def test_section_tracker(self):
+        """Test the tracker fires once contact and skills are both seen."""
+        tracker = SectionTracker()
+
+        assert tracker("John Doe\nSome summary") is False
+        assert tracker("Email: john@example.com") is False
+        assert tracker("Technical Skills\nPython, AWS") is True
+
+    def test_parser_stops_reading_long_pdf(self):
+        """Test a long portfolio PDF is only read until the CV sections are found."""
+        pages = ["John Doe\nEmail: john@example.com\nSkills\nPython, Docker"]
+        pages += [f"Portfolio project {i} using Rust" for i in range(50)]
+        parser = CVParser(pdf_limits={'min_pages': 2})
+
+        result = parser.parse(make_pdf(pages), 'portfolio.pdf')
+
+        assert result['email'] == "john@example.com"
+        assert result['skills'] == ["Python", "Docker", "Rust"]
+        assert "Portfolio project 0 " in result['raw_text']
+        assert "Portfolio project 1 " not in result['raw_text']
+
+
+    def test_parser_reads_file_object(self):
+        """Test a PDF spooled to a temporary file is parsed without reading it into bytes."""
+        with tempfile.SpooledTemporaryFile(max_size=16) as spooled:
+            spooled.write(make_pdf(["Jane Roe\nEmail: jane@example.com\nSkills\nPython"]))
+            spooled.seek(0)
+
+            result = CVParser().parse(spooled, 'cv.pdf')
+
+        assert result['email'] == "jane@example.com"
+        assert result['skills'] == ["Python"]
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -153,6 +153,70 @@ class TestRankingEngine:
         
         # Should use General requirements
         assert score > 0
+    
+    def test_calculate_scores_matrix_shape(self):
+        """Test batch scoring returns one row per candidate and one column per position."""
+        candidates = [
+            {'skills': ['Python'], 'experience_years': 1, 'education': 'Not specified'},
+            {'skills': ['AWS', 'Docker'], 'experience_years': 4, 'education': "Master's Degree"}
+        ]
+        
+        scores = self.engine.calculate_scores(candidates, ['Cloud Engineer', 'General'])
+        
+        assert len(scores) == 2
+        assert all(len(row) == 2 for row in scores)
+        assert scores[1][0][1] == '2/5'
+        assert scores[0][1][1] == '1/3'
+    
+    def test_calculate_scores_defaults_to_all_positions(self):
+        """Test every configured position is scored when none are given."""
+        cv_data = {'skills': ['Python'], 'experience_years': 2, 'education': 'Not specified'}
+        
+        scores = self.engine.calculate_scores([cv_data])
+        
+        assert len(scores[0]) == len(self.engine.job_requirements)
+    
+    def test_calculate_scores_matches_reference_formula(self):
+        """Test batch scores equal the per-candidate formula for every pair."""
+        candidates = [
+            {'skills': skills, 'experience_years': years, 'education': education}
+            for skills in (['Python', 'SQL', 'AI'], ['Kubernetes', 'CI/CD', 'Git'], [])
+            for years in (0, 2, 7)
+            for education in ('PhD', "Bachelor's Degree", 'Not specified')
+        ]
+        positions = list(self.engine.job_requirements) + ['Unknown Position']
+        
+        scores = self.engine.calculate_scores(candidates, positions)
+        
+        for cv_data, row in zip(candidates, scores):
+            for position, (score, matched) in zip(positions, row):
+                requirements = self.engine.job_requirements.get(
+                    position, self.engine.job_requirements['General']
+                )
+                weight = requirements['education_weight']
+                expected = round((
+                    self.engine._calculate_skills_score(cv_data['skills'], requirements['skills']) * 0.5 +
+                    self.engine._calculate_experience_score(
+                        cv_data['experience_years'], requirements['min_experience']
+                    ) * (0.5 - weight) +
+                    self.engine._calculate_education_score(cv_data['education']) * weight
+                ) * 100, 2)
+                assert score == expected
+                assert matched.endswith(f"/{len({skill.lower() for skill in requirements['skills']})}")
+    
+    def test_duplicated_required_skill_counts_once(self):
+        """Test a required skill listed twice doesn't keep a full match below 100%."""
+        engine = RankingEngine({
+            'General': {'skills': [], 'min_experience': 0, 'education_weight': 0.2},
+            'Backend Developer': {'skills': ['Python', 'python', 'AWS'], 'min_experience': 0, 'education_weight': 0.2}
+        })
+        cv_data = {'skills': ['Python', 'AWS'], 'experience_years': 5, 'education': 'PhD'}
+        
+        score, skills_matched = engine.calculate_score(cv_data, 'Backend Developer')
+        
+        assert skills_matched == "2/2"
+        assert score == 100
+        assert engine._calculate_skills_score(cv_data['skills'], ['Python', 'python', 'AWS']) == 1.0
 
 
 if __name__ == '__main__':
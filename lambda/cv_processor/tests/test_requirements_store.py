@@ -0,0 +1,161 @@
+"""
+Unit tests for the cached job-requirements store
+"""
+import io
+import json
+from decimal import Decimal
+import pytest
+from botocore.exceptions import ClientError
+from utils.ranking_engine import DEFAULT_JOB_REQUIREMENTS, RankingEngine
+from utils.requirements_store import (
+    DynamoDBRequirementsSource,
+    RequirementsStore,
+    S3RequirementsSource
+)
+
+
+class FakeS3Client:
+    """Fake S3 client honouring IfNoneMatch."""
+
+    def __init__(self, document):
+        self.document = document
+        self.etag = '"v1"'
+        self.calls = []
+
+    def get_object(self, Bucket, Key, IfNoneMatch=None):
+        self.calls.append(IfNoneMatch)
+        if IfNoneMatch == self.etag:
+            raise ClientError(
+                {'Error': {'Code': '304', 'Message': 'Not Modified'},
+                 'ResponseMetadata': {'HTTPStatusCode': 304}},
+                'GetObject'
+            )
+        return {'Body': io.BytesIO(json.dumps(self.document).encode()), 'ETag': self.etag}
+
+
+class FakeSource:
+    """Source returning scripted results."""
+
+    def __init__(self, *results):
+        self.results = list(results)
+        self.loads = 0
+
+    def load(self):
+        self.loads += 1
+        result = self.results.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+SRE_PROFILE = {'skills': ['linux', 'aws'], 'min_experience': 4, 'education_weight': 0.1}
+
+
+class TestRequirementsStore:
+    """Test suite for RequirementsStore and its sources."""
+
+    def setup_method(self):
+        """Setup test fixtures."""
+        self.clock = FakeClock()
+
+    def make_store(self, source):
+        return RequirementsStore(source, DEFAULT_JOB_REQUIREMENTS, ttl_seconds=60, clock=self.clock)
+
+    def test_cached_until_ttl_expires(self):
+        """Test the source is only hit again after the TTL."""
+        source = FakeSource({'SRE': SRE_PROFILE}, {})
+        store = self.make_store(source)
+
+        store.get()
+        self.clock.now = 59
+        requirements = store.get()
+
+        assert source.loads == 1
+        assert requirements['SRE']['skills'] == ['linux', 'aws']
+
+        self.clock.now = 61
+        store.get()
+        assert source.loads == 2
+
+    def test_loaded_positions_layer_over_builtins(self):
+        """Test new positions are added and built-ins, including General, remain."""
+        store = self.make_store(FakeSource({'SRE': SRE_PROFILE}))
+
+        requirements = store.get()
+
+        assert 'SRE' in requirements
+        assert set(DEFAULT_JOB_REQUIREMENTS) <= set(requirements)
+
+    def test_errors_keep_last_good_requirements(self):
+        """Test a failing refresh serves the previous requirements."""
+        store = self.make_store(FakeSource({'SRE': SRE_PROFILE}, Exception('throttled')))
+        store.get()
+        self.clock.now = 120
+
+        requirements = store.get()
+
+        assert 'SRE' in requirements
+
+    def test_invalid_positions_are_dropped(self):
+        """Test malformed profiles are skipped without failing the load."""
+        store = self.make_store(FakeSource({
+            'SRE': SRE_PROFILE,
+            'Broken': {'min_experience': 1},
+            'Heavy': {'skills': ['x'], 'education_weight': 0.9}
+        }))
+
+        requirements = store.get()
+
+        assert 'SRE' in requirements
+        assert 'Broken' not in requirements
+        assert 'Heavy' not in requirements
+
+    def test_s3_source_revalidates_with_etag(self):
+        """Test unchanged S3 documents are revalidated with IfNoneMatch."""
+        client = FakeS3Client({'SRE': SRE_PROFILE})
+        store = self.make_store(S3RequirementsSource(client, 'config', 'jobs.json'))
+        store.get()
+        self.clock.now = 120
+
+        requirements = store.get()
+
+        assert client.calls == [None, '"v1"']
+        assert 'SRE' in requirements
+
+    def test_dynamodb_source_converts_numbers(self):
+        """Test DynamoDB items are normalized to native numbers."""
+        class FakeDynamoDBClient:
+            def scan(self, TableName, ExclusiveStartKey=None):
+                return {'Items': [{
+                    'job_position': 'SRE',
+                    'skills': ['linux'],
+                    'min_experience': Decimal('4'),
+                    'education_weight': Decimal('0.1')
+                }]}
+
+        store = self.make_store(DynamoDBRequirementsSource(FakeDynamoDBClient(), 'jobs'))
+
+        profile = store.get()['SRE']
+
+        assert profile == {'skills': ['linux'], 'min_experience': 4, 'education_weight': 0.1}
+
+    def test_ranking_engine_scores_custom_position(self):
+        """Test the engine ranks against positions from the store."""
+        engine = RankingEngine(store=self.make_store(FakeSource({'SRE': SRE_PROFILE})))
+        cv_data = {'skills': ['Linux', 'AWS'], 'experience_years': 5, 'education': 'PhD'}
+
+        _, skills_matched = engine.calculate_score(cv_data, 'SRE')
+
+        assert skills_matched == '2/2'
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
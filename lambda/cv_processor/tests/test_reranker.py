@@ -0,0 +1,174 @@
+"""
+Unit tests for the bulk re-ranking job
+"""
+import threading
+from decimal import Decimal
+import pytest
+from botocore.exceptions import ClientError
+from utils.ranking_engine import RankingEngine
+from utils.reranker import Reranker
+
+
+class FakeClient:
+    """Fake DynamoDB client serving a segmented, paginated Scan."""
+
+    def __init__(self, items, page_size=2):
+        self.items = {item['candidate_id']: item for item in items}
+        self.page_size = page_size
+        self.scans = []
+        self.writes = []
+        self.lock = threading.Lock()
+
+    def scan(self, TableName, Segment, TotalSegments, ExclusiveStartKey=None, **kwargs):
+        with self.lock:
+            self.scans.append((Segment, ExclusiveStartKey))
+        values = kwargs['ExpressionAttributeValues']
+        segment_items = [
+            dict(item) for candidate_id, item in sorted(self.items.items())
+            if hash(candidate_id) % TotalSegments == Segment
+            and item['status'] == values[':processed']
+            and item['job_position'] == values.get(':position', item['job_position'])
+        ]
+        start = int(ExclusiveStartKey['candidate_id']) if ExclusiveStartKey else 0
+        response = {'Items': segment_items[start:start + self.page_size]}
+        if start + self.page_size < len(segment_items):
+            response['LastEvaluatedKey'] = {'candidate_id': str(start + self.page_size)}
+        return response
+
+    def update_item(self, TableName, Key, UpdateExpression, ConditionExpression,
+                    ExpressionAttributeNames, ExpressionAttributeValues):
+        values = ExpressionAttributeValues
+        with self.lock:
+            item = self.items[Key['candidate_id']]
+            for condition in ConditionExpression.split(' AND '):
+                if condition.startswith('attribute_not_exists('):
+                    holds = condition[len('attribute_not_exists('):-1] not in item
+                else:
+                    name, placeholder = condition.split(' = ')
+                    name = ExpressionAttributeNames.get(name, name)
+                    holds = item.get(name) == values[placeholder]
+                if not holds:
+                    raise ClientError(
+                        {'Error': {'Code': 'ConditionalCheckFailedException', 'Message': 'failed'}},
+                        'UpdateItem'
+                    )
+            self.writes.append(Key['candidate_id'])
+            item['ranking_score'] = values[':score']
+            item['skills_matched'] = values[':matched']
+        return {}
+
+
+def make_item(candidate_id, skills, position='Software Engineer', score='0', status='processed'):
+    return {
+        'candidate_id': candidate_id,
+        'job_position': position,
+        'skills': skills,
+        'experience_years': Decimal('4'),
+        'education': "Master's Degree",
+        'ranking_score': Decimal(score),
+        'skills_matched': '0/5',
+        'status': status,
+        'upload_date': '2024-01-01 10:00:00',
+        's3_version_id': 'v1'
+    }
+
+
+class TestReranker:
+    """Test suite for Reranker class."""
+
+    def setup_method(self):
+        """Setup test fixtures."""
+        self.engine = RankingEngine()
+
+    def test_rescores_every_segment_and_page(self):
+        """Test all processed items are rescored across segments and pages."""
+        items = [make_item(f'c{i}', ['Python', 'Git']) for i in range(11)]
+        client = FakeClient(items)
+
+        stats = Reranker(client, 'candidates', self.engine, total_segments=3).run()
+
+        assert stats == {'scanned': 11, 'updated': 11, 'skipped': 0, 'failed': 0}
+        expected, matched = self.engine.calculate_score(
+            {'skills': ['Python', 'Git'], 'experience_years': 4, 'education': "Master's Degree"},
+            'Software Engineer'
+        )
+        assert all(item['ranking_score'] == Decimal(str(expected)) for item in client.items.values())
+        assert all(item['skills_matched'] == matched for item in client.items.values())
+        assert {segment for segment, _ in client.scans} == {0, 1, 2}
+
+    def test_unchanged_scores_are_not_written(self):
+        """Test a second run finds nothing to update."""
+        client = FakeClient([make_item(f'c{i}', ['AWS']) for i in range(4)])
+        reranker = Reranker(client, 'candidates', self.engine, total_segments=2)
+        reranker.run()
+        client.writes.clear()
+
+        stats = reranker.run()
+
+        assert stats['updated'] == 0
+        assert client.writes == []
+
+    def test_requirement_change_is_applied(self):
+        """Test changed job requirements change stored scores."""
+        client = FakeClient([make_item('a', ['Go'], position='General')])
+        reranker = Reranker(client, 'candidates', self.engine, total_segments=1)
+        reranker.run()
+        before = client.items['a']['ranking_score']
+
+        self.engine.job_requirements['General']['skills'] = ['go']
+        reranker.run()
+
+        assert client.items['a']['skills_matched'] == '1/1'
+        assert client.items['a']['ranking_score'] > before
+
+    def test_position_filter_and_unprocessed_rows(self):
+        """Test only processed items of the requested position are scanned."""
+        client = FakeClient([
+            make_item('a', ['AWS'], position='Cloud Engineer'),
+            make_item('b', ['AWS'], position='General'),
+            make_item('c', ['AWS'], position='Cloud Engineer', status='failed')
+        ])
+
+        stats = Reranker(client, 'candidates', self.engine, total_segments=2).run('Cloud Engineer')
+
+        assert stats['scanned'] == 1
+        assert client.writes == ['a']
+
+    def test_row_rewritten_after_scan_is_not_overwritten(self):
+        """Test a row reprocessed between the Scan and the write is skipped."""
+        client = FakeClient([make_item('a', ['AWS']), make_item('b', ['AWS'])])
+        scan = client.scan
+
+        def scan_then_reprocess(**kwargs):
+            response = scan(**kwargs)
+            # The Lambda stores a new upload of 'a' while the page is rescored
+            client.items['a'] = dict(
+                make_item('a', ['Go'], score='42'),
+                upload_date='2024-01-02 09:00:00',
+                s3_version_id='v2'
+            )
+            return response
+        client.scan = scan_then_reprocess
+
+        stats = Reranker(client, 'candidates', self.engine, total_segments=1).run()
+
+        assert stats == {'scanned': 2, 'updated': 1, 'skipped': 1, 'failed': 0}
+        assert client.items['a']['skills'] == ['Go']
+        assert client.items['a']['ranking_score'] == Decimal('42')
+        assert client.writes == ['b']
+
+    def test_other_errors_are_counted_as_failed(self):
+        """Test an update error is reported without stopping the run."""
+        client = FakeClient([make_item('a', ['AWS'])])
+
+        def update_item(**kwargs):
+            raise ClientError({'Error': {'Code': 'AccessDeniedException', 'Message': 'denied'}}, 'UpdateItem')
+        client.update_item = update_item
+
+        stats = Reranker(client, 'candidates', self.engine, total_segments=1).run()
+
+        assert stats == {'scanned': 1, 'updated': 0, 'skipped': 0, 'failed': 1}
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,57 @@
+"""
+Unit tests for the trie-based SkillMatcher
+"""
+import pytest
+from utils.skill_matcher import SkillMatcher
+
+
+class TestSkillMatcher:
+    """Test suite for SkillMatcher class."""
+
+    def setup_method(self):
+        """Setup test fixtures."""
+        self.matcher = SkillMatcher([
+            'python', 'java', 'javascript', 'go', 'ai', 'node.js', 'ci/cd',
+            'machine learning', 'machine'
+        ])
+
+    def test_whole_words_only(self):
+        """Test keywords do not match inside longer words."""
+        text = "a good team player who can maintain javascript code"
+
+        assert self.matcher.find(text) == ['javascript']
+
+    def test_punctuated_keywords(self):
+        """Test keywords containing punctuation."""
+        text = "built services in node.js with ci/cd pipelines."
+
+        assert self.matcher.find(text) == ['node.js', 'ci/cd']
+
+    def test_multi_word_and_overlapping_keywords(self):
+        """Test overlapping keywords are all reported."""
+        text = "applied machine\nlearning and ai"
+
+        assert self.matcher.find(text) == ['ai', 'machine learning', 'machine']
+
+    def test_results_follow_keyword_order(self):
+        """Test output order matches the keyword list, without duplicates."""
+        text = "go, python, go, java"
+
+        assert self.matcher.find(text) == ['python', 'java', 'go']
+
+    def test_synonyms_map_to_canonical(self):
+        """Test aliases report their canonical keyword."""
+        matcher = SkillMatcher(['go', 'kubernetes'], synonyms={'golang': 'go', 'k8s': 'kubernetes'})
+
+        assert matcher.find("golang services on k8s") == ['go', 'kubernetes']
+
+    def test_large_taxonomy(self):
+        """Test matching against thousands of keywords."""
+        keywords = [f"skill{i}" for i in range(5000)] + ['python']
+        matcher = SkillMatcher(keywords)
+
+        assert matcher.find("python and skill4999 but not skill50000") == ['skill4999', 'python']
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,110 @@
+import random
+import time
+from botocore.exceptions import ClientError
+
+
+class BatchWriter:
+    """
+    Buffer DynamoDB puts and flush them with BatchWriteItem.
+
+    Every item is registered together with the owner that produced it (the
+    SQS message ID in the CV processor), so items that are still unprocessed
+    after all retries can be mapped back to the messages to redeliver.
+    """
+
+    # BatchWriteItem accepts at most 25 put/delete requests per call
+    MAX_BATCH_SIZE = 25
+
+    RETRYABLE_ERRORS = {
+        'ProvisionedThroughputExceededException',
+        'ThrottlingException',
+        'RequestLimitExceeded',
+        'InternalServerError',
+    }
+
+    def __init__(self, client, table_name, key_attribute='candidate_id',
+                 max_attempts=5, base_delay=0.05, max_delay=2.0, sleep=time.sleep):
+        """
+        Args:
+            client: DynamoDB client (``dynamodb.meta.client`` of the boto3
+                resource, so items can be passed as plain Python types)
+            table_name: Target table
+            key_attribute: Partition key used to match UnprocessedItems
+            max_attempts: Attempts per chunk before giving up
+            base_delay: Base of the exponential backoff, in seconds
+            max_delay: Upper bound for a single backoff sleep, in seconds
+            sleep: Sleep function (overridable in tests)
+        """
+        self.client = client
+        self.table_name = table_name
+        self.key_attribute = key_attribute
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.sleep = sleep
+        self._pending = {}
+
+    def put(self, item, owner):
+        """
+        Buffer an item for the next flush.
+
+        Items sharing a key within one flush are collapsed (last write wins),
+        since BatchWriteItem rejects duplicate keys in a single request.
+        """
+        key = item[self.key_attribute]
+        _, owners = self._pending.get(key, (None, []))
+        self._pending[key] = (item, owners + [owner])
+
+    def flush(self):
+        """
+        Write every buffered item in chunks of MAX_BATCH_SIZE.
+
+        Returns:
+            Dict of owner -> error message for items that could not be written
+        """
+        pending = list(self._pending.items())
+        self._pending = {}
+
+        failures = {}
+        for start in range(0, len(pending), self.MAX_BATCH_SIZE):
+            chunk = dict(pending[start:start + self.MAX_BATCH_SIZE])
+            for key, error in self._write_chunk(chunk).items():
+                for owner in chunk[key][1]:
+                    failures[owner] = error
+        return failures
+
+    def _write_chunk(self, chunk):
+        """Write one chunk, retrying UnprocessedItems. Returns key -> error."""
+        remaining = {key: item for key, (item, _) in chunk.items()}
+
+        for attempt in range(self.max_attempts):
+            if attempt:
+                self.sleep(self._backoff(attempt))
+
+            request_items = {
+                self.table_name: [{'PutRequest': {'Item': item}} for item in remaining.values()]
+            }
+            try:
+                response = self.client.batch_write_item(RequestItems=request_items)
+            except ClientError as e:
+                code = e.response.get('Error', {}).get('Code')
+                if code not in self.RETRYABLE_ERRORS:
+                    return {key: f"BatchWriteItem failed: {code}" for key in remaining}
+                continue
+
+            unprocessed = response.get('UnprocessedItems', {}).get(self.table_name, [])
+            unprocessed_keys = {
+                request['PutRequest']['Item'][self.key_attribute] for request in unprocessed
+            }
+            remaining = {key: item for key, item in remaining.items() if key in unprocessed_keys}
+            if not remaining:
+                return {}
+
+        return {
+            key: f"Item still unprocessed after {self.max_attempts} attempts"
+            for key in remaining
+        }
+
+    def _backoff(self, attempt):
+        """Exponential backoff with full jitter."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
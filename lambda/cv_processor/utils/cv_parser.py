@@ -1,159 +1,450 @@
+import importlib
 import re
-import PyPDF2
-from io import BytesIO
-import docx
+import threading
+from datetime import datetime
+from .skill_matcher import SkillMatcher
+
+# Version of the parser output. Bump it whenever a change alters the
+# fields extracted from the same bytes, so cached parses are not reused.
+PARSER_VERSION = 7
+
+# Patterns are compiled once at import time and shared by every parser
+# instance (and across warm Lambda invocations).
+EMAIL_PATTERN = re.compile(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}')
+PHONE_PATTERN = re.compile(r'[\+\(]?[0-9][0-9 .\-\(\)]{8,}[0-9]')
+EXPERIENCE_PATTERN = re.compile(
+    r'(?P<start>(?:19|20)\d{2})\s*[-–]\s*(?:(?P<end>(?:19|20)\d{2})|present|current)'
+)
+
+# Start of a year range ("2018 -"), spliced into FUSED_TOKEN_PATTERN below
+YEAR_RANGE_START = r'(?:19|20)\d{2}\s*[-–]'
+
+# Fused tokenizer applied once to the lowercased text. Emails, year ranges
+# and phone numbers come out as single tokens; everything else is split
+# like SkillMatcher tokens (words and single punctuation characters). The
+# lookaheads let ordinary words skip the contact alternatives cheaply, and
+# a phone may not start with or run into a year range, so "(2018-2020)" and
+# "team of 5 (2018-2020)" keep the range while "333 123 4567" and
+# "0333 1234567" are phones.
+FUSED_TOKEN_PATTERN = re.compile(r"""
+      (?=[a-z0-9._%+-]*@)[a-z0-9._%+-]+@[a-z0-9.-]+\.[a-z]{2,}
+    | (?=[0-9(+])(?:
+          (?:19|20)\d{2}\s*[-–]\s*(?:(?:19|20)\d{2}|present|current)
+        | (?!\(?YEAR_RANGE_START)[\+\(]?[0-9](?:(?!YEAR_RANGE_START)[0-9 .\-\(\)]){8,}[0-9]
+      )
+    | [^\W_]+
+    | [^\w\s]
+    | _
+""".replace('YEAR_RANGE_START', YEAR_RANGE_START), re.VERBOSE)
+
+# Start of a skills section, used to stop reading long PDFs early
+SKILLS_HEADING_PATTERN = re.compile(
+    r'^\s*(?:technical\s+|key\s+|core\s+)?(?:skills|competenc(?:e|ies))\b',
+    re.IGNORECASE | re.MULTILINE
+)
+
+DEFAULT_SKILLS = [
+    'python', 'java', 'javascript', 'react', 'node.js', 'aws', 'docker',
+    'kubernetes', 'sql', 'mongodb', 'machine learning', 'ai', 'git',
+    'agile', 'scrum', 'html', 'css', 'typescript', 'go', 'rust',
+    'cloud', 'devops', 'ci/cd', 'terraform', 'ansible'
+]
+
+# Highest level first: the first level found in a CV wins
+EDUCATION_LEVELS = [
+    ('phd', 'PhD'),
+    ('ph.d', 'PhD'),
+    ('doctorate', 'PhD'),
+    ('master', "Master's Degree"),
+    ('masters', "Master's Degree"),
+    ('msc', "Master's Degree"),
+    ('mba', 'MBA'),
+    ('bachelor', "Bachelor's Degree"),
+    ('bachelors', "Bachelor's Degree"),
+    ('bsc', "Bachelor's Degree"),
+    ('diploma', 'Diploma')
+]
+
+
+# Text extraction backend per file extension, as (module, function). Modules
+# are imported on first use, so a .txt CV never loads PyPDF2 or the other readers.
+# Backends are called as function(content, **options), where content is
+# bytes or a seekable binary file object, and return the text.
+PARSER_BACKENDS = {
+    '.pdf': ('.pdf_extractor', 'extract_text'),
+    '.docx': ('.docx_extractor', 'extract_text'),
+    '.doc': ('.doc_extractor', 'extract_text'),
+}
+_loaded_backends = {}
+_backends_lock = threading.Lock()
+
+
+def register_backend(extension, module, function='extract_text'):
+    """
+    Register (or replace) the text extraction backend for a file extension.
+
+    Args:
+        extension: File extension including the dot, e.g. '.doc'
+        module: Module path; relative paths are resolved against this package
+        function: Name of the extraction function in the module
+    """
+    extension = extension.lower()
+    with _backends_lock:
+        PARSER_BACKENDS[extension] = (module, function)
+        _loaded_backends.pop(extension, None)
+
+
+def load_backend(extension):
+    """
+    Return the extraction function for an extension, importing it on first use.
+
+    Returns:
+        Callable, or None when no backend is registered for the extension
+    """
+    backend = _loaded_backends.get(extension)
+    if backend is not None or extension not in PARSER_BACKENDS:
+        return backend
+
+    # Parses may run on several threads; import each backend once
+    with _backends_lock:
+        if extension not in _loaded_backends:
+            module, function = PARSER_BACKENDS[extension]
+            _loaded_backends[extension] = getattr(importlib.import_module(module, __package__), function)
+        return _loaded_backends[extension]
+
+
+def build_keyword_matcher(skills):
+    """
+    Compile skills and education keywords into one matcher.
+
+    Indices below ``len(skills)`` are skills; the rest map onto
+    EDUCATION_LEVELS in order.
+    """
+    return SkillMatcher(list(skills) + [keyword for keyword, _ in EDUCATION_LEVELS])
+
+
+DEFAULT_KEYWORD_MATCHER = build_keyword_matcher(DEFAULT_SKILLS)
+
+
+def scan_text(text, lower, matcher):
+    """
+    Single pass over a CV producing every field the built-in extractors need.
+
+    The lowercased text is tokenized once by FUSED_TOKEN_PATTERN. Everything
+    else works on the token list with C-level set/list operations, so the
+    Python-level work grows with the vocabulary of the CV rather than with
+    its length: keywords (skills and education) are looked up by
+    intersecting the vocabulary with the trie, and the few non-word tokens
+    are the email, phone and year-range candidates.
+
+    Returns:
+        Dict with tokens, keyword_indices, email, phone and year_ranges
+        (list of (start_year, end_year or None for present/current))
+    """
+    tokens = FUSED_TOKEN_PATTERN.findall(lower)
+    vocabulary = set(tokens)
+    trie = matcher.trie
+    end = matcher.END
+
+    keyword_indices = set()
+    for token in trie.keys() & vocabulary:
+        node = trie[token]
+        if end in node:
+            keyword_indices.update(node[end])
+        # Multi-token keywords: walk the trie from every occurrence, but only
+        # if one of the possible next tokens occurs in the CV at all
+        if not any(child in vocabulary for child in node if child is not end):
+            continue
+        position = -1
+        while True:
+            try:
+                position = tokens.index(token, position + 1)
+            except ValueError:
+                break
+            child = node
+            for next_token in tokens[position + 1:position + 1 + matcher.max_tokens]:
+                child = child.get(next_token)
+                if child is None:
+                    break
+                if end in child:
+                    keyword_indices.update(child[end])
+
+    # Emails, phones and year ranges are the only long tokens that are not
+    # plain words (a phone may also be a bare run of digits)
+    emails = []
+    phones = []
+    year_ranges = []
+    for token in vocabulary:
+        if len(token) <= 5 or (token.isalnum() and not token.isdigit()):
+            continue
+        if '@' in token:
+            emails.append(token)
+            continue
+        match = EXPERIENCE_PATTERN.fullmatch(token)
+        if match:
+            end_year = match.group('end')
+            year_range = (int(match.group('start')), int(end_year) if end_year else None)
+            year_ranges.extend([year_range] * tokens.count(token))
+        elif PHONE_PATTERN.fullmatch(token):
+            phones.append(token)
+
+    # The first email/phone in reading order wins
+    email = min(emails, key=tokens.index) if emails else None
+    phone = min(phones, key=tokens.index).strip() if phones else None
+
+    # Report the email with its original casing when offsets line up
+    if email is not None and len(lower) == len(text):
+        offset = lower.find(email)
+        email = text[offset:offset + len(email)]
+
+    return {
+        'tokens': tokens,
+        'keyword_indices': keyword_indices,
+        'email': email,
+        'phone': phone,
+        'year_ranges': year_ranges
+    }
+
+
+class SectionTracker:
+    """
+    Stop condition for streaming PDF extraction.
+
+    Fed one page at a time; returns True once a contact detail (email or
+    phone) and a skills section have both been seen.
+    """
+
+    def __init__(self):
+        self.has_contact = False
+        self.has_skills = False
+
+    def __call__(self, page_text):
+        if not self.has_contact:
+            self.has_contact = bool(EMAIL_PATTERN.search(page_text) or PHONE_PATTERN.search(page_text))
+        if not self.has_skills:
+            self.has_skills = bool(SKILLS_HEADING_PATTERN.search(page_text))
+        return self.has_contact and self.has_skills
+
+
+class ParseContext:
+    """
+    Text of a CV plus derived views shared by all extractors.
+
+    The text is lowercased once and scanned once (see scan_text); the
+    built-in extractors only read the scan results. Views are computed on
+    first access, so custom extractors pay only for what they use.
+    """
+
+    def __init__(self, text, matcher=None):
+        self.text = text
+        self.matcher = matcher or DEFAULT_KEYWORD_MATCHER
+        self._lower = None
+        self._lines = None
+        self._scan = None
+
+    @property
+    def lower(self):
+        if self._lower is None:
+            self._lower = self.text.lower()
+        return self._lower
+
+    @property
+    def lines(self):
+        if self._lines is None:
+            self._lines = self.text.strip().split('\n')
+        return self._lines
+
+    @property
+    def scan(self):
+        if self._scan is None:
+            self._scan = scan_text(self.text, self.lower, self.matcher)
+        return self._scan
+
+    @property
+    def tokens(self):
+        return self.scan['tokens']
+
+
+# Registry of field name -> extractor(parser, context)
+EXTRACTORS = {}
+
+
+def register_extractor(field):
+    """
+    Decorator registering a field extractor for every CVParser.
+
+    The extractor is called as ``extractor(parser, context)`` with a
+    ParseContext and its return value is stored under ``field``.
+    """
+    def decorator(extractor):
+        EXTRACTORS[field] = extractor
+        return extractor
+    return decorator
+
+
+@register_extractor('name')
+def extract_name(parser, context):
+    """Extract candidate name (simple heuristic: first line or first capitalized words)."""
+    # Only the first 5 lines are looked at, so don't split the whole text
+    for line in context.text.lstrip().split('\n', 5)[:5]:
+        clean_line = line.strip()
+        if clean_line and len(clean_line.split()) <= 4:
+            # Likely a name if it's short and capitalized
+            if clean_line[0].isupper():
+                return clean_line
+    return "Unknown Candidate"
+
+
+@register_extractor('email')
+def extract_email(parser, context):
+    """Extract email address."""
+    return context.scan['email']
+
+
+@register_extractor('phone')
+def extract_phone(parser, context):
+    """Extract phone number."""
+    return context.scan['phone']
+
+
+@register_extractor('skills')
+def extract_skills(parser, context):
+    """Extract skills by matching against keyword list (whole words only)."""
+    skill_count = len(parser.skills_keywords)
+    indices = sorted(i for i in context.scan['keyword_indices'] if i < skill_count)
+    return [parser.skills_keywords[index].title() for index in indices]
+
+
+@register_extractor('experience_years')
+def extract_experience_years(parser, context):
+    """Estimate years of experience based on year ranges like "2018-2023" or "2018 - present"."""
+    year_ranges = context.scan['year_ranges']
+
+    if not year_ranges:
+        return 0
+
+    # Calculate total years (simplified)
+    current_year = datetime.now().year
+    total_years = 0
+
+    for start, end in year_ranges:
+        total_years += max(0, (end or current_year) - start)
+
+    return min(total_years, 40)  # Cap at 40 years
+
+
+@register_extractor('education')
+def extract_education(parser, context):
+    """Extract highest education level."""
+    skill_count = len(parser.skills_keywords)
+    education_indices = [i - skill_count for i in context.scan['keyword_indices'] if i >= skill_count]
+
+    if not education_indices:
+        return 'Not specified'
+
+    return EDUCATION_LEVELS[min(education_indices)][1]
+
 
 class CVParser:
     """
     Utility class to parse CV files (PDF, DOC, DOCX) and extract relevant information.
+
+    Fields are produced by the extractors in the module-level registry (see
+    register_extractor); extra extractors can be passed per instance.
     """
-    
-    def __init__(self):
-        self.skills_keywords = [
-            'python', 'java', 'javascript', 'react', 'node.js', 'aws', 'docker',
-            'kubernetes', 'sql', 'mongodb', 'machine learning', 'ai', 'git',
-            'agile', 'scrum', 'html', 'css', 'typescript', 'go', 'rust',
-            'cloud', 'devops', 'ci/cd', 'terraform', 'ansible'
-        ]
-    
+
+    def __init__(self, skills_keywords=None, extractors=None, pdf_limits=None):
+        """
+        Args:
+            skills_keywords: Custom skill taxonomy (defaults to DEFAULT_SKILLS)
+            extractors: Optional dict of field -> extractor(parser, context)
+                added to (or overriding) the registered ones
+            pdf_limits: Optional keyword arguments for
+                pdf_extractor.iter_pdf_pages (max_pages, max_chars,
+                time_budget, min_pages)
+        """
+        if skills_keywords is None:
+            self.skills_keywords = DEFAULT_SKILLS
+            self.keyword_matcher = DEFAULT_KEYWORD_MATCHER
+        else:
+            self.skills_keywords = list(skills_keywords)
+            self.keyword_matcher = build_keyword_matcher(self.skills_keywords)
+
+        self.extractors = dict(EXTRACTORS)
+        self.extractors.update(extractors or {})
+        self.pdf_limits = dict(pdf_limits or {})
+
     def parse(self, file_content, filename):
         """
         Parse CV file and extract structured information.
-        
+
         Args:
-            file_content: Binary content of the CV file
+            file_content: Binary content of the CV file, as bytes or a
+                seekable binary file object (read in place, not copied)
             filename: Name of the file
-            
+
         Returns:
             Dictionary with parsed CV data
         """
-        # Determine file type and extract text
-        if filename.lower().endswith('.pdf'):
-            text = self._parse_pdf(file_content)
-        elif filename.lower().endswith('.docx'):
-            text = self._parse_docx(file_content)
-        elif filename.lower().endswith('.doc'):
-            # For .doc files, use simplified extraction (requires additional libraries)
-            text = self._parse_text_fallback(file_content)
+        # Determine file type and extract text with its backend (if any)
+        extension = filename[filename.rfind('.'):].lower() if '.' in filename else ''
+        if extension in PARSER_BACKENDS:
+            text = self._parse_with_backend(extension, file_content)
         else:
-            text = str(file_content, 'utf-8', errors='ignore')
-        
+            # Plain text, and formats without a backend
+            text = self._parse_text_fallback(file_content)
+
         # Extract structured information
-        return {
-            'name': self._extract_name(text),
-            'email': self._extract_email(text),
-            'phone': self._extract_phone(text),
-            'skills': self._extract_skills(text),
-            'experience_years': self._extract_experience_years(text),
-            'education': self._extract_education(text),
-            'raw_text': text
-        }
-    
-    def _parse_pdf(self, content):
-        """Extract text from PDF file."""
-        try:
-            pdf_file = BytesIO(content)
-            pdf_reader = PyPDF2.PdfReader(pdf_file)
-            text = ''
-            for page in pdf_reader.pages:
-                text += page.extract_text()
-            return text
-        except Exception as e:
-            print(f"Error parsing PDF: {str(e)}")
-            return ""
-    
-    def _parse_docx(self, content):
-        """Extract text from DOCX file."""
+        return self.extract(text)
+
+    def extract(self, text):
+        """Run every registered extractor over already extracted text."""
+        context = ParseContext(text, self.keyword_matcher)
+        cv_data = {field: extractor(self, context) for field, extractor in self.extractors.items()}
+        cv_data['raw_text'] = text
+        return cv_data
+
+    def _parse_with_backend(self, extension, content):
+        """Extract text with the backend registered for the extension."""
         try:
-            doc_file = BytesIO(content)
-            doc = docx.Document(doc_file)
-            text = '\n'.join([paragraph.text for paragraph in doc.paragraphs])
-            return text
+            backend = load_backend(extension)
+            return backend(content, **self._backend_options(extension))
         except Exception as e:
-            print(f"Error parsing DOCX: {str(e)}")
+            print(f"Error parsing {extension[1:].upper()}: {str(e)}")
             return ""
-    
+
+    def _backend_options(self, extension):
+        """Keyword arguments passed to a backend."""
+        if extension == '.pdf':
+            # PDFs are read page by page within the configured limits
+            return dict(self.pdf_limits, stop_when=SectionTracker())
+        return {}
+
     def _parse_text_fallback(self, content):
         """Fallback text extraction."""
         try:
+            if hasattr(content, 'read'):
+                content = content.read()
             return str(content, 'utf-8', errors='ignore')
         except:
             return ""
-    
+
+    # Single-field helpers, kept for callers that only need one value
+
     def _extract_name(self, text):
-        """Extract candidate name (simple heuristic: first line or first capitalized words)."""
-        lines = text.strip().split('\n')
-        for line in lines[:5]:  # Check first 5 lines
-            clean_line = line.strip()
-            if clean_line and len(clean_line.split()) <= 4:
-                # Likely a name if it's short and capitalized
-                if clean_line[0].isupper():
-                    return clean_line
-        return "Unknown Candidate"
-    
+        return extract_name(self, ParseContext(text, self.keyword_matcher))
+
     def _extract_email(self, text):
-        """Extract email address using regex."""
-        pattern = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
-        match = re.search(pattern, text)
-        return match.group(0) if match else None
-    
+        return extract_email(self, ParseContext(text, self.keyword_matcher))
+
     def _extract_phone(self, text):
-        """Extract phone number using regex."""
-        pattern = r'[\+\(]?[1-9][0-9 .\-\(\)]{8,}[0-9]'
-        match = re.search(pattern, text)
-        return match.group(0).strip() if match else None
-    
+        return extract_phone(self, ParseContext(text, self.keyword_matcher))
+
     def _extract_skills(self, text):
-        """Extract skills by matching against keyword list."""
-        text_lower = text.lower()
-        found_skills = []
-        
-        for skill in self.skills_keywords:
-            if skill.lower() in text_lower:
-                found_skills.append(skill.title())
-        
-        return found_skills
-    
+        return extract_skills(self, ParseContext(text, self.keyword_matcher))
+
     def _extract_experience_years(self, text):
-        """Estimate years of experience based on date patterns."""
-        # Look for year ranges like "2018-2023" or "2018 - present"
-        pattern = r'(19|20)\d{2}\s*[-–]\s*(present|current|(19|20)\d{2})'
-        matches = re.findall(pattern, text.lower())
-        
-        if not matches:
-            return 0
-        
-        # Calculate total years (simplified)
-        current_year = 2026
-        total_years = 0
-        
-        for match in matches:
-            start = int(match[0] + match[1])
-            if 'present' in match[2] or 'current' in match[2]:
-                end = current_year
-            else:
-                end = int(match[2][-4:])
-            total_years += max(0, end - start)
-        
-        return min(total_years, 40)  # Cap at 40 years
-    
+        return extract_experience_years(self, ParseContext(text, self.keyword_matcher))
+
     def _extract_education(self, text):
-        """Extract highest education level."""
-        text_lower = text.lower()
-        
-        education_levels = [
-            ('phd', 'PhD'),
-            ('doctorate', 'PhD'),
-            ('master', "Master's Degree"),
-            ('msc', "Master's Degree"),
-            ('mba', 'MBA'),
-            ('bachelor', "Bachelor's Degree"),
-            ('bsc', "Bachelor's Degree"),
-            ('diploma', 'Diploma')
-        ]
-        
-        for keyword, level in education_levels:
-            if keyword in text_lower:
-                return level
-        
-        return 'Not specified'
+        return extract_education(self, ParseContext(text, self.keyword_matcher))
@@ -0,0 +1,152 @@
+import os
+import re
+import zipfile
+from io import BytesIO
+from xml.etree.ElementTree import iterparse
+
+# Per-document limits, as for PDFs and .doc files
+DOCX_MAX_CHARS = int(os.environ.get('DOCX_MAX_CHARS', '200000'))
+DOCX_MAX_XML_BYTES = int(os.environ.get('DOCX_MAX_XML_BYTES', str(50 * 1024 * 1024)))
+# XML parts compressed more than this are treated as zip bombs
+MAX_COMPRESSION_RATIO = 100
+
+DOCUMENT_PART = 'word/document.xml'
+HEADER_PART = re.compile(r'^word/header(\d*)\.xml$')
+FOOTER_PART = re.compile(r'^word/footer(\d*)\.xml$')
+
+# Transitional and Strict OOXML use different namespaces for the same elements
+WORD_NAMESPACES = (
+    'http://schemas.openxmlformats.org/wordprocessingml/2006/main',
+    'http://purl.oclc.org/ooxml/wordprocessingml/main',
+)
+# Text boxes are written twice (DrawingML choice and VML fallback): skip the fallback
+FALLBACK = '{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback'
+
+
+def _tags(*names):
+    return {f'{{{namespace}}}{name}' for namespace in WORD_NAMESPACES for name in names}
+
+
+PARAGRAPH = _tags('p')
+TEXT = _tags('t')
+TAB = _tags('tab')
+BREAK = _tags('br', 'cr')
+HYPHEN = _tags('noBreakHyphen')
+# w:tab also defines tab stops inside paragraph properties (<w:tabs>)
+TAB_STOPS = _tags('tabs')
+
+
+def iter_paragraphs(xml_stream):
+    """
+    Yield the text of every paragraph of a WordprocessingML part, in order.
+
+    The part is parsed incrementally and every element is detached from its
+    parent once its end tag is handled, so only the currently open elements
+    are kept in memory. Paragraphs inside table cells and text boxes are
+    included; a paragraph nested in another (a text box anchored in a
+    paragraph) is yielded before its container.
+
+    Args:
+        xml_stream: Binary file object with the XML part
+    """
+    # Open elements, innermost last (their parents, for detaching)
+    open_elements = []
+    # Text of the open paragraphs, innermost last
+    paragraphs = []
+    fallback_depth = 0
+    tab_stops_depth = 0
+
+    for event, element in iterparse(xml_stream, events=('start', 'end')):
+        tag = element.tag
+        if event == 'start':
+            open_elements.append(element)
+            if tag == FALLBACK:
+                fallback_depth += 1
+            elif fallback_depth:
+                # The fallback copy's paragraphs are neither opened nor read
+                pass
+            elif tag in PARAGRAPH:
+                paragraphs.append([])
+            elif tag in TAB_STOPS:
+                tab_stops_depth += 1
+            continue
+
+        open_elements.pop()
+        if tag == FALLBACK:
+            fallback_depth -= 1
+        elif fallback_depth or not paragraphs:
+            pass
+        elif tag in TEXT:
+            paragraphs[-1].append(element.text or '')
+        elif tag in TAB:
+            if not tab_stops_depth:
+                paragraphs[-1].append('\t')
+        elif tag in TAB_STOPS:
+            tab_stops_depth -= 1
+        elif tag in BREAK:
+            paragraphs[-1].append('\n')
+        elif tag in HYPHEN:
+            paragraphs[-1].append('-')
+        elif tag in PARAGRAPH:
+            yield ''.join(paragraphs.pop())
+
+        # The element just ended is the last child of its parent
+        if open_elements:
+            del open_elements[-1][-1]
+
+
+def _part_order(archive):
+    """Headers, then the document body, then footers (in numeric order)."""
+    names = archive.namelist()
+    if DOCUMENT_PART not in names:
+        raise ValueError('Not a DOCX file: word/document.xml is missing')
+
+    def numbered(pattern):
+        matches = [pattern.match(name) for name in names]
+        return [match.group(0) for match in sorted(
+            (match for match in matches if match), key=lambda match: int(match.group(1) or 0)
+        )]
+
+    return numbered(HEADER_PART) + [DOCUMENT_PART] + numbered(FOOTER_PART)
+
+
+def extract_text(content, max_chars=None):
+    """
+    Extract the text of a DOCX file: headers, body (tables and text boxes
+    included) and footers, one paragraph per line.
+
+    ``word/document.xml`` and the header/footer parts are streamed out of
+    the zip and parsed with iterparse, without building python-docx's
+    object model.
+
+    Args:
+        content: DOCX file as bytes or a seekable binary file object
+        max_chars: Maximum number of characters returned (DOCX_MAX_CHARS by default)
+
+    Returns:
+        Paragraphs joined by newlines
+
+    Raises:
+        ValueError: If the file is not a DOCX or a part looks like a zip bomb
+    """
+    max_chars = DOCX_MAX_CHARS if max_chars is None else max_chars
+    stream = BytesIO(content) if isinstance(content, (bytes, bytearray)) else content
+
+    lines = []
+    total = 0
+    with zipfile.ZipFile(stream) as archive:
+        for name in _part_order(archive):
+            info = archive.getinfo(name)
+            if info.file_size > DOCX_MAX_XML_BYTES:
+                raise ValueError(f'{name} too large: {info.file_size} bytes')
+            if info.compress_size and info.file_size / info.compress_size > MAX_COMPRESSION_RATIO:
+                raise ValueError(f'{name}: suspicious compression ratio')
+
+            with archive.open(info) as part:
+                for paragraph in iter_paragraphs(part):
+                    lines.append(paragraph)
+                    total += len(paragraph) + 1
+                    if total >= max_chars:
+                        return '\n'.join(lines)[:max_chars]
+
+    return '\n'.join(lines)
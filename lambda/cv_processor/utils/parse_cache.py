@@ -0,0 +1,103 @@
+import hashlib
+import time
+from decimal import Decimal
+from .batch_writer import BatchWriter
+from .cv_parser import PARSER_VERSION
+
+
+class ParseCache:
+    """
+    Content-addressed cache of parsed CVs backed by a DynamoDB table.
+
+    Entries are keyed on the SHA-256 of the file bytes, so the same CV
+    uploaded for several positions (or redelivered by SQS) is parsed once
+    and only re-ranked afterwards. ``raw_text`` is never stored. Each
+    entry records the parser version that produced it; entries from another
+    version are treated as misses and overwritten on the next store.
+    """
+
+    # BatchGetItem accepts at most 100 keys per call
+    MAX_BATCH_GET = 100
+
+    CACHED_FIELDS = ('name', 'email', 'phone', 'skills', 'experience_years', 'education')
+
+    def __init__(self, client, table_name, ttl_days=30, max_attempts=3, parser_version=PARSER_VERSION):
+        """
+        Args:
+            client: DynamoDB client (``dynamodb.meta.client`` of the boto3 resource)
+            table_name: Cache table, keyed on ``content_hash``
+            ttl_days: Lifetime of an entry, enforced by DynamoDB TTL on ``expires_at``
+            max_attempts: Attempts for UnprocessedKeys on lookups
+            parser_version: Version of the parser output stored and accepted
+        """
+        self.client = client
+        self.table_name = table_name
+        self.ttl_days = ttl_days
+        self.max_attempts = max_attempts
+        self.parser_version = parser_version
+
+    @staticmethod
+    def content_hash(content):
+        """Return the hex SHA-256 digest of the CV bytes."""
+        return hashlib.sha256(content).hexdigest()
+
+    def get_many(self, content_hashes):
+        """
+        Look up several hashes at once.
+
+        Returns:
+            Dict of content_hash -> cv_data for the hashes found in the cache
+            with the current parser version
+        """
+        found = {}
+        unique_hashes = list(dict.fromkeys(content_hashes))
+
+        for start in range(0, len(unique_hashes), self.MAX_BATCH_GET):
+            keys = [{'content_hash': h} for h in unique_hashes[start:start + self.MAX_BATCH_GET]]
+            for attempt in range(self.max_attempts):
+                response = self.client.batch_get_item(
+                    RequestItems={self.table_name: {'Keys': keys}}
+                )
+                for entry in response.get('Responses', {}).get(self.table_name, []):
+                    if entry.get('parser_version') != self.parser_version:
+                        continue
+                    found[entry['content_hash']] = self._decode(entry['cv_data'])
+                keys = response.get('UnprocessedKeys', {}).get(self.table_name, {}).get('Keys', [])
+                if not keys:
+                    break
+        return found
+
+    def put_many(self, entries):
+        """
+        Store parsed CVs.
+
+        Args:
+            entries: Dict of content_hash -> cv_data
+
+        Returns:
+            Dict of content_hash -> error for entries that could not be stored
+        """
+        writer = BatchWriter(self.client, self.table_name, key_attribute='content_hash')
+        expires_at = int(time.time()) + self.ttl_days * 24 * 3600
+        for content_hash, cv_data in entries.items():
+            writer.put({
+                'content_hash': content_hash,
+                'cv_data': self._encode(cv_data),
+                'parser_version': self.parser_version,
+                'expires_at': expires_at
+            }, owner=content_hash)
+        return writer.flush()
+
+    def _encode(self, cv_data):
+        """Keep only the cacheable fields, converting numbers for DynamoDB."""
+        encoded = {field: cv_data.get(field) for field in self.CACHED_FIELDS}
+        encoded['experience_years'] = Decimal(str(encoded['experience_years'] or 0))
+        return encoded
+
+    def _decode(self, cached):
+        """Restore native Python numbers on a cached entry."""
+        cv_data = dict(cached)
+        years = cv_data.get('experience_years', 0)
+        cv_data['experience_years'] = int(years) if years == int(years) else float(years)
+        cv_data['skills'] = list(cv_data.get('skills') or [])
+        return cv_data
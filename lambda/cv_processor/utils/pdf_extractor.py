@@ -0,0 +1,151 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from io import BytesIO
+import PyPDF2
+
+# Per-document limits, so a 200-page portfolio costs about what a normal CV does
+PDF_MAX_PAGES = int(os.environ.get('PDF_MAX_PAGES', '30'))
+PDF_MAX_CHARS = int(os.environ.get('PDF_MAX_CHARS', '200000'))
+PDF_TIME_BUDGET = float(os.environ.get('PDF_TIME_BUDGET', '20'))
+# Early termination is only considered after this many pages
+PDF_MIN_PAGES = int(os.environ.get('PDF_MIN_PAGES', '3'))
+
+# Optional multi-process page extraction (0 or 1 = serial). Only worth it
+# when the function has more than one vCPU (1769 MB+ on Lambda).
+PDF_PARALLEL_WORKERS = int(os.environ.get('PDF_PARALLEL_WORKERS', '0'))
+# Shorter documents stay serial so pool start-up doesn't eat the gain
+PDF_PARALLEL_MIN_PAGES = int(os.environ.get('PDF_PARALLEL_MIN_PAGES', '12'))
+
+# PDF bytes of the document being extracted, set once per worker process
+_worker_content = None
+
+
+def _init_worker(content):
+    """Process pool initializer: receive the PDF bytes once per worker."""
+    global _worker_content
+    _worker_content = content
+
+
+def _extract_page_range(start, stop):
+    """Extract pages [start, stop) of the worker's PDF (runs in a worker process)."""
+    reader = PyPDF2.PdfReader(BytesIO(_worker_content))
+    return [reader.pages[index].extract_text() or '' for index in range(start, stop)]
+
+
+def _serial_pages(reader, page_count, deadline):
+    """Yield page texts one by one in the current process."""
+    for index in range(page_count):
+        if time.monotonic() > deadline:
+            return
+        yield reader.pages[index].extract_text() or ''
+
+
+def _parallel_pages(content, page_count, workers, deadline):
+    """
+    Start extracting pages in a process pool and return a generator of page
+    texts in page order.
+
+    Pages are split into contiguous chunks (two per worker) so results can
+    be reassembled in order as soon as the leading chunks complete. Raises
+    OSError/ImportError right away where process pools are unsupported.
+    """
+    chunk_size = max(1, -(-page_count // (workers * 2)))
+    executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(content,))
+    futures = [
+        executor.submit(_extract_page_range, start, min(start + chunk_size, page_count))
+        for start in range(0, page_count, chunk_size)
+    ]
+    return _collect_pages(executor, futures, deadline)
+
+
+def _collect_pages(executor, futures, deadline):
+    """Yield chunk results in order; pending chunks are cancelled on early stop."""
+    try:
+        for future in futures:
+            try:
+                texts = future.result(timeout=max(0, deadline - time.monotonic()))
+            except FutureTimeoutError:
+                return
+            yield from texts
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def iter_pdf_pages(content, max_pages=None, max_chars=None, time_budget=None,
+                   min_pages=None, stop_when=None, workers=None):
+    """
+    Yield the text of a PDF one page at a time.
+
+    Extraction stops at whichever limit is hit first: page count, total
+    extracted characters, wall-clock budget, or ``stop_when`` returning True
+    once at least ``min_pages`` pages have been read.
+
+    Args:
+        content: PDF file content as bytes or a seekable binary file object
+        max_pages: Maximum number of pages to read
+        max_chars: Maximum number of characters to yield in total
+        time_budget: Seconds allowed for the whole document
+        min_pages: Pages always read before ``stop_when`` is honoured
+        stop_when: Optional callable(page_text) -> bool, called for every page
+        workers: Worker processes for documents of at least
+            PDF_PARALLEL_MIN_PAGES pages (0 or 1 keeps extraction serial)
+
+    Yields:
+        Text of each page read (truncated on the last page if max_chars is hit)
+    """
+    max_pages = PDF_MAX_PAGES if max_pages is None else max_pages
+    max_chars = PDF_MAX_CHARS if max_chars is None else max_chars
+    time_budget = PDF_TIME_BUDGET if time_budget is None else time_budget
+    min_pages = PDF_MIN_PAGES if min_pages is None else min_pages
+    workers = PDF_PARALLEL_WORKERS if workers is None else workers
+
+    deadline = time.monotonic() + time_budget
+    stream = BytesIO(content) if isinstance(content, (bytes, bytearray)) else content
+    reader = PyPDF2.PdfReader(stream)
+    total_pages = len(reader.pages)
+    page_count = min(total_pages, max_pages)
+
+    pages = None
+    if workers > 1 and page_count >= PDF_PARALLEL_MIN_PAGES:
+        try:
+            if stream is content:
+                # Worker processes need the raw bytes
+                stream.seek(0)
+                content = stream.read()
+            pages = _parallel_pages(content, page_count, workers, deadline)
+        except (OSError, ImportError, NotImplementedError) as e:
+            # e.g. no /dev/shm for the pool's semaphores on AWS Lambda
+            print(f"Parallel PDF extraction unavailable, using serial: {str(e)}")
+            pages = None
+    if pages is None:
+        pages = _serial_pages(reader, page_count, deadline)
+
+    total_chars = 0
+    read_pages = 0
+    try:
+        for text in pages:
+            if total_chars + len(text) > max_chars:
+                yield text[:max_chars - total_chars]
+                print(f"PDF truncated at {max_chars} characters")
+                return
+            total_chars += len(text)
+            read_pages += 1
+            yield text
+
+            should_stop = stop_when(text) if stop_when else False
+            if should_stop and read_pages >= min_pages:
+                return
+    finally:
+        # Cancels outstanding chunks when extraction stops early
+        pages.close()
+
+    if read_pages < page_count:
+        print(f"PDF time budget of {time_budget}s exhausted after {read_pages} pages")
+    elif page_count < total_pages:
+        print(f"PDF truncated at {max_pages} pages")
+
+
+def extract_text(content, **limits):
+    """Extract the text of a PDF, joining pages with newlines."""
+    return '\n'.join(iter_pdf_pages(content, **limits))
@@ -1,37 +1,58 @@
+import copy
+
+# Built-in job profiles, used when no requirements store is configured and
+# as the fallback until the store's first successful load
+DEFAULT_JOB_REQUIREMENTS = {
+    'Software Engineer': {
+        'skills': ['python', 'java', 'javascript', 'git', 'sql'],
+        'min_experience': 2,
+        'education_weight': 0.2
+    },
+    'Cloud Engineer': {
+        'skills': ['aws', 'docker', 'kubernetes', 'terraform', 'devops'],
+        'min_experience': 3,
+        'education_weight': 0.15
+    },
+    'Data Scientist': {
+        'skills': ['python', 'machine learning', 'sql', 'ai'],
+        'min_experience': 2,
+        'education_weight': 0.25
+    },
+    'DevOps Engineer': {
+        'skills': ['docker', 'kubernetes', 'ci/cd', 'aws', 'git'],
+        'min_experience': 3,
+        'education_weight': 0.15
+    },
+    'General': {
+        'skills': ['python', 'java', 'javascript'],
+        'min_experience': 1,
+        'education_weight': 0.2
+    }
+}
+
+
 class RankingEngine:
     """
     Engine to calculate candidate ranking scores based on job requirements.
     """
     
-    def __init__(self):
-        # Job-specific required skills
-        self.job_requirements = {
-            'Software Engineer': {
-                'skills': ['python', 'java', 'javascript', 'git', 'sql'],
-                'min_experience': 2,
-                'education_weight': 0.2
-            },
-            'Cloud Engineer': {
-                'skills': ['aws', 'docker', 'kubernetes', 'terraform', 'devops'],
-                'min_experience': 3,
-                'education_weight': 0.15
-            },
-            'Data Scientist': {
-                'skills': ['python', 'machine learning', 'sql', 'ai'],
-                'min_experience': 2,
-                'education_weight': 0.25
-            },
-            'DevOps Engineer': {
-                'skills': ['docker', 'kubernetes', 'ci/cd', 'aws', 'git'],
-                'min_experience': 3,
-                'education_weight': 0.15
-            },
-            'General': {
-                'skills': ['python', 'java', 'javascript'],
-                'min_experience': 1,
-                'education_weight': 0.2
-            }
-        }
+    def __init__(self, job_requirements=None, store=None):
+        """
+        Args:
+            job_requirements: Optional dict of job position -> requirements
+                (defaults to a copy of DEFAULT_JOB_REQUIREMENTS)
+            store: Optional RequirementsStore; when given, requirements are
+                read from it on every call and job_requirements is ignored
+        """
+        self.store = store
+        self._job_requirements = copy.deepcopy(job_requirements or DEFAULT_JOB_REQUIREMENTS)
+    
+    @property
+    def job_requirements(self):
+        """Current dict of job position -> requirements."""
+        if self.store is not None:
+            return self.store.get()
+        return self._job_requirements
     
     def calculate_score(self, cv_data, job_position='General'):
         """
@@ -44,45 +65,92 @@ class RankingEngine:
         Returns:
             Tuple of (score, skills_matched_string)
         """
-        # Get job requirements
-        requirements = self.job_requirements.get(job_position, self.job_requirements['General'])
-        
-        # 1. Skills matching (50% weight)
-        skills_score = self._calculate_skills_score(cv_data['skills'], requirements['skills'])
+        return self.calculate_scores([cv_data], [job_position])[0][0]
+    
+    def calculate_scores(self, candidates, positions=None):
+        """
+        Score N candidates against M positions in one pass.
         
-        # 2. Experience score (30% weight)
-        experience_score = self._calculate_experience_score(
-            cv_data['experience_years'],
-            requirements['min_experience']
-        )
+        Required skills are encoded as bit positions, so each candidate's
+        skills become one integer bitset and skill matching against every
+        position is a single AND plus popcount. Skills are compared
+        case-insensitively and counted once: skills_matched is the number of
+        distinct required skills the candidate has over the number of
+        distinct required skills.
         
-        # 3. Education score (20% weight - configurable per job)
-        education_score = self._calculate_education_score(cv_data['education'])
-        education_weight = requirements['education_weight']
+        Args:
+            candidates: List of parsed CV data dictionaries
+            positions: List of job positions (defaults to every configured one);
+                unknown positions fall back to 'General'
+            
+        Returns:
+            Matrix (list of rows, one per candidate) of (score, skills_matched_string)
+            tuples, one column per position
+        """
+        # Read once so a concurrent store refresh can't mix two versions
+        job_requirements = self.job_requirements
+        if positions is None:
+            positions = list(job_requirements)
         
-        # Calculate weighted total
-        total_score = (
-            skills_score * 0.5 +
-            experience_score * (0.5 - education_weight) +
-            education_score * education_weight
-        ) * 100
+        # Encode every required skill as a bit
+        skill_bits = {}
+        compiled = []
+        for position in positions:
+            requirements = job_requirements.get(position, job_requirements['General'])
+            mask = 0
+            for skill in requirements['skills']:
+                mask |= skill_bits.setdefault(skill.lower(), 1 << len(skill_bits))
+            compiled.append((
+                mask,
+                mask.bit_count(),
+                requirements['min_experience'],
+                requirements['education_weight']
+            ))
         
-        # Generate skills matched string
-        matched_skills = [s for s in cv_data['skills'] if s.lower() in [r.lower() for r in requirements['skills']]]
-        skills_matched = f"{len(matched_skills)}/{len(requirements['skills'])}"
+        scores = []
+        for cv_data in candidates:
+            candidate_mask = 0
+            for skill in cv_data['skills']:
+                candidate_mask |= skill_bits.get(skill.lower(), 0)
+            education_score = self._calculate_education_score(cv_data['education'])
+            experience_scores = {}
+            
+            row = []
+            for mask, required_count, min_experience, education_weight in compiled:
+                matched = (candidate_mask & mask).bit_count()
+                
+                # 1. Skills matching (50% weight)
+                skills_score = matched / required_count if required_count else 1.0
+                
+                # 2. Experience score (30% weight)
+                if min_experience not in experience_scores:
+                    experience_scores[min_experience] = self._calculate_experience_score(
+                        cv_data['experience_years'],
+                        min_experience
+                    )
+                experience_score = experience_scores[min_experience]
+                
+                # 3. Education score (20% weight - configurable per job)
+                total_score = (
+                    skills_score * 0.5 +
+                    experience_score * (0.5 - education_weight) +
+                    education_score * education_weight
+                ) * 100
+                
+                row.append((round(total_score, 2), f"{matched}/{required_count}"))
+            scores.append(row)
         
-        return round(total_score, 2), skills_matched
+        return scores
     
     def _calculate_skills_score(self, candidate_skills, required_skills):
         """Calculate skills matching score (0-1)."""
         if not required_skills:
             return 1.0
         
-        candidate_skills_lower = [s.lower() for s in candidate_skills]
-        required_skills_lower = [s.lower() for s in required_skills]
+        candidate_skills_lower = {s.lower() for s in candidate_skills}
+        required_skills_lower = {s.lower() for s in required_skills}
         
-        matched = sum(1 for skill in required_skills_lower if skill in candidate_skills_lower)
-        return matched / len(required_skills)
+        return len(required_skills_lower & candidate_skills_lower) / len(required_skills_lower)
     
     def _calculate_experience_score(self, years, min_required):
         """Calculate experience score (0-1)."""
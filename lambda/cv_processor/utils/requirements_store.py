@@ -0,0 +1,197 @@
+import json
+import os
+import threading
+import time
+from botocore.exceptions import ClientError
+
+# Where job requirements are loaded from (a table wins over an S3 document)
+JOB_REQUIREMENTS_TABLE = os.environ.get('JOB_REQUIREMENTS_TABLE')
+JOB_REQUIREMENTS_S3_BUCKET = os.environ.get('JOB_REQUIREMENTS_S3_BUCKET')
+JOB_REQUIREMENTS_S3_KEY = os.environ.get('JOB_REQUIREMENTS_S3_KEY')
+JOB_REQUIREMENTS_TTL = int(os.environ.get('JOB_REQUIREMENTS_TTL', '300'))
+
+
+def _number(value):
+    """Convert a JSON/DynamoDB number to int when integral, else float."""
+    value = float(value)
+    return int(value) if value.is_integer() else value
+
+
+class S3RequirementsSource:
+    """
+    Job requirements stored as one JSON document in S3.
+
+    The document maps each job position to its requirements::
+
+        {"Cloud Engineer": {"skills": ["aws", "docker"],
+                            "min_experience": 3, "education_weight": 0.15}}
+
+    The last ETag is sent as ``IfNoneMatch``, so revalidating an unchanged
+    document costs a 304 without a body.
+    """
+
+    def __init__(self, client, bucket, key):
+        """
+        Args:
+            client: S3 client
+            bucket: Bucket holding the document
+            key: Object key of the document
+        """
+        self.client = client
+        self.bucket = bucket
+        self.key = key
+        self.etag = None
+
+    def load(self):
+        """
+        Fetch the document if it changed since the last load.
+
+        Returns:
+            Dict of job position -> requirements, or None if not modified
+        """
+        kwargs = {'Bucket': self.bucket, 'Key': self.key}
+        if self.etag:
+            kwargs['IfNoneMatch'] = self.etag
+        try:
+            response = self.client.get_object(**kwargs)
+        except ClientError as e:
+            status = e.response.get('ResponseMetadata', {}).get('HTTPStatusCode')
+            if status == 304 or e.response.get('Error', {}).get('Code') in ('304', 'NotModified'):
+                return None
+            raise
+
+        requirements = json.loads(response['Body'].read())
+        self.etag = response.get('ETag')
+        return requirements
+
+
+class DynamoDBRequirementsSource:
+    """
+    Job requirements stored one item per position in a DynamoDB table.
+
+    Items are keyed on ``job_position`` and carry ``skills``,
+    ``min_experience`` and ``education_weight``. The table is small, so it
+    is read with a full Scan on every refresh.
+    """
+
+    def __init__(self, client, table_name):
+        """
+        Args:
+            client: DynamoDB client (``dynamodb.meta.client`` of the boto3 resource)
+            table_name: Requirements table, keyed on ``job_position``
+        """
+        self.client = client
+        self.table_name = table_name
+
+    def load(self):
+        """
+        Read every position.
+
+        Returns:
+            Dict of job position -> requirements
+        """
+        requirements = {}
+        kwargs = {'TableName': self.table_name}
+        while True:
+            response = self.client.scan(**kwargs)
+            for item in response.get('Items', []):
+                requirements[item['job_position']] = {
+                    name: value for name, value in item.items() if name != 'job_position'
+                }
+            if 'LastEvaluatedKey' not in response:
+                return requirements
+            kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+
+class RequirementsStore:
+    """
+    Process-wide cache of job requirements with TTL refresh.
+
+    Built once per container, so warm invocations read the cached
+    requirements and the backing source is only revalidated once the TTL
+    expires. If a refresh fails, the last good requirements keep being
+    served (or ``fallback`` if nothing was ever loaded). Loaded positions
+    are layered over ``fallback``, so the built-in profiles (and 'General',
+    used for positions without requirements) stay available and the source
+    only needs to hold new or overridden positions.
+    """
+
+    def __init__(self, source, fallback, ttl_seconds=300, clock=time.monotonic):
+        """
+        Args:
+            source: Object with a ``load()`` method returning a dict of
+                position -> requirements, or None when unchanged
+            fallback: Requirements used until the first successful load;
+                must contain 'General'
+            ttl_seconds: Seconds a loaded copy is served before revalidation
+            clock: Monotonic clock (overridable in tests)
+        """
+        self.source = source
+        self.fallback = fallback
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self._requirements = fallback
+        self._expires_at = None
+        self._lock = threading.Lock()
+
+    def get(self):
+        """Return the current requirements, refreshing them if the TTL expired."""
+        if self._expires_at is not None and self.clock() < self._expires_at:
+            return self._requirements
+
+        with self._lock:
+            # Another thread may have refreshed while we waited
+            if self._expires_at is None or self.clock() >= self._expires_at:
+                self._refresh()
+            return self._requirements
+
+    def _refresh(self):
+        """Reload from the source; errors keep the current requirements."""
+        try:
+            loaded = self.source.load()
+            if loaded is not None:
+                self._requirements = self._validate(loaded)
+        except Exception as e:
+            print(f"Error loading job requirements, keeping current ones: {str(e)}")
+        # Errors also wait a full TTL, so a broken source isn't hit per message
+        self._expires_at = self.clock() + self.ttl_seconds
+
+    def _validate(self, loaded):
+        """Normalize loaded requirements over the fallback, dropping malformed positions."""
+        requirements = dict(self.fallback)
+        for position, profile in loaded.items():
+            try:
+                skills = [str(skill) for skill in profile['skills']]
+                education_weight = float(profile.get('education_weight', 0.2))
+                if not 0 <= education_weight <= 0.5:
+                    raise ValueError(f"education_weight {education_weight} outside [0, 0.5]")
+                requirements[position] = {
+                    'skills': skills,
+                    'min_experience': _number(profile.get('min_experience', 0)),
+                    'education_weight': education_weight
+                }
+            except (KeyError, TypeError, ValueError) as e:
+                print(f"Skipping invalid requirements for {position}: {str(e)}")
+
+        return requirements
+
+
+def store_from_environment(s3_client, dynamodb_client, fallback):
+    """
+    Build the RequirementsStore configured through environment variables.
+
+    Args:
+        s3_client: S3 client, used with JOB_REQUIREMENTS_S3_BUCKET/KEY
+        dynamodb_client: DynamoDB client, used with JOB_REQUIREMENTS_TABLE
+        fallback: Built-in requirements
+
+    Returns:
+        RequirementsStore, or None when no source is configured
+    """
+    if JOB_REQUIREMENTS_TABLE:
+        source = DynamoDBRequirementsSource(dynamodb_client, JOB_REQUIREMENTS_TABLE)
+    elif JOB_REQUIREMENTS_S3_BUCKET and JOB_REQUIREMENTS_S3_KEY:
+        source = S3RequirementsSource(s3_client, JOB_REQUIREMENTS_S3_BUCKET, JOB_REQUIREMENTS_S3_KEY)
+    else:
+        return None
+    return RequirementsStore(source, fallback, ttl_seconds=JOB_REQUIREMENTS_TTL)
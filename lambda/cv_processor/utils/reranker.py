@@ -0,0 +1,166 @@
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from botocore.exceptions import ClientError
+
+
+class Reranker:
+    """
+    Rescore every stored candidate from its parsed features.
+
+    The candidates table is read with a parallel segmented Scan (one thread
+    per segment), each page is rescored with ``RankingEngine.calculate_scores``
+    and only the items whose score changed are updated. No CV is downloaded
+    from S3 or parsed again.
+
+    The Lambda may rewrite a candidate between the Scan and the write (a
+    re-upload or a reprocess), so each write is an UpdateItem of the ranking
+    attributes only, conditioned on the row still being the one that was
+    scanned. Rows that changed in between are skipped rather than overwritten
+    with stale data; the Lambda has already scored them itself.
+    """
+
+    # Attributes that identify the version of a row that was scanned
+    VERSION_ATTRIBUTES = ('upload_date', 's3_version_id')
+
+    def __init__(self, client, table_name, ranking_engine, total_segments=8, page_size=None):
+        """
+        Args:
+            client: DynamoDB client (``dynamodb.meta.client`` of the boto3 resource)
+            table_name: Candidates table
+            ranking_engine: RankingEngine holding the new job requirements
+            total_segments: Parallel Scan segments (and worker threads)
+            page_size: Optional Scan Limit per request
+        """
+        self.client = client
+        self.table_name = table_name
+        self.ranking_engine = ranking_engine
+        self.total_segments = total_segments
+        self.page_size = page_size
+
+    def run(self, job_position=None):
+        """
+        Rescore the whole table, or only the candidates of one position.
+
+        Returns:
+            Dict with the number of 'scanned', 'updated', 'skipped' (changed
+            since the Scan) and 'failed' items
+        """
+        with ThreadPoolExecutor(max_workers=self.total_segments) as executor:
+            results = list(executor.map(
+                lambda segment: self.rerank_segment(segment, job_position),
+                range(self.total_segments)
+            ))
+
+        stats = {'scanned': 0, 'updated': 0, 'skipped': 0, 'failed': 0}
+        for result in results:
+            for name in stats:
+                stats[name] += result[name]
+        print(f"Re-ranking complete: {stats}")
+        return stats
+
+    def rerank_segment(self, segment, job_position=None):
+        """Scan and rescore one segment, page by page."""
+        stats = {'scanned': 0, 'updated': 0, 'skipped': 0, 'failed': 0}
+
+        for items in self._scan_pages(segment, job_position):
+            stats['scanned'] += len(items)
+            for item in self.rescore(items):
+                stats[self._update(item)] += 1
+        return stats
+
+    def _update(self, item):
+        """
+        Write the new ranking attributes of one scanned item.
+
+        Returns:
+            'updated', 'skipped' if the row changed since the Scan, or 'failed'
+        """
+        # 'status' is a DynamoDB reserved word
+        names = {'#status': 'status'}
+        values = {
+            ':score': item['ranking_score'],
+            ':matched': item['skills_matched'],
+            ':processed': 'processed'
+        }
+        conditions = ['#status = :processed']
+        for attribute in self.VERSION_ATTRIBUTES:
+            if attribute in item:
+                conditions.append(f'{attribute} = :{attribute}')
+                values[f':{attribute}'] = item[attribute]
+            else:
+                conditions.append(f'attribute_not_exists({attribute})')
+
+        try:
+            self.client.update_item(
+                TableName=self.table_name,
+                Key={'candidate_id': item['candidate_id']},
+                UpdateExpression='SET ranking_score = :score, skills_matched = :matched',
+                ConditionExpression=' AND '.join(conditions),
+                ExpressionAttributeNames=names,
+                ExpressionAttributeValues=values
+            )
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') == 'ConditionalCheckFailedException':
+                return 'skipped'
+            print(f"Error updating candidate {item['candidate_id']}: {str(e)}")
+            return 'failed'
+        return 'updated'
+
+    def rescore(self, items):
+        """
+        Rescore a page of stored items.
+
+        Returns:
+            The items whose ranking_score or skills_matched changed, updated in place
+        """
+        # Group by position so each group is one calculate_scores call
+        by_position = {}
+        for item in items:
+            by_position.setdefault(item['job_position'], []).append(item)
+
+        changed = []
+        for position, group in by_position.items():
+            candidates = [self._features(item) for item in group]
+            scores = self.ranking_engine.calculate_scores(candidates, [position])
+            for item, row in zip(group, scores):
+                score, skills_matched = row[0]
+                ranking_score = Decimal(str(score))
+                if item.get('ranking_score') == ranking_score and item.get('skills_matched') == skills_matched:
+                    continue
+                item['ranking_score'] = ranking_score
+                item['skills_matched'] = skills_matched
+                changed.append(item)
+        return changed
+
+    def _scan_pages(self, segment, job_position):
+        """Yield the processed items of one Scan segment, one page at a time."""
+        kwargs = {
+            'TableName': self.table_name,
+            'Segment': segment,
+            'TotalSegments': self.total_segments,
+            # 'status' is a DynamoDB reserved word
+            'FilterExpression': '#status = :processed',
+            'ExpressionAttributeNames': {'#status': 'status'},
+            'ExpressionAttributeValues': {':processed': 'processed'}
+        }
+        if job_position:
+            kwargs['FilterExpression'] += ' AND job_position = :position'
+            kwargs['ExpressionAttributeValues'][':position'] = job_position
+        if self.page_size:
+            kwargs['Limit'] = self.page_size
+
+        while True:
+            response = self.client.scan(**kwargs)
+            yield response.get('Items', [])
+            if 'LastEvaluatedKey' not in response:
+                return
+            kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+    def _features(self, item):
+        """Convert a stored item back into the cv_data shape the engine expects."""
+        years = item.get('experience_years', 0)
+        return {
+            'skills': list(item.get('skills') or []),
+            'experience_years': int(years) if years == int(years) else float(years),
+            'education': item.get('education', 'Not specified')
+        }
@@ -0,0 +1,89 @@
+import re
+
+# Words are runs of letters/digits; every other non-space character is a
+# token of its own, so 'node.js' and 'ci/cd' keep their punctuation.
+TOKEN_PATTERN = re.compile(r'[^\W_]+|[^\w\s]|_')
+
+
+class SkillMatcher:
+    """
+    Multi-pattern skill matcher compiled into a token trie.
+
+    Keywords are tokenized once at construction time and stored in a nested
+    dict keyed by token. Matching tokenizes the text in a single regex pass
+    and walks the trie from each token, so the cost depends on the text
+    length rather than on the number of keywords, and matches always fall on
+    word boundaries ('go' does not match "good", 'ai' does not match
+    "maintain").
+    """
+
+    # Sentinel key marking the end of a keyword inside the trie; the node
+    # stored there is the set of keyword indices ending at that token
+    END = None
+
+    def __init__(self, keywords, synonyms=None):
+        """
+        Args:
+            keywords: Canonical skill names, in the order results are reported
+            synonyms: Optional dict of alias -> canonical keyword
+        """
+        self.keywords = list(keywords)
+        self.trie = {}
+        # Length (in tokens) of the longest keyword
+        self.max_tokens = 0
+
+        for index, keyword in enumerate(self.keywords):
+            self._add(keyword, index)
+        for alias, canonical in (synonyms or {}).items():
+            self._add(alias, self.keywords.index(canonical))
+
+    def _add(self, phrase, index):
+        """Insert a phrase into the trie, pointing at keyword ``index``."""
+        tokens = TOKEN_PATTERN.findall(phrase.lower())
+        if not tokens:
+            return
+        self.max_tokens = max(self.max_tokens, len(tokens))
+        node = self.trie
+        for token in tokens:
+            node = node.setdefault(token, {})
+        node.setdefault(self.END, set()).add(index)
+
+    def find_indices(self, text_lower):
+        """
+        Return the set of keyword indices occurring in the text.
+
+        Args:
+            text_lower: Text to scan, already lowercased
+        """
+        return self.find_token_indices(TOKEN_PATTERN.findall(text_lower))
+
+    def find_token_indices(self, tokens):
+        """Same as find_indices, for text that has already been tokenized."""
+        trie = self.trie
+        end = self.END
+        found = set()
+
+        for start, token in enumerate(tokens):
+            node = trie.get(token)
+            if node is None:
+                continue
+            position = start + 1
+            while True:
+                if end in node:
+                    found.update(node[end])
+                if position >= len(tokens):
+                    break
+                node = node.get(tokens[position])
+                if node is None:
+                    break
+                position += 1
+        return found
+
+    def find(self, text_lower):
+        """
+        Return the keywords occurring in the text, in keyword-list order.
+
+        Args:
+            text_lower: Text to scan, already lowercased
+        """
+        return [self.keywords[index] for index in sorted(self.find_indices(text_lower))]
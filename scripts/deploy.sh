@@ -19,6 +19,10 @@ NC='\033[0m' # No Color
 ENVIRONMENT=${1:-dev}
 AWS_REGION=${2:-us-east-1}
 STACK_NAME="smart-ats-stack-${ENVIRONMENT}"
+# How uploaded CVs reach the queue: 'notification' (the bucket's S3 event
+# notification) or 'explicit' (the frontend sends the messages; remove the
+# notification first, or every CV is queued and processed twice)
+ENQUEUE_MODE=${ENQUEUE_MODE:-notification}
 
 echo -e "${YELLOW}Environment: ${ENVIRONMENT}${NC}"
 echo -e "${YELLOW}Region: ${AWS_REGION}${NC}"
@@ -110,6 +114,18 @@ CLIENT_ID=$(aws cloudformation describe-stacks \
     --output text \
     --region ${AWS_REGION})
 
+STREAM_ARN=$(aws cloudformation describe-stacks \
+    --stack-name ${STACK_NAME} \
+    --query 'Stacks[0].Outputs[?OutputKey==`CandidatesStreamArn`].OutputValue' \
+    --output text \
+    --region ${AWS_REGION})
+
+QUEUE_URL=$(aws cloudformation describe-stacks \
+    --stack-name ${STACK_NAME} \
+    --query 'Stacks[0].Outputs[?OutputKey==`SQSQueueURL`].OutputValue' \
+    --output text \
+    --region ${AWS_REGION})
+
 echo -e "${GREEN}Stack Outputs:${NC}"
 echo "  S3 Bucket: ${S3_BUCKET}"
 echo "  API Endpoint: ${API_ENDPOINT}"
@@ -117,6 +133,22 @@ echo "  User Pool ID: ${USER_POOL_ID}"
 echo "  Client ID: ${CLIENT_ID}"
 echo ""
 
+# Explicit enqueueing only once the bucket no longer notifies the queue
+if [ "${ENQUEUE_MODE}" = "explicit" ]; then
+    QUEUE_NOTIFICATIONS=$(aws s3api get-bucket-notification-configuration \
+        --bucket ${S3_BUCKET} \
+        --query 'length(QueueConfigurations || `[]`)' \
+        --output text \
+        --region ${AWS_REGION})
+    if [ "${QUEUE_NOTIFICATIONS}" != "0" ]; then
+        echo -e "${YELLOW}⚠ ${S3_BUCKET} still sends S3 event notifications to SQS; using ENQUEUE_MODE=notification${NC}"
+        echo -e "${YELLOW}  Remove the notification to enqueue CVs from the frontend, or each CV is queued twice${NC}"
+        ENQUEUE_MODE=notification
+    fi
+fi
+echo "  Enqueue mode: ${ENQUEUE_MODE}"
+echo ""
+
 # Save outputs to .env file for frontend
 cd ../frontend
 cat > .env <<EOF
@@ -126,6 +158,9 @@ API_GATEWAY_URL=${API_ENDPOINT}
 COGNITO_USER_POOL_ID=${USER_POOL_ID}
 COGNITO_CLIENT_ID=${CLIENT_ID}
 DYNAMODB_TABLE=smart-ats-candidates-${ENVIRONMENT}
+CANDIDATES_STREAM_ARN=${STREAM_ARN}
+SQS_QUEUE_URL=${QUEUE_URL}
+ENQUEUE_MODE=${ENQUEUE_MODE}
 SECRET_KEY=$(openssl rand -hex 32)
 EOF
 
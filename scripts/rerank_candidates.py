@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Rescore every stored candidate with the current job requirements
+"""
+
+import argparse
+import boto3
+import os
+import sys
+
+# Reuse the Lambda's ranking code
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'lambda', 'cv_processor'))
+
+from utils.ranking_engine import DEFAULT_JOB_REQUIREMENTS, RankingEngine
+from utils.requirements_store import store_from_environment
+from utils.reranker import Reranker
+
+def rerank_candidates():
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('table_name', nargs='?',
+                        default=os.environ.get('DYNAMODB_TABLE', 'smart-ats-candidates-dev'))
+    parser.add_argument('--position', help='Only rescore candidates of this job position')
+    parser.add_argument('--segments', type=int, default=8, help='Parallel Scan segments')
+    parser.add_argument('--page-size', type=int, help='Items per Scan request')
+    args = parser.parse_args()
+
+    print(f"Re-ranking table: {args.table_name}")
+
+    # Same requirements source as the Lambda (JOB_REQUIREMENTS_* variables)
+    dynamodb = boto3.resource('dynamodb')
+    store = store_from_environment(boto3.client('s3'), dynamodb.meta.client, DEFAULT_JOB_REQUIREMENTS)
+    reranker = Reranker(
+        dynamodb.meta.client,
+        args.table_name,
+        RankingEngine(store=store),
+        total_segments=args.segments,
+        page_size=args.page_size
+    )
+
+    try:
+        stats = reranker.run(job_position=args.position)
+    except Exception as e:
+        print(f"✗ Error re-ranking candidates: {str(e)}")
+        sys.exit(1)
+
+    print(f"\n✓ Scanned {stats['scanned']}, updated {stats['updated']}, skipped {stats['skipped']}, failed {stats['failed']}")
+    if stats['failed']:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    rerank_candidates()
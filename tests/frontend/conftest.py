@@ -0,0 +1,9 @@
+"""
+The frontend modules are imported as top-level modules, as app.py does
+"""
+import os
+import sys
+
+FRONTEND_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'frontend')
+if FRONTEND_DIR not in sys.path:
+    sys.path.insert(0, FRONTEND_DIR)
@@ -0,0 +1,178 @@
+"""
+Unit tests for the frontend API routes
+"""
+import os
+import pytest
+
+os.environ.pop('CANDIDATES_STREAM_ARN', None)
+import app
+from ranking_cache import RankingCache
+from ranking_query import RankingQuery, encode_cursor
+
+
+class StubDynamoDBClient:
+    """DynamoDB client recording index queries and returning no items."""
+
+    def __init__(self):
+        self.queries = []
+
+    def query(self, **kwargs):
+        self.queries.append(kwargs)
+        return {'Items': []}
+
+    def scan(self, **kwargs):
+        return {'Items': []}
+
+
+class StubS3Client:
+    """S3 client issuing fake presigned POSTs and heading stored objects."""
+
+    def __init__(self):
+        self.objects = {}
+        self.presigned = []
+
+    def generate_presigned_post(self, Bucket, Key, Fields=None, Conditions=None, ExpiresIn=3600):
+        self.presigned.append({'Bucket': Bucket, 'Key': Key, 'Fields': Fields, 'Conditions': Conditions,
+                               'ExpiresIn': ExpiresIn})
+        return {'url': f'https://{Bucket}.s3.amazonaws.com/', 'fields': dict(Fields, key=Key)}
+
+    def head_object(self, Bucket, Key):
+        if Key not in self.objects:
+            raise Exception('404 Not Found')
+        return self.objects[Key]
+
+    def store(self, key, uploaded_by, size=1024, job_position='Cloud Engineer'):
+        self.objects[key] = {
+            'ContentLength': size,
+            'VersionId': 'v1',
+            'Metadata': {'uploaded_by': uploaded_by, 'job_position': job_position}
+        }
+
+
+class TestApp:
+    """Test suite for the API routes."""
+
+    def setup_method(self):
+        """Setup test fixtures."""
+        self.dynamodb_client = StubDynamoDBClient()
+        app.ranking_query = RankingQuery(self.dynamodb_client, 'candidates')
+        app.ranking_cache = RankingCache()
+        app.s3_client = self.s3 = StubS3Client()
+        app.S3_BUCKET = 'cvs-bucket'
+        app.enqueuer = None
+        app.app.config['TESTING'] = True
+
+        self.client = app.app.test_client()
+        with self.client.session_transaction() as session:
+            session['access_token'] = 'token'
+            session['username'] = 'alice'
+
+    def test_candidates_page(self):
+        """Test a valid request queries the index and returns an empty page."""
+        response = self.client.get('/api/candidates', query_string={'position': 'Cloud Engineer'})
+
+        assert response.status_code == 200
+        assert response.get_json() == {'candidates': [], 'next_cursor': None}
+        assert len(self.dynamodb_client.queries) == 1
+
+    @pytest.mark.parametrize('cursor', [
+        'not a cursor',
+        encode_cursor({'Cloud Engineer': {'candidate_id': 'a1', 'job_position': 'Cloud Engineer'}}),
+        encode_cursor({'Cloud Engineer': {
+            'candidate_id': 'a1', 'job_position': 'Cloud Engineer', 'ranking_score': 'high'
+        }})
+    ])
+    def test_malformed_cursor_is_a_bad_request(self, cursor):
+        """Test a malformed cursor gets a 400 without querying the table."""
+        response = self.client.get('/api/candidates', query_string={'cursor': cursor})
+
+        assert response.status_code == 400
+        assert 'Invalid cursor' in response.get_json()['error']
+        assert self.dynamodb_client.queries == []
+
+    @pytest.mark.parametrize('name, value', [
+        ('date_from', '2024-13-01'),
+        ('date_to', '01/05/2024'),
+        ('min_score', 'high')
+    ])
+    def test_invalid_filter_is_a_bad_request(self, name, value):
+        """Test an invalid date or score filter gets a 400 without querying the table."""
+        response = self.client.get('/api/candidates', query_string={name: value})
+
+        assert response.status_code == 400
+        assert response.get_json()['error'].startswith('Invalid parameter')
+        assert self.dynamodb_client.queries == []
+
+    def test_presigned_post_pins_key_metadata_type_and_size(self):
+        """Test the upload policy fixes the key prefix, metadata, content type and size range."""
+        response = self.client.post('/api/uploads', json={
+            'filename': 'cv.docx', 'size': 2048, 'job_position': 'Data Scientist'
+        })
+
+        assert response.status_code == 200
+        body = response.get_json()
+        assert body['s3_key'].startswith('cvs/') and body['s3_key'].endswith('_cv.docx')
+        assert body['fields']['key'] == body['s3_key']
+
+        presigned = self.s3.presigned[0]
+        assert presigned['Bucket'] == 'cvs-bucket'
+        assert presigned['Key'] == body['s3_key']
+        assert presigned['ExpiresIn'] == app.PRESIGNED_UPLOAD_EXPIRES
+        content_type = 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
+        assert presigned['Conditions'] == [
+            {'Content-Type': content_type},
+            {'x-amz-meta-job_position': 'Data Scientist'},
+            {'x-amz-meta-uploaded_by': 'alice'},
+            ['content-length-range', 1, app.MAX_UPLOAD_BYTES]
+        ]
+
+    @pytest.mark.parametrize('data, error', [
+        ({'filename': 'cv.exe', 'size': 10}, 'Invalid file type'),
+        ({'filename': 'cv.pdf', 'size': 'big'}, 'Invalid file size'),
+        ({'filename': 'cv.pdf', 'size': app.MAX_UPLOAD_BYTES + 1}, 'File too large')
+    ])
+    def test_presigned_post_rejects_invalid_files(self, data, error):
+        """Test bad extensions and sizes are refused before anything is signed."""
+        response = self.client.post('/api/uploads', json=data)
+
+        assert response.status_code == 400
+        assert response.get_json()['error'].startswith(error)
+        assert self.s3.presigned == []
+
+    def test_complete_upload(self):
+        """Test completing an own upload reports it and lists its position."""
+        self.s3.store('cvs/20240101_000000_abcd1234_cv.pdf', 'alice', job_position='Backend Developer')
+
+        response = self.client.post('/api/uploads/complete', json={'s3_key': 'cvs/20240101_000000_abcd1234_cv.pdf'})
+
+        assert response.status_code == 200
+        assert response.get_json()['version_id'] == 'v1'
+        assert response.get_json()['size'] == 1024
+        assert 'Backend Developer' in app.ranking_query.positions.all()
+
+    def test_complete_upload_of_another_user_is_rejected(self):
+        """Test a key uploaded by someone else is reported as not found."""
+        self.s3.store('cvs/20240101_000000_abcd1234_cv.pdf', 'mallory')
+
+        response = self.client.post('/api/uploads/complete', json={'s3_key': 'cvs/20240101_000000_abcd1234_cv.pdf'})
+
+        assert response.status_code == 404
+
+    @pytest.mark.parametrize('s3_key, size, status', [
+        ('uploads/cv.pdf', 1024, 400),
+        ('cvs/missing.pdf', 1024, 404),
+        ('cvs/empty.pdf', 0, 400),
+        ('cvs/huge.pdf', app.MAX_UPLOAD_BYTES + 1, 400)
+    ])
+    def test_complete_upload_checks_key_and_size(self, s3_key, size, status):
+        """Test keys outside cvs/, missing objects and out-of-range sizes are refused."""
+        if s3_key != 'cvs/missing.pdf':
+            self.s3.store(s3_key, 'alice', size=size)
+
+        response = self.client.post('/api/uploads/complete', json={'s3_key': s3_key})
+
+        assert response.status_code == status
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
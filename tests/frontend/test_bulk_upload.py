@@ -0,0 +1,150 @@
+"""
+Unit tests for bulk CV uploads (files and ZIP archives)
+"""
+import io
+import threading
+import zipfile
+import pytest
+from werkzeug.datastructures import FileStorage
+from bulk_upload import BulkUploader
+
+
+class StubS3Client:
+    """S3 client recording uploaded objects; keys listed in ``failing`` raise."""
+
+    def __init__(self, failing=()):
+        self.objects = {}
+        self.failing = set(failing)
+        self.lock = threading.Lock()
+
+    def upload_fileobj(self, Fileobj, Bucket, Key, ExtraArgs=None, Config=None):
+        if Key in self.failing:
+            raise RuntimeError('AccessDenied')
+        with self.lock:
+            self.objects[Key] = (Fileobj.read(), ExtraArgs['Metadata'])
+
+    def head_object(self, Bucket, Key):
+        return {'VersionId': f"v-{Key}"}
+
+
+def upload_file(filename, content):
+    return FileStorage(stream=io.BytesIO(content), filename=filename)
+
+
+def zip_file(filename, entries, encrypted=False):
+    """A ZIP upload of (name, bytes) entries, optionally flagged as encrypted."""
+    output = io.BytesIO()
+    with zipfile.ZipFile(output, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for name, content in entries:
+            archive.writestr(name, content)
+    content = output.getvalue()
+    if encrypted:
+        # zipfile can't write encrypted entries: set bit 0 of the flags in
+        # the local and central directory headers
+        for signature, offset in ((b'PK\x03\x04', 6), (b'PK\x01\x02', 8)):
+            position = content.index(signature) + offset
+            content = content[:position] + bytes([content[position] | 0x1]) + content[position + 1:]
+    return upload_file(filename, content)
+
+
+class TestBulkUploader:
+    """Test suite for BulkUploader."""
+
+    def setup_method(self):
+        """Setup test fixtures."""
+        self.s3 = StubS3Client()
+
+    def uploader(self, **kwargs):
+        options = dict(max_file_bytes=1024 * 1024, make_key=lambda name: f"cvs/{name}", workers=4)
+        options.update(kwargs)
+        return BulkUploader(self.s3, 'bucket', {'pdf', 'doc', 'docx'}, **options)
+
+    def statuses(self, manifest):
+        return {result['filename']: (result['status'], result['error']) for result in manifest}
+
+    def test_files_and_archive_entries_are_uploaded(self):
+        """Test plain files and ZIP entries all reach S3 with the metadata."""
+        files = [
+            upload_file('a.pdf', b'%PDF a'),
+            zip_file('batch.zip', [('cvs/b.docx', b'docx b'), ('c.doc', b'doc c')])
+        ]
+
+        manifest = self.uploader(record_versions=True).upload(files, {'job_position': 'Cloud Engineer'})
+
+        assert [result['status'] for result in manifest] == ['uploaded'] * 3
+        assert self.s3.objects['cvs/b.docx'] == (b'docx b', {'job_position': 'Cloud Engineer'})
+        assert manifest[1]['filename'] == 'batch.zip/cvs/b.docx'
+        assert manifest[0]['version_id'] == 'v-cvs/a.pdf'
+
+    def test_entries_that_are_not_cvs_are_skipped(self):
+        """Test wrong types, empty files, hidden files and macOS metadata are skipped."""
+        files = [zip_file('batch.zip', [
+            ('notes.txt', b'text'), ('empty.pdf', b''), ('.hidden.pdf', b'x'),
+            ('__MACOSX/._a.pdf', b'x'), ('folder/', b''), ('ok.pdf', b'x')
+        ])]
+
+        statuses = self.statuses(self.uploader().upload(files, {}))
+
+        assert statuses == {
+            'batch.zip/notes.txt': ('skipped', 'Invalid file type. Only PDF, DOC, DOCX allowed'),
+            'batch.zip/empty.pdf': ('skipped', 'Empty file'),
+            'batch.zip/.hidden.pdf': ('skipped', 'Not a CV'),
+            'batch.zip/__MACOSX/._a.pdf': ('skipped', 'Not a CV'),
+            'batch.zip/ok.pdf': ('uploaded', None)
+        }
+
+    def test_too_many_files(self):
+        """Test an archive with more entries than max_files is skipped whole, and files beyond it are skipped."""
+        archive = zip_file('big.zip', [(f"{i}.pdf", b'x') for i in range(4)])
+        manifest = self.uploader(max_files=3).upload([archive], {})
+
+        assert self.statuses(manifest) == {'big.zip': ('skipped', 'Too many files (max 3 per upload)')}
+
+        files = [upload_file(f"{i}.pdf", b'x') for i in range(4)]
+        manifest = self.uploader(max_files=3).upload(files, {})
+
+        assert [result['status'] for result in manifest] == ['uploaded'] * 3 + ['skipped']
+
+    def test_size_limits(self):
+        """Test files over max_file_bytes and requests over max_bytes are skipped."""
+        files = [upload_file('big.pdf', b'x' * 11), upload_file('a.pdf', b'x' * 6), upload_file('b.pdf', b'x' * 6)]
+
+        statuses = self.statuses(self.uploader(max_file_bytes=10, max_bytes=10).upload(files, {}))
+
+        assert statuses['big.pdf'][0] == 'skipped'
+        assert statuses['a.pdf'] == ('uploaded', None)
+        assert statuses['b.pdf'][0] == 'skipped'
+
+    def test_zip_bomb_is_rejected_before_reading(self):
+        """Test an entry with an extreme compression ratio is skipped."""
+        files = [zip_file('bomb.zip', [('bomb.pdf', b'\0' * 1_000_000)])]
+
+        manifest = self.uploader(max_file_bytes=10 * 1024 * 1024).upload(files, {})
+
+        assert self.statuses(manifest) == {'bomb.zip/bomb.pdf': ('skipped', 'Suspicious compression ratio')}
+        assert self.s3.objects == {}
+
+    def test_encrypted_entries_are_skipped(self):
+        """Test entries flagged as encrypted are not read."""
+        files = [zip_file('locked.zip', [('secret.pdf', b'x')], encrypted=True)]
+
+        manifest = self.uploader().upload(files, {})
+
+        assert self.statuses(manifest) == {'locked.zip/secret.pdf': ('skipped', 'Encrypted entries are not supported')}
+
+    def test_invalid_archive_and_failed_transfer(self):
+        """Test a corrupt ZIP and an S3 error are reported as failed without stopping the rest."""
+        self.s3.failing.add('cvs/b.pdf')
+        files = [upload_file('broken.zip', b'not a zip'), upload_file('a.pdf', b'x'), upload_file('b.pdf', b'x')]
+
+        statuses = self.statuses(self.uploader().upload(files, {}))
+
+        assert statuses == {
+            'broken.zip': ('failed', 'Not a valid ZIP archive'),
+            'a.pdf': ('uploaded', None),
+            'b.pdf': ('failed', 'AccessDenied')
+        }
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,46 @@
+"""
+Unit tests for the in-process event bus behind /api/events
+"""
+import pytest
+from events import EventBus
+
+
+class TestEventBus:
+    """Test suite for EventBus."""
+
+    def setup_method(self):
+        """Setup test fixtures."""
+        self.bus = EventBus(max_queued=2, max_subscribers=2)
+
+    def test_subscribers_are_capped(self):
+        """Test subscribe() refuses new subscribers once every slot is taken."""
+        first = self.bus.subscribe()
+        assert self.bus.subscribe() is not None
+        assert self.bus.subscribe() is None
+
+        self.bus.unsubscribe(first)
+        assert self.bus.subscribe() is not None
+
+    def test_slow_subscriber_loses_oldest_events(self):
+        """Test a full queue drops its oldest event instead of blocking the publisher."""
+        subscriber = self.bus.subscribe()
+        for index in range(3):
+            self.bus.publish('status', {'index': index})
+
+        assert [subscriber.get_nowait()[1]['index'] for _ in range(2)] == [1, 2]
+
+    def test_closed_stream_frees_its_slot(self):
+        """Test closing a stream unsubscribes it."""
+        subscriber = self.bus.subscribe()
+        self.bus.subscribe()
+        self.bus.publish('candidate', {'candidate_id': 'c1'})
+        stream = self.bus.stream(subscriber)
+
+        assert next(stream).startswith('retry:')
+        assert next(stream) == 'event: candidate\ndata: {"candidate_id": "c1"}\n\n'
+        stream.close()
+        assert self.bus.subscribe() is not None
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
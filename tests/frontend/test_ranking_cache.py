@@ -0,0 +1,214 @@
+"""
+Unit tests for the ranking page cache and its stream invalidation
+"""
+import time
+import pytest
+from botocore.exceptions import ClientError
+from events import EventBus
+from ranking_cache import RankingCache, StreamInvalidator
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def client_error(code):
+    return ClientError({'Error': {'Code': code, 'Message': code}}, 'Operation')
+
+
+class StubStreamsClient:
+    """DynamoDB Streams client serving scripted records and errors for one open shard."""
+
+    def __init__(self, records=None):
+        self.records = list(records or [])
+        self.iterators = []
+        # Exceptions raised by the next calls of each operation
+        self.errors = {'describe_stream': [], 'get_shard_iterator': [], 'get_records': []}
+
+    def _fail(self, operation):
+        if self.errors[operation]:
+            raise self.errors[operation].pop(0)
+
+    @property
+    def iterator_types(self):
+        return [kwargs['ShardIteratorType'] for kwargs in self.iterators]
+
+    def describe_stream(self, StreamArn, ExclusiveStartShardId=None):
+        self._fail('describe_stream')
+        return {'StreamDescription': {'Shards': [{'ShardId': 'shard-1', 'SequenceNumberRange': {}}]}}
+
+    def get_shard_iterator(self, **kwargs):
+        self.iterators.append(kwargs)
+        self._fail('get_shard_iterator')
+        return {'ShardIterator': f"{kwargs['ShardId']}/{len(self.iterators)}"}
+
+    def get_records(self, ShardIterator, Limit):
+        self._fail('get_records')
+        records, self.records = self.records, []
+        return {'Records': records, 'NextShardIterator': ShardIterator}
+
+
+def record(position, sequence_number=None, **attributes):
+    image = {'job_position': {'S': position}}
+    image.update({name: {'S': value} for name, value in attributes.items()})
+    return {'dynamodb': {'NewImage': image, 'SequenceNumber': sequence_number}}
+
+
+class TestRankingCache:
+    """Test suite for RankingCache and StreamInvalidator."""
+
+    def setup_method(self):
+        """Setup test fixtures."""
+        self.clock = FakeClock()
+        self.cache = RankingCache(max_entries=3, ttl_seconds=60, clock=self.clock)
+        self.loads = []
+
+    def load(self, key, value=None):
+        def loader():
+            self.loads.append(key)
+            return value if value is not None else f"page {len(self.loads)}"
+        return self.cache.get_or_load(key, loader)
+
+    def test_read_through_until_ttl(self):
+        """Test a page is loaded once, then served from the cache until the TTL expires."""
+        assert self.load(('Cloud Engineer', None)) == "page 1"
+        self.clock.now = 59
+        assert self.load(('Cloud Engineer', None)) == "page 1"
+        self.clock.now = 60
+        assert self.load(('Cloud Engineer', None)) == "page 2"
+
+    def test_least_recently_used_is_evicted(self):
+        """Test the cache keeps max_entries pages, evicting the least recently used."""
+        for position in ('A', 'B', 'C'):
+            self.load((position,))
+        self.load(('A',))
+        self.load(('D',))
+
+        self.load(('A',))
+        self.load(('B',))
+
+        assert self.loads == [('A',), ('B',), ('C',), ('D',), ('B',)]
+
+    def test_invalidate_position_and_merged_view(self):
+        """Test invalidating a position drops its pages and the merged ones only."""
+        for key in (('A', None), ('B', None), (None, None)):
+            self.load(key)
+
+        self.cache.invalidate('A')
+        for key in (('A', None), ('B', None), (None, None)):
+            self.load(key)
+
+        assert self.loads[3:] == [('A', None), (None, None)]
+
+    def test_invalidate_everything(self):
+        """Test invalidate() without a position clears the cache."""
+        self.load(('A',))
+        self.cache.invalidate()
+        self.load(('A',))
+
+        assert len(self.loads) == 2
+
+    def test_invalidation_during_load_is_not_cached(self):
+        """Test a page loaded across an invalidation is served once but not stored."""
+        def stale_loader():
+            self.cache.invalidate('A')
+            return "stale page"
+
+        assert self.cache.get_or_load(('A',), stale_loader) == "stale page"
+        assert self.cache.get_or_load((None,), lambda: self.cache.invalidate('B') or "stale merged") == "stale merged"
+        assert self.load(('A',)) == "page 1"
+        assert self.load((None,)) == "page 2"
+
+    def test_other_position_invalidation_keeps_load(self):
+        """Test a change to another position doesn't prevent storing a page."""
+        def loader():
+            self.cache.invalidate('B')
+            self.loads.append(('A',))
+            return "page"
+
+        self.cache.get_or_load(('A',), loader)
+        self.load(('A',))
+
+        assert self.loads == [('A',)]
+
+    def test_stream_records_invalidate_and_publish(self):
+        """Test polled records evict their position and reach the event bus."""
+        self.load(('A',))
+        self.load(('B',))
+        bus = EventBus()
+        subscriber = bus.subscribe()
+        client = StubStreamsClient([record('A', status='processed', s3_key='cvs/a.pdf')])
+        invalidator = StreamInvalidator(client, 'arn:stream', self.cache, bus=bus)
+
+        invalidator.poll_once()
+        self.load(('A',))
+        self.load(('B',))
+
+        assert client.iterator_types == ['TRIM_HORIZON']
+        assert self.loads == [('A',), ('B',), ('A',)]
+        assert subscriber.get_nowait()[0] == 'status'
+        assert subscriber.get_nowait() == ('candidate', {
+            'job_position': 'A', 'status': 'processed', 's3_key': 'cvs/a.pdf'
+        })
+
+    def test_failed_initial_discovery_is_retried(self):
+        """Test the polling thread survives a failing describe_stream at startup."""
+        client = StubStreamsClient([record('A')])
+        client.errors['describe_stream'].append(client_error('ThrottlingException'))
+        self.load(('A',))
+        invalidator = StreamInvalidator(client, 'arn:stream', self.cache, poll_interval=0.001)
+
+        invalidator.start()
+        deadline = time.monotonic() + 5
+        while self.cache._entries and time.monotonic() < deadline:
+            time.sleep(0.01)
+        invalidator.stop()
+        self.load(('A',))
+
+        assert client.iterator_types[0] == 'LATEST'
+        assert self.loads == [('A',), ('A',)]
+
+    def test_failed_iterator_is_reopened_after_last_record(self):
+        """Test an expired iterator is replaced, resuming after the last record applied."""
+        client = StubStreamsClient([record('A', sequence_number='100')])
+        invalidator = StreamInvalidator(client, 'arn:stream', self.cache)
+        invalidator.poll_once()
+
+        client.errors['get_records'].append(client_error('ExpiredIteratorException'))
+        invalidator.poll_once()
+        client.records = [record('B', sequence_number='101')]
+        self.load(('B',))
+        invalidator.poll_once()
+        self.load(('B',))
+
+        assert client.iterators[-1]['ShardIteratorType'] == 'AFTER_SEQUENCE_NUMBER'
+        assert client.iterators[-1]['SequenceNumber'] == '100'
+        assert self.loads == [('B',), ('B',)]
+
+    def test_trimmed_shard_reopened_from_oldest_record(self):
+        """Test a shard trimmed past the last record read is reopened at TRIM_HORIZON."""
+        client = StubStreamsClient([record('A', sequence_number='100')])
+        invalidator = StreamInvalidator(client, 'arn:stream', self.cache)
+        invalidator.poll_once()
+
+        client.errors['get_records'].append(client_error('ExpiredIteratorException'))
+        client.errors['get_shard_iterator'].append(client_error('TrimmedDataAccessException'))
+        invalidator.poll_once()
+
+        assert client.iterator_types == ['TRIM_HORIZON', 'AFTER_SEQUENCE_NUMBER', 'TRIM_HORIZON']
+
+    def test_record_without_position_clears_cache(self):
+        """Test a change with no job_position in either image invalidates everything."""
+        self.load(('A',))
+        StreamInvalidator(None, None, self.cache).apply({'dynamodb': {'Keys': {}}})
+        self.load(('A',))
+
+        assert len(self.loads) == 2
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
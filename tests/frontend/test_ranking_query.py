@@ -0,0 +1,257 @@
+"""
+Unit tests for the top-K ranking queries on the JobPositionRankingIndex
+"""
+from decimal import Decimal
+import threading
+import pytest
+from ranking_cache import RankingCache, StreamInvalidator
+from ranking_query import PositionDirectory, RankingQuery, decode_cursor, encode_cursor
+
+
+def candidate(candidate_id, position, score):
+    return {'candidate_id': candidate_id, 'job_position': position, 'ranking_score': Decimal(str(score))}
+
+
+class StubClient:
+    """DynamoDB client answering descending index queries and scans from in-memory lists."""
+
+    def __init__(self, items, keep=lambda item: True):
+        """
+        Args:
+            items: List of candidate items
+            keep: Predicate standing in for the FilterExpression
+        """
+        self.items = items
+        self.keep = keep
+        self.queries = []
+        self.scans = []
+        self.scan_page_size = 2
+
+    def query(self, **kwargs):
+        self.queries.append(kwargs)
+        position = kwargs['ExpressionAttributeValues'][':position']
+        order = lambda item: (item['ranking_score'], item['candidate_id'])
+        items = sorted((item for item in self.items if item['job_position'] == position), key=order, reverse=True)
+        start = kwargs.get('ExclusiveStartKey')
+        if start:
+            items = [item for item in items if order(item) < order(start)]
+
+        # Limit counts evaluated items, the filter applies afterwards
+        evaluated = items[:kwargs['Limit']]
+        response = {'Items': [item for item in evaluated if self.keep(item)]}
+        if len(items) > len(evaluated):
+            response['LastEvaluatedKey'] = dict(evaluated[-1])
+        return response
+
+    def scan(self, **kwargs):
+        self.scans.append(kwargs)
+        start = kwargs.get('ExclusiveStartKey', {}).get('offset', 0)
+        end = start + self.scan_page_size
+        response = {'Items': [{'job_position': item['job_position']} for item in self.items[start:end]]}
+        if end < len(self.items):
+            response['LastEvaluatedKey'] = {'offset': end}
+        return response
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestRankingQuery:
+    """Test suite for RankingQuery pagination."""
+
+    def setup_method(self):
+        """Setup test fixtures."""
+        self.items = [
+            candidate('a1', 'Cloud Engineer', 90), candidate('a2', 'Cloud Engineer', 70),
+            candidate('a3', 'Cloud Engineer', 50), candidate('b1', 'Data Scientist', 80),
+            candidate('b2', 'Data Scientist', 60)
+        ]
+        self.client = StubClient(self.items)
+        self.clock = FakeClock()
+        self.positions = PositionDirectory(self.client, 'candidates', configured=['Data Scientist'],
+                                           refresh_seconds=60, clock=self.clock)
+        self.query = RankingQuery(self.client, 'candidates', positions=self.positions)
+
+    def settle(self):
+        """Wait for the background position scan started by all(), if any."""
+        refresher = self.positions._refresher
+        if refresher:
+            refresher.join(timeout=5)
+
+    def pages(self, limit, **kwargs):
+        """Read every page, returning the candidate ids of each."""
+        pages = []
+        cursor = None
+        while True:
+            candidates, cursor = self.query.top_candidates(limit, cursor=cursor, **kwargs)
+            pages.append([item['candidate_id'] for item in candidates])
+            if cursor is None:
+                return pages
+
+    def test_merged_view_resumes_each_position(self):
+        """Test the all-positions view is merged by score and resumes without gaps or repeats."""
+        self.positions.refresh()
+
+        assert self.pages(2) == [['a1', 'b1'], ['a2', 'b2'], ['a3']]
+
+    def test_position_not_shown_keeps_its_place(self):
+        """Test a position whose items were all outranked is re-read from where it stood."""
+        self.items.append(candidate('a0', 'Cloud Engineer', 95))
+        self.positions.refresh()
+
+        candidates, cursor = self.query.top_candidates(1)
+
+        assert [item['candidate_id'] for item in candidates] == ['a0']
+        assert decode_cursor(cursor) == {
+            'Cloud Engineer': {'candidate_id': 'a0', 'job_position': 'Cloud Engineer', 'ranking_score': '95'},
+            'Data Scientist': None
+        }
+
+    def test_exhausted_positions_leave_the_cursor(self):
+        """Test a position fully read is dropped, and the last page has no cursor."""
+        candidates, cursor = self.query.top_candidates(3, position='Data Scientist')
+
+        assert [item['candidate_id'] for item in candidates] == ['b1', 'b2']
+        assert cursor is None
+        assert self.pages(1, position='Cloud Engineer') == [['a1'], ['a2'], ['a3']]
+
+    def test_filtered_pages_are_read_until_full(self):
+        """Test short pages caused by the filter trigger further queries."""
+        self.client.keep = lambda item: item['candidate_id'] != 'a2'
+
+        candidates, cursor = self.query.top_candidates(2, position='Cloud Engineer')
+
+        assert [item['candidate_id'] for item in candidates] == ['a1', 'a3']
+        assert len(self.client.queries) == 2
+        assert cursor is None
+
+    def test_filtered_out_tail_resumes_after_last_evaluated_key(self):
+        """Test a page ending on filtered items continues after them, not before."""
+        self.client.keep = lambda item: item['candidate_id'] == 'a1'
+        self.query.MAX_QUERY_PAGES = 1
+
+        candidates, cursor = self.query.top_candidates(2, position='Cloud Engineer')
+
+        assert [item['candidate_id'] for item in candidates] == ['a1']
+        assert decode_cursor(cursor)['Cloud Engineer']['candidate_id'] == 'a2'
+
+    def test_query_parameters(self):
+        """Test the score bound is a key condition and dates are a filter over whole days."""
+        self.query.top_candidates(5, position='Cloud Engineer', min_score=60, date_to='2024-05-01',
+                                  attributes=['status'])
+
+        kwargs = self.client.queries[0]
+        assert kwargs['IndexName'] == 'JobPositionRankingIndex'
+        assert kwargs['ScanIndexForward'] is False
+        assert kwargs['KeyConditionExpression'] == 'job_position = :position AND ranking_score >= :min_score'
+        assert kwargs['ExpressionAttributeValues'][':date_to'] == '2024-05-01 23:59:59'
+        assert 'status' in kwargs['ExpressionAttributeNames'].values()
+
+    def test_positions_come_from_the_index(self):
+        """Test configured positions come first, then every position found by scanning the index."""
+        self.items.append(candidate('c1', 'Backend Developer', 85))
+
+        assert self.positions.all() == ['Data Scientist']
+        self.settle()
+
+        assert self.positions.all() == ['Data Scientist', 'Backend Developer', 'Cloud Engineer']
+        assert len(self.client.scans) == 3
+        assert self.client.scans[0]['IndexName'] == 'JobPositionRankingIndex'
+        assert self.client.scans[0]['ProjectionExpression'] == 'job_position'
+
+        candidates, _ = self.query.top_candidates(2)
+        assert [item['candidate_id'] for item in candidates] == ['a1', 'c1']
+
+    def test_requests_do_not_wait_for_the_scan(self):
+        """Test a slow scan runs once in the background while the known positions are served."""
+        release = threading.Event()
+        scan = self.client.scan
+
+        def slow_scan(**kwargs):
+            release.wait(timeout=5)
+            return scan(**kwargs)
+        self.client.scan = slow_scan
+
+        assert self.positions.all() == ['Data Scientist']
+        assert self.positions.all() == ['Data Scientist']
+        candidates, _ = self.query.top_candidates(5)
+        assert [item['candidate_id'] for item in candidates] == ['b1', 'b2']
+
+        release.set()
+        self.settle()
+        assert self.positions.all() == ['Data Scientist', 'Cloud Engineer']
+        assert len(self.client.scans) == 3
+
+    def test_positions_rescanned_only_when_due(self):
+        """Test the index is rescanned after the interval, while added positions show up at once."""
+        self.positions.all()
+        self.settle()
+        self.items.append(candidate('c1', 'Backend Developer', 85))
+        self.positions.add('software engineer')
+
+        assert self.positions.all() == ['Data Scientist', 'Cloud Engineer', 'software engineer']
+        assert self.positions._refresher is None
+
+        self.clock.now = 61
+        self.positions.all()
+        self.settle()
+        assert 'Backend Developer' in self.positions.all()
+
+    def test_scan_failure_keeps_known_positions(self):
+        """Test a failing scan leaves the known positions and isn't retried before the interval."""
+        def fail(**kwargs):
+            self.client.scans.append(kwargs)
+            raise RuntimeError('throttled')
+        self.client.scan = fail
+
+        assert self.positions.all() == ['Data Scientist']
+        self.settle()
+        assert self.positions.all() == ['Data Scientist']
+        self.settle()
+        assert len(self.client.scans) == 1
+
+    def test_positions_seen_on_the_stream_are_added(self):
+        """Test a candidate written for a new position adds it to the all-positions view."""
+        self.positions.refresh()
+        invalidator = StreamInvalidator(None, None, RankingCache(), positions=self.positions)
+
+        invalidator.apply({'dynamodb': {'NewImage': {'job_position': {'S': 'Backend Developer'}}}})
+
+        assert self.positions.all()[-1] == 'Backend Developer'
+
+    def test_cursor_round_trip_and_garbage(self):
+        """Test cursors decode to their state and malformed ones raise ValueError."""
+        state = {'Cloud Engineer': None}
+
+        assert decode_cursor(encode_cursor(state)) == state
+        with pytest.raises(ValueError):
+            decode_cursor('not a cursor')
+        with pytest.raises(ValueError):
+            decode_cursor(encode_cursor(['list']))
+
+    @pytest.mark.parametrize('state', [
+        {},
+        {'Cloud Engineer': 'a1'},
+        {'Cloud Engineer': {'candidate_id': 'a1', 'job_position': 'Cloud Engineer'}},
+        {'Cloud Engineer': {'candidate_id': 'a1', 'job_position': 'Cloud Engineer', 'ranking_score': 'high'}},
+        {'Cloud Engineer': {'candidate_id': 'a1', 'job_position': 'Cloud Engineer', 'ranking_score': 'NaN'}},
+        {'Cloud Engineer': {'candidate_id': 'a1', 'job_position': 'Cloud Engineer', 'ranking_score': 90}},
+        {'Cloud Engineer': {'candidate_id': ['a1'], 'job_position': 'Cloud Engineer', 'ranking_score': '90'}},
+        {'Cloud Engineer': {'candidate_id': 'a1', 'job_position': 'Data Scientist', 'ranking_score': '90'}},
+        {'Cloud Engineer': {'candidate_id': 'a1', 'job_position': 'Cloud Engineer', 'ranking_score': '90',
+                            'status': 'processed'}}
+    ])
+    def test_malformed_cursor_state_is_rejected(self, state):
+        """Test cursors are validated before their keys reach a Query."""
+        with pytest.raises(ValueError):
+            self.query.top_candidates(2, cursor=encode_cursor(state))
+        assert self.client.queries == []
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,125 @@
+"""
+Unit tests for explicit enqueueing with SendMessageBatch
+"""
+import json
+import pytest
+from botocore.exceptions import ClientError
+from sqs_enqueue import SQSEnqueuer
+
+
+class StubSQSClient:
+    """SQS client replaying scripted per-entry failures (or exceptions) call by call."""
+
+    def __init__(self, script=()):
+        """
+        Args:
+            script: One item per call: dict of entry position -> (code, sender_fault),
+                or an exception to raise; calls past the script succeed
+        """
+        self.script = list(script)
+        self.calls = []
+
+    def send_message_batch(self, QueueUrl, Entries):
+        self.calls.append([entry['Id'] for entry in Entries])
+        outcome = self.script.pop(0) if self.script else {}
+        if isinstance(outcome, Exception):
+            raise outcome
+        failed = [
+            {'Id': Entries[position]['Id'], 'Code': code, 'SenderFault': sender_fault}
+            for position, (code, sender_fault) in outcome.items()
+        ]
+        failed_ids = {entry['Id'] for entry in failed}
+        return {
+            'Successful': [{'Id': entry['Id']} for entry in Entries if entry['Id'] not in failed_ids],
+            'Failed': failed
+        }
+
+
+class TestSQSEnqueuer:
+    """Test suite for SQSEnqueuer."""
+
+    def setup_method(self):
+        """Setup test fixtures."""
+        self.sleeps = []
+        self.messages = [
+            SQSEnqueuer.message('bucket', f"cvs/{index}.pdf", f"v{index}", 'Cloud Engineer', 'alice')
+            for index in range(25)
+        ]
+
+    def enqueuer(self, client, **kwargs):
+        return SQSEnqueuer(client, 'https://sqs/queue', sleep=self.sleeps.append, **kwargs)
+
+    def test_messages_are_sent_in_batches_of_ten(self):
+        """Test 25 messages take three calls and carry the direct message format."""
+        client = StubSQSClient()
+
+        assert self.enqueuer(client).send(self.messages) == {}
+        assert [len(call) for call in client.calls] == [10, 10, 5]
+        assert self.sleeps == []
+        assert SQSEnqueuer.message('b', 'k', 'v', 'p', 'u') == {
+            's3_bucket': 'b', 's3_key': 'k', 's3_version_id': 'v', 'job_position': 'p', 'uploaded_by': 'u'
+        }
+        assert json.loads(json.dumps(self.messages[0]))['s3_version_id'] == 'v0'
+
+    def test_server_failures_are_retried_with_backoff(self):
+        """Test entries failed by SQS itself are resent, alone, after a backoff."""
+        client = StubSQSClient([{3: ('InternalError', False), 7: ('ServiceUnavailable', False)}])
+
+        assert self.enqueuer(client).send(self.messages[:10]) == {}
+        assert client.calls[1] == ['3', '7']
+        assert len(self.sleeps) == 1
+        assert 0 <= self.sleeps[0] <= 0.1
+
+    def test_sender_faults_are_not_retried(self):
+        """Test an entry rejected as the sender's fault is reported without a retry."""
+        client = StubSQSClient([{2: ('InvalidMessageContents', True), 4: ('InternalError', False)}])
+
+        failures = self.enqueuer(client).send(self.messages[:10])
+
+        assert failures == {2: 'SendMessageBatch failed: InvalidMessageContents'}
+        assert client.calls[1] == ['4']
+
+    def test_failed_call_is_retried_then_reported(self):
+        """Test a whole failed call is retried, and entries still failing after max_attempts are reported."""
+        throttled = ClientError({'Error': {'Code': 'ThrottlingException'}}, 'SendMessageBatch')
+        client = StubSQSClient([throttled, throttled, throttled])
+
+        failures = self.enqueuer(client, max_attempts=3).send(self.messages[10:13])
+
+        assert failures == {index: 'SendMessageBatch failed: ThrottlingException' for index in range(3)}
+        assert len(client.calls) == 3
+        assert len(self.sleeps) == 2
+
+    @pytest.mark.parametrize('code', [
+        'AccessDenied', 'AWS.SimpleQueueService.NonExistentQueue', 'InvalidParameterValue'
+    ])
+    def test_non_retryable_call_errors_fail_fast(self, code):
+        """Test a call rejected for a reason a retry can't fix is reported after one attempt."""
+        error = ClientError({'Error': {'Code': code}, 'ResponseMetadata': {'HTTPStatusCode': 400}},
+                            'SendMessageBatch')
+        client = StubSQSClient([error])
+
+        failures = self.enqueuer(client).send(self.messages[:3])
+
+        assert failures == {index: f'SendMessageBatch failed: {code}' for index in range(3)}
+        assert len(client.calls) == 1
+        assert self.sleeps == []
+
+    def test_server_errors_are_retried(self):
+        """Test a call failing with an unlisted 5xx error is retried."""
+        error = ClientError({'Error': {'Code': 'BadGateway'}, 'ResponseMetadata': {'HTTPStatusCode': 502}},
+                            'SendMessageBatch')
+        client = StubSQSClient([error])
+
+        assert self.enqueuer(client).send(self.messages[:3]) == {}
+        assert len(client.calls) == 2
+
+    def test_failure_indexes_span_batches(self):
+        """Test failures are reported by index in the original message list."""
+        client = StubSQSClient([{}, {1: ('InvalidMessageContents', True)}])
+
+        assert self.enqueuer(client).send(self.messages) == {11: 'SendMessageBatch failed: InvalidMessageContents'}
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,273 @@
+"""
+In-memory stand-ins for the S3, SQS and DynamoDB calls made by the CV
+processor and the frontend.
+
+Only the operations and expression forms the code actually uses are
+implemented. Every call can be delayed by a fixed latency to approximate
+network round trips.
+"""
+import io
+import itertools
+import re
+import threading
+import time
+import uuid
+from collections import deque
+from types import SimpleNamespace
+
+
+class FakeService:
+    """Base class: optional per-call latency and a lock for thread safety."""
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.lock = threading.RLock()
+        self.calls = 0
+
+    def _call(self):
+        with self.lock:
+            self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+
+class FakeS3(FakeService):
+    """Versioned object store: upload_fileobj, put_object, head_object, get_object."""
+
+    def __init__(self, latency=0.0):
+        super().__init__(latency)
+        self.objects = {}
+
+    def put_object(self, Bucket, Key, Body, Metadata=None, **kwargs):
+        self._call()
+        data = Body.read() if hasattr(Body, 'read') else Body
+        version_id = uuid.uuid4().hex
+        with self.lock:
+            self.objects[(Bucket, Key)] = (data, dict(Metadata or {}), version_id)
+        return {'VersionId': version_id}
+
+    def upload_fileobj(self, Fileobj, Bucket, Key, ExtraArgs=None, Config=None):
+        self.put_object(Bucket, Key, Fileobj, Metadata=(ExtraArgs or {}).get('Metadata'))
+
+    def head_object(self, Bucket, Key, **kwargs):
+        self._call()
+        data, metadata, version_id = self._object(Bucket, Key)
+        return {'ContentLength': len(data), 'Metadata': metadata, 'VersionId': version_id}
+
+    def get_object(self, Bucket, Key, VersionId=None, **kwargs):
+        self._call()
+        data, metadata, version_id = self._object(Bucket, Key)
+        if VersionId and VersionId != version_id:
+            raise Exception(f"NoSuchVersion: {Key}?versionId={VersionId}")
+        return {
+            'Body': io.BytesIO(data),
+            'ContentLength': len(data),
+            'Metadata': metadata,
+            'VersionId': version_id
+        }
+
+    def _object(self, bucket, key):
+        with self.lock:
+            if (bucket, key) not in self.objects:
+                raise Exception(f"NoSuchKey: {key}")
+            return self.objects[(bucket, key)]
+
+
+class FakeSQS(FakeService):
+    """
+    Standard queue with a redrive policy.
+
+    Messages handed out by receive() are in flight until the consumer
+    reports them; failed ones go back to the queue and are moved to the
+    dead-letter list after ``max_receive_count`` receives.
+    """
+
+    def __init__(self, latency=0.0, max_receive_count=3):
+        super().__init__(latency)
+        self.max_receive_count = max_receive_count
+        self.messages = deque()
+        self.dead_letters = []
+        self.in_flight = 0
+        self._ids = itertools.count(1)
+
+    def send_message_batch(self, QueueUrl, Entries):
+        self._call()
+        if len(Entries) > 10:
+            raise ValueError('SendMessageBatch accepts at most 10 entries')
+        now = time.perf_counter()
+        with self.lock:
+            for entry in Entries:
+                self.messages.append({
+                    'messageId': f"msg-{next(self._ids)}",
+                    'body': entry['MessageBody'],
+                    'sent_at': now,
+                    'receive_count': 0
+                })
+        return {'Successful': [{'Id': entry['Id']} for entry in Entries], 'Failed': []}
+
+    def receive(self, max_messages=10):
+        """Take up to ``max_messages`` messages, as the Lambda event source mapping does."""
+        with self.lock:
+            batch = []
+            while self.messages and len(batch) < max_messages:
+                message = self.messages.popleft()
+                message['receive_count'] += 1
+                batch.append(message)
+            self.in_flight += len(batch)
+            return batch
+
+    def complete(self, batch, failed_ids):
+        """Delete processed messages; requeue or dead-letter the failed ones."""
+        with self.lock:
+            self.in_flight -= len(batch)
+            for message in batch:
+                if message['messageId'] not in failed_ids:
+                    continue
+                if message['receive_count'] >= self.max_receive_count:
+                    self.dead_letters.append(message)
+                else:
+                    self.messages.append(message)
+
+    def pending(self):
+        with self.lock:
+            return len(self.messages) + self.in_flight
+
+
+class FakeDynamoDBClient(FakeService):
+    """
+    Low-level DynamoDB client for tables keyed on a single hash key.
+
+    Supports batch_write_item/batch_get_item on the table, and query and
+    scan on a GSI keyed on (job_position, ranking_score), with the key
+    conditions, filters and projections built by the frontend's
+    RankingQuery and PositionDirectory. Items
+    are stored as plain Python values, as with the boto3 resource's client.
+    """
+
+    CONDITION = re.compile(r'^\s*(#?\w+)\s*(=|>=|<=|>|<)\s*(:\w+)\s*$')
+
+    def __init__(self, key_attribute='candidate_id', latency=0.0):
+        super().__init__(latency)
+        self.key_attribute = key_attribute
+        self.tables = {}
+        self.listeners = []
+
+    def items(self, table_name):
+        with self.lock:
+            return list(self.tables.get(table_name, {}).values())
+
+    def batch_write_item(self, RequestItems):
+        self._call()
+        written = []
+        with self.lock:
+            for table_name, requests in RequestItems.items():
+                table = self.tables.setdefault(table_name, {})
+                for request in requests:
+                    item = request['PutRequest']['Item']
+                    old = table.get(item[self.key_attribute])
+                    table[item[self.key_attribute]] = dict(item)
+                    written.append((table_name, old, dict(item)))
+        for listener in self.listeners:
+            for table_name, old, new in written:
+                listener(table_name, old, new)
+        return {'UnprocessedItems': {}}
+
+    def batch_get_item(self, RequestItems):
+        self._call()
+        responses = {}
+        with self.lock:
+            for table_name, request in RequestItems.items():
+                table = self.tables.get(table_name, {})
+                responses[table_name] = [
+                    dict(table[key[self.key_attribute]])
+                    for key in request['Keys'] if key[self.key_attribute] in table
+                ]
+        return {'Responses': responses, 'UnprocessedKeys': {}}
+
+    def query(self, TableName, KeyConditionExpression, ExpressionAttributeValues, IndexName=None,
+              ExpressionAttributeNames=None, FilterExpression=None, ProjectionExpression=None,
+              ScanIndexForward=True, Limit=None, ExclusiveStartKey=None):
+        self._call()
+        names = ExpressionAttributeNames or {}
+        values = ExpressionAttributeValues
+        key_conditions = self._conditions(KeyConditionExpression, names, values)
+        filters = self._conditions(FilterExpression, names, values) if FilterExpression else []
+
+        items = [item for item in self._index_items(TableName) if all(test(item) for test in key_conditions)]
+        items.sort(key=self._index_key, reverse=not ScanIndexForward)
+
+        if ExclusiveStartKey:
+            start = self._index_key(ExclusiveStartKey)
+            items = [
+                item for item in items
+                if (self._index_key(item) < start if not ScanIndexForward else self._index_key(item) > start)
+            ]
+
+        # Limit counts evaluated items, before the filter, like DynamoDB
+        evaluated = items[:Limit] if Limit else items
+        result = {'Items': [
+            self._project(item, ProjectionExpression, names)
+            for item in evaluated if all(test(item) for test in filters)
+        ]}
+        if Limit and len(items) > Limit:
+            last = evaluated[-1]
+            result['LastEvaluatedKey'] = {
+                name: last[name] for name in (self.key_attribute, 'job_position', 'ranking_score')
+            }
+        return result
+
+    def scan(self, TableName, IndexName=None, ProjectionExpression=None, ExpressionAttributeNames=None,
+             ExclusiveStartKey=None):
+        """Scan the GSI in one page."""
+        self._call()
+        names = ExpressionAttributeNames or {}
+        return {'Items': [
+            self._project(item, ProjectionExpression, names) for item in self._index_items(TableName)
+        ]}
+
+    def _index_items(self, table_name):
+        """Sparse GSI: only items carrying both index keys."""
+        with self.lock:
+            return [
+                item for item in self.tables.get(table_name, {}).values()
+                if 'job_position' in item and 'ranking_score' in item
+            ]
+
+    def _index_key(self, item):
+        return (item['ranking_score'], item[self.key_attribute])
+
+    def _conditions(self, expression, names, values):
+        tests = []
+        for clause in expression.split(' AND '):
+            match = self.CONDITION.match(clause)
+            if not match:
+                raise ValueError(f"Unsupported expression: {clause}")
+            attribute, operator, placeholder = match.groups()
+            attribute = names.get(attribute, attribute)
+            tests.append(self._test(attribute, operator, values[placeholder]))
+        return tests
+
+    @staticmethod
+    def _test(attribute, operator, value):
+        compare = {
+            '=': lambda a: a == value,
+            '>=': lambda a: a >= value,
+            '<=': lambda a: a <= value,
+            '>': lambda a: a > value,
+            '<': lambda a: a < value,
+        }[operator]
+        return lambda item: attribute in item and compare(item[attribute])
+
+    @staticmethod
+    def _project(item, expression, names):
+        if not expression:
+            return dict(item)
+        attributes = [names.get(name.strip(), name.strip()) for name in expression.split(',')]
+        return {name: item[name] for name in attributes if name in item}
+
+
+class FakeDynamoDB:
+    """Stand-in for ``boto3.resource('dynamodb')``: only ``meta.client`` is used."""
+
+    def __init__(self, client):
+        self.meta = SimpleNamespace(client=client)
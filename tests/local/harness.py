@@ -0,0 +1,352 @@
+"""
+Local end-to-end harness for the CV pipeline
+
+Drives synthetic CVs through the real code with in-memory AWS stand-ins
+(tests/local/fakes.py), no AWS account needed:
+
+    frontend /upload/bulk -> S3 -> SendMessageBatch -> SQS
+        -> lambda_handler batches (parse, rank, write) -> DynamoDB
+        -> stream invalidation -> /dashboard and /api/candidates
+
+and reports upload, processing and dashboard throughput and latency.
+
+Run from the repository root:
+    python -m tests.local.harness --cvs 500 --latency-ms 5
+"""
+import argparse
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+from boto3.dynamodb.types import TypeSerializer
+from tests.local.fakes import FakeDynamoDB, FakeDynamoDBClient, FakeS3, FakeSQS
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+FRONTEND_DIR = os.path.join(ROOT, 'frontend')
+LAMBDA_DIR = os.path.join(ROOT, 'lambda', 'cv_processor')
+
+BUCKET = 'smart-ats-cvs-local'
+TABLE = 'smart-ats-candidates-local'
+QUEUE_URL = 'https://sqs.local/000000000000/smart-ats-cv-queue-local'
+USERNAME = 'harness'
+
+SKILLS = ['Python', 'Java', 'JavaScript', 'React', 'AWS', 'Docker', 'Kubernetes', 'SQL',
+          'Git', 'Terraform', 'Machine Learning', 'Go', 'DevOps', 'CI/CD', 'Agile']
+DEGREES = ["PhD in Physics", "Master's Degree in Computer Science", "Bachelor's Degree", "Diploma"]
+# The formats the frontend accepts
+FORMATS = ('pdf', 'docx', 'doc')
+
+
+def load_modules():
+    """
+    Import the frontend app and the Lambda handler side by side.
+
+    Both directories go on sys.path (their module names don't clash). The
+    CV builders are loaded by path, since the Lambda's ``tests`` package
+    would shadow this one.
+    """
+    os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+    os.environ.setdefault('AWS_REGION', 'us-east-1')
+    os.environ.pop('CANDIDATES_STREAM_ARN', None)
+    for path in (FRONTEND_DIR, LAMBDA_DIR):
+        if path not in sys.path:
+            sys.path.insert(0, path)
+
+    import app
+    import handler
+    spec = importlib.util.spec_from_file_location('cv_fixtures', os.path.join(LAMBDA_DIR, 'tests', 'fixtures.py'))
+    fixtures = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(fixtures)
+    return app, handler, fixtures
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+class Harness:
+    """
+    One local deployment: the frontend app and the CV processor wired to
+    shared fake S3, SQS and DynamoDB backends.
+    """
+
+    def __init__(self, latency=0.0, seed=42):
+        """
+        Args:
+            latency: Seconds added to every fake AWS call
+            seed: Seed of the synthetic CV generator
+        """
+        self.app, self.handler, self.fixtures = load_modules()
+        self.rng = random.Random(seed)
+        self.s3 = FakeS3(latency)
+        self.sqs = FakeSQS(latency)
+        self.dynamodb_client = FakeDynamoDBClient(latency=latency)
+        self.written_at = {}
+        self._serializer = TypeSerializer()
+        self._wire()
+
+    def _wire(self):
+        from ranking_cache import RankingCache, StreamInvalidator
+        from ranking_query import RankingQuery
+        from sqs_enqueue import SQSEnqueuer
+
+        app = self.app
+        app.S3_BUCKET = BUCKET
+        app.s3_client = self.s3
+        app.enqueuer = SQSEnqueuer(self.sqs, QUEUE_URL, sleep=lambda seconds: None)
+        app.ranking_query = RankingQuery(self.dynamodb_client, TABLE)
+        app.ranking_cache = RankingCache()
+        app.app.config['TESTING'] = True
+
+        handler = self.handler
+        handler.DYNAMODB_TABLE = TABLE
+        handler.STATUS_UPDATES = True
+        handler.s3_client = self.s3
+        handler.dynamodb = FakeDynamoDB(self.dynamodb_client)
+
+        # Table writes reach the frontend as the DynamoDB stream would
+        self.invalidator = StreamInvalidator(None, None, app.ranking_cache, bus=app.event_bus,
+                                             positions=app.ranking_query.positions)
+        self.dynamodb_client.listeners.append(self._on_write)
+
+        self.client = app.app.test_client()
+        with self.client.session_transaction() as session:
+            session['access_token'] = 'local'
+            session['username'] = USERNAME
+
+    @staticmethod
+    def positions():
+        # 'Backend Developer' isn't a configured position: it is listed once found on the index
+        return ['Software Engineer', 'Backend Developer', 'Cloud Engineer', 'Data Scientist', 'DevOps Engineer']
+
+    def _on_write(self, table_name, old, new):
+        if table_name != TABLE:
+            return
+        if new.get('status') == 'processed':
+            self.written_at[new['s3_key']] = time.perf_counter()
+        images = {'NewImage': {name: self._serializer.serialize(value) for name, value in new.items()}}
+        self.invalidator.apply({'dynamodb': images})
+
+    # Synthetic CVs
+
+    def make_cv(self, index, file_format):
+        """Build one CV in the given format; returns (filename, bytes)."""
+        rng = self.rng
+        start = rng.randint(2000, 2020)
+        lines = [
+            f"Candidate {index:05d}",
+            f"Email: candidate{index}@example.com",
+            f"Phone: +39 333 {rng.randint(1000000, 9999999)}",
+            f"Experience: Engineer ({start}-{min(start + rng.randint(1, 10), 2024)})",
+            "Skills: " + ', '.join(rng.sample(SKILLS, rng.randint(2, 8))),
+            rng.choice(DEGREES),
+        ]
+        lines += ["Project work and responsibilities described at length."] * rng.randint(5, 40)
+        text = '\n'.join(lines)
+
+        fixtures = self.fixtures
+        if file_format == 'pdf':
+            content = fixtures.make_pdf([text])
+        elif file_format == 'docx':
+            content = fixtures.make_docx(''.join(fixtures.docx_paragraph(line) for line in lines))
+        elif file_format == 'doc':
+            content = fixtures.make_doc([(text, True)])
+        else:
+            raise ValueError(f"Unsupported CV format: {file_format}")
+        return f"cv_{index:05d}.{file_format}", content
+
+    # Pipeline stages
+
+    def upload(self, count, formats=FORMATS, files_per_request=50):
+        """
+        Upload ``count`` CVs through /upload/bulk.
+
+        Returns:
+            List of per-request latencies, in seconds
+        """
+        latencies = []
+        for start in range(0, count, files_per_request):
+            position = self.positions()[(start // files_per_request) % len(self.positions())]
+            files = [
+                (io.BytesIO(content), filename)
+                for filename, content in (
+                    self.make_cv(index, formats[index % len(formats)])
+                    for index in range(start, min(start + files_per_request, count))
+                )
+            ]
+            began = time.perf_counter()
+            response = self.client.post('/upload/bulk', data={'job_position': position, 'cv_files': files},
+                                        content_type='multipart/form-data')
+            latencies.append(time.perf_counter() - began)
+            if response.status_code != 200:
+                raise RuntimeError(f"Bulk upload failed: {response.get_json()}")
+        return latencies
+
+    def drain(self, concurrency=1, batch_size=10):
+        """
+        Run lambda_handler on queue batches until the queue is empty.
+
+        Args:
+            concurrency: Concurrent Lambda invocations (threads sharing one container)
+            batch_size: Messages per invocation (the event source BatchSize)
+
+        Returns:
+            List of per-invocation durations, in seconds
+        """
+        durations = []
+        lock = threading.Lock()
+
+        def worker():
+            while True:
+                batch = self.sqs.receive(batch_size)
+                if not batch:
+                    if self.sqs.pending() == 0:
+                        return
+                    time.sleep(0.001)
+                    continue
+                event = {'Records': [{'messageId': m['messageId'], 'body': m['body']} for m in batch]}
+                began = time.perf_counter()
+                result = self.handler.lambda_handler(event, None)
+                elapsed = time.perf_counter() - began
+                failed = {failure['itemIdentifier'] for failure in result['batchItemFailures']}
+                self.sqs.complete(batch, failed)
+                with lock:
+                    durations.append(elapsed)
+
+        # The handler logs every record; keep the report readable
+        with contextlib.redirect_stdout(io.StringIO()):
+            threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        return durations
+
+    def read_dashboard(self, pages=3):
+        """
+        Load /dashboard, then page through /api/candidates twice (cold, then cached).
+
+        Returns:
+            Dict with dashboard/api latencies and the candidates listed
+        """
+        began = time.perf_counter()
+        response = self.client.get('/dashboard')
+        dashboard_latency = time.perf_counter() - began
+        if response.status_code != 200:
+            raise RuntimeError(f"Dashboard failed with status {response.status_code}")
+
+        runs = []
+        for _ in range(2):
+            latencies = []
+            candidates = []
+            cursor = None
+            for _ in range(pages):
+                query = {'limit': 50}
+                if cursor:
+                    query['cursor'] = cursor
+                began = time.perf_counter()
+                result = self.client.get('/api/candidates', query_string=query).get_json()
+                latencies.append(time.perf_counter() - began)
+                candidates += result['candidates']
+                cursor = result['next_cursor']
+                if not cursor:
+                    break
+            runs.append((latencies, candidates))
+
+        return {
+            'dashboard': dashboard_latency,
+            'api_cold': runs[0][0],
+            'api_cached': runs[1][0],
+            'candidates': runs[0][1]
+        }
+
+    def run(self, count, formats=FORMATS, concurrency=1, files_per_request=50):
+        """Upload, process and read back ``count`` CVs; returns the report dict."""
+        began = time.perf_counter()
+        upload_latencies = self.upload(count, formats, files_per_request)
+        uploaded_at = time.perf_counter()
+        sent_at = {}
+        for message in list(self.sqs.messages):
+            sent_at[message['body']] = message['sent_at']
+        queued = len(self.sqs.messages)
+
+        invocations = self.drain(concurrency)
+        processed_at = time.perf_counter()
+        dashboard = self.read_dashboard()
+
+        processed = [
+            item for item in self.dynamodb_client.items(TABLE) if item.get('status') == 'processed'
+        ]
+        end_to_end = self._end_to_end_latencies(sent_at)
+        return {
+            'cvs': count,
+            'queued': queued,
+            'processed': len(processed),
+            'dead_letters': len(self.sqs.dead_letters),
+            'upload_seconds': uploaded_at - began,
+            'upload_latencies': upload_latencies,
+            'processing_seconds': processed_at - uploaded_at,
+            'invocations': invocations,
+            'end_to_end': end_to_end,
+            'dashboard': dashboard,
+        }
+
+    def _end_to_end_latencies(self, sent_at):
+        """Seconds from SendMessageBatch to the processed row, per CV."""
+        latencies = []
+        for body, sent in sent_at.items():
+            s3_key = json.loads(body)['s3_key']
+            if s3_key in self.written_at:
+                latencies.append(self.written_at[s3_key] - sent)
+        return latencies
+
+
+def print_report(report):
+    def ms(seconds):
+        return f"{seconds * 1000:.1f} ms"
+
+    def summary(values):
+        return (f"p50 {ms(percentile(values, 0.5))}, p95 {ms(percentile(values, 0.95))}, "
+                f"max {ms(max(values) if values else 0)}")
+
+    invocations = report['invocations']
+    dashboard = report['dashboard']
+    print(f"CVs: {report['cvs']} uploaded, {report['queued']} queued, {report['processed']} processed, "
+          f"{report['dead_letters']} dead-lettered")
+    print(f"Upload:     {report['cvs'] / report['upload_seconds']:.1f} CVs/s "
+          f"({len(report['upload_latencies'])} requests; {summary(report['upload_latencies'])})")
+    print(f"Processing: {report['processed'] / report['processing_seconds']:.1f} CVs/s "
+          f"({len(invocations)} invocations; {summary(invocations)})")
+    if invocations:
+        print(f"            mean invocation {ms(statistics.mean(invocations))}")
+    print(f"End to end: {summary(report['end_to_end'])} (enqueue to ranked row, includes queue wait)")
+    print(f"Dashboard:  first load {ms(dashboard['dashboard'])}; /api/candidates "
+          f"cold {summary(dashboard['api_cold'])}, cached {summary(dashboard['api_cached'])}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run synthetic CVs through the local pipeline')
+    parser.add_argument('--cvs', type=int, default=200, help='Number of CVs to upload')
+    parser.add_argument('--formats', default=','.join(FORMATS), help='Comma-separated CV formats')
+    parser.add_argument('--concurrency', type=int, default=1, help='Concurrent Lambda invocations')
+    parser.add_argument('--files-per-request', type=int, default=50, help='CVs per bulk upload request')
+    parser.add_argument('--latency-ms', type=float, default=0.0, help='Latency added to every AWS call')
+    args = parser.parse_args()
+
+    formats = tuple(f.strip() for f in args.formats.split(',') if f.strip())
+    harness = Harness(latency=args.latency_ms / 1000)
+    report = harness.run(args.cvs, formats, args.concurrency, args.files_per_request)
+    print_report(report)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""
+End-to-end tests of the CV pipeline on the local in-memory backends
+"""
+import pytest
+from tests.local.harness import BUCKET, TABLE, Harness
+
+
+@pytest.fixture
+def harness():
+    """A fresh local deployment (empty bucket, queue and table) per test."""
+    return Harness()
+
+
+class TestLocalPipeline:
+    """Upload, process and list CVs through the frontend and the Lambda handler."""
+
+    def test_every_uploaded_cv_is_ranked_and_listed(self, harness):
+        """Test CVs of every format go from /upload/bulk to /api/candidates."""
+        subscriber = harness.app.event_bus.subscribe()
+        report = harness.run(60, files_per_request=20)
+
+        assert report['queued'] == 60
+        assert report['processed'] == 60
+        assert report['dead_letters'] == 0
+
+        # Two pages of /api/candidates, best score first, no duplicates
+        candidates = report['dashboard']['candidates']
+        scores = [candidate['ranking_score'] for candidate in candidates]
+        assert len({candidate['candidate_id'] for candidate in candidates}) == 60
+        assert scores == sorted(scores, reverse=True)
+        assert all(candidate['candidate_name'].startswith('Candidate ') for candidate in candidates)
+
+        # The table's changes reached the dashboard's event stream (the
+        # subscriber's queue keeps only the latest events)
+        events = []
+        while not subscriber.empty():
+            events.append(subscriber.get_nowait())
+        harness.app.event_bus.unsubscribe(subscriber)
+        assert events[-1][0] == 'candidate'
+        assert 'processed' in {data['status'] for event_type, data in events if event_type == 'status'}
+
+    def test_dashboard_renders_ranked_candidates(self, harness):
+        """Test the server-rendered dashboard shows the processed candidates."""
+        harness.upload(3)
+        harness.drain()
+
+        page = harness.client.get('/dashboard').get_data(as_text=True)
+
+        for index in range(3):
+            assert f"Candidate {index:05d}" in page
+
+    def test_missing_object_is_dead_lettered(self, harness):
+        """Test a CV deleted before processing is retried, then moved to the DLQ."""
+        before = set(harness.s3.objects)
+        harness.upload(1)
+        (_, s3_key), = set(harness.s3.objects) - before
+        del harness.s3.objects[(BUCKET, s3_key)]
+
+        harness.drain()
+
+        assert len(harness.sqs.dead_letters) == 1
+        assert harness.sqs.dead_letters[0]['receive_count'] == harness.sqs.max_receive_count
+        failed = [item for item in harness.dynamodb_client.items(TABLE) if item['s3_key'] == s3_key]
+        assert failed == []
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])